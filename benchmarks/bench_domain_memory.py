@@ -0,0 +1,66 @@
+"""
+Report the heap bytes per recipe held by a populated MemoryRepository (eager and lazy details),
+and the bytes per review added to it.
+
+Run from the project root:
+    python -m benchmarks.bench_domain_memory [path/to/data]
+"""
+import contextlib
+import gc
+import io
+import sys
+import tracemalloc
+from pathlib import Path
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository_populate import populate
+from recipe.domainmodel.review import Review
+from recipe.domainmodel.user import User
+from utils import get_project_root
+
+REVIEWS = 20_000
+
+
+def traced_populate(data_path: Path, lazy_details: bool):
+    """Return (repository, bytes still allocated after populate)"""
+    gc.collect()
+    tracemalloc.start()
+    repository = MemoryRepository()
+    with contextlib.redirect_stdout(io.StringIO()):
+        populate(data_path, repository, lazy_details=lazy_details)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return repository, current
+
+
+def traced_reviews(repository: MemoryRepository) -> int:
+    """Bytes allocated per review by adding REVIEWS reviews spread over the catalog"""
+    user = User("benchmark", "pw")
+    repository.add_user(user)
+    recipes = list(repository.get_recipes())
+    gc.collect()
+    tracemalloc.start()
+    for i in range(REVIEWS):
+        repository.add_review(Review(user, recipes[i % len(recipes)], i % 5 + 1, "Tasty"))
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current // REVIEWS
+
+
+def main(argv):
+    data_path = Path(argv[1]) if len(argv) > 1 else get_project_root() / "recipe" / "adapters" / "data"
+
+    eager, eager_bytes = traced_populate(data_path, lazy_details=False)
+    _, lazy_bytes = traced_populate(data_path, lazy_details=True)
+    recipes = eager.count_recipes()
+
+    print(f"{recipes} recipes from {data_path}")
+    print(f"  bytes per recipe, eager details: {eager_bytes // recipes:,}")
+    print(f"  bytes per recipe, lazy details:  {lazy_bytes // recipes:,}")
+    print(f"  bytes per review:                {traced_reviews(eager):,}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,48 @@
+"""
+Report the memory saved by interning ingredient/quantity strings and packing image URL prefixes.
+
+Run from the project root:
+    python -m benchmarks.bench_interning [path/to/recipes.csv]
+"""
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from utils import get_project_root
+
+
+def traced_read(csv_path: Path, intern_strings: bool):
+    """Return (reader, bytes still allocated after reading every recipe)"""
+    gc.collect()
+    tracemalloc.start()
+    reader = CSVDataReader(str(csv_path), intern_strings=intern_strings)
+    reader.csv_read()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return reader, current
+
+
+def main(argv):
+    csv_path = Path(argv[1]) if len(argv) > 1 else get_project_root() / "recipe" / "adapters" / "data" / "recipes.csv"
+
+    plain, plain_bytes = traced_read(csv_path, intern_strings=False)
+    interned, interned_bytes = traced_read(csv_path, intern_strings=True)
+    if [r.images for r in plain.recipes] != [r.images for r in interned.recipes]:
+        raise SystemExit("Packed image URLs do not round-trip")
+    if [r.ingredients for r in plain.recipes] != [r.ingredients for r in interned.recipes]:
+        raise SystemExit("Interned ingredients differ from the parsed ones")
+
+    print(f"{len(interned.recipes)} recipes from {csv_path}")
+    print(f"  {'field':<22} {'count':>8} {'distinct':>9} {'before':>12} {'after':>12} {'saved':>12}")
+    for field, row in interned.memory_report().items():
+        print(f"  {field:<22} {row['count']:8,} {row['distinct']:9,} {row['bytes_before']:12,} "
+              f"{row['bytes_after']:12,} {row['bytes_saved']:12,}")
+    print(f"  traced heap after ingest: {plain_bytes:,} bytes plain, {interned_bytes:,} bytes interned "
+          f"({plain_bytes - interned_bytes:,} saved)")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
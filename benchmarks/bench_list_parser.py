@@ -0,0 +1,57 @@
+"""
+Compare the fast list-literal parser with ast.literal_eval on the list columns of recipes.csv.
+
+Run from the project root:
+    python -m benchmarks.bench_list_parser [path/to/recipes.csv] [repeats]
+"""
+import ast
+import csv
+import sys
+import time
+from pathlib import Path
+
+from recipe.adapters.datareader.listparser import parse_list_literal
+from utils import get_project_root
+
+LIST_COLUMNS = ("RecipeIngredientQuantities", "RecipeIngredientParts", "RecipeInstructions", "Images")
+
+
+def load_cells(csv_path: Path) -> list[tuple[str, ...]]:
+    with open(csv_path, mode='r', newline='', encoding='utf-8') as file:
+        return [tuple(row[column] for column in LIST_COLUMNS) for row in csv.DictReader(file)]
+
+
+def time_parser(parse, rows, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for cells in rows:
+            for cell in cells:
+                if cell:
+                    parse(cell)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv):
+    csv_path = Path(argv[1]) if len(argv) > 1 else get_project_root() / "recipe" / "adapters" / "data" / "recipes.csv"
+    repeats = int(argv[2]) if len(argv) > 2 else 5
+    rows = load_cells(csv_path)
+
+    # Both paths must agree before their speed is worth comparing
+    for cells in rows:
+        for cell in cells:
+            if cell and parse_list_literal(cell) != ast.literal_eval(cell):
+                raise SystemExit(f"Parsers disagree on: {cell[:80]}")
+
+    print(f"{len(rows)} rows from {csv_path}, best of {repeats}")
+    results = {}
+    for label, parse in (("ast.literal_eval", ast.literal_eval), ("fast parser", parse_list_literal)):
+        elapsed = time_parser(parse, rows, repeats)
+        results[label] = elapsed
+        print(f"  {label:<17} {elapsed * 1000:8.1f} ms  {len(rows) / elapsed:12,.0f} rows/sec")
+    print(f"  speed-up: {results['ast.literal_eval'] / results['fast parser']:.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
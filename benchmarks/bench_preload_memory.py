@@ -0,0 +1,104 @@
+"""
+Report shared vs private memory per forked worker, with the catalog populated in each worker,
+populated once in the master, and populated once in the master with gc.freeze() before forking.
+
+Each worker runs a few searches and a full garbage collection (what a worker does in its first
+requests), then reports its /proc/<pid>/smaps_rollup. Linux only.
+
+Run from the project root:
+    python -m benchmarks.bench_preload_memory [--workers N] [path/to/data]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository_populate import populate
+from recipe.preload import prepare_for_fork, memory_usage
+from utils import get_project_root
+
+MODES = ("per-worker", "preload", "preload+freeze")
+MIB = 1024 * 1024
+
+
+def load(data_path: Path) -> MemoryRepository:
+    repository = MemoryRepository()
+    with contextlib.redirect_stdout(io.StringIO()):
+        populate(data_path, repository)
+    return repository
+
+
+def work(repository: MemoryRepository):
+    for query in ("chicken", "cake", "soup", "salad"):
+        repository.get_recipes_by_name(query)
+        repository.get_recipes_by_ingredient_name(query)
+        repository.get_recipes_by_author_name_paginated(query[:3], 1, 12)
+    gc.collect()
+
+
+def run_mode(mode: str, workers: int, data_path: Path) -> dict:
+    repository = None
+    if mode != "per-worker":
+        if mode == "preload+freeze":
+            gc.disable()  # as gunicorn.conf.py: no collections in the master, so no freed holes to refill
+        repository = load(data_path)
+        if mode == "preload+freeze":
+            prepare_for_fork(repository)
+        else:
+            repository.build_search_indexes()
+
+    pipes = []
+    for _ in range(workers):
+        read_end, write_end = os.pipe()
+        if os.fork() == 0:
+            os.close(read_end)
+            gc.enable()
+            mine = repository if repository is not None else load(data_path)
+            work(mine)
+            os.write(write_end, json.dumps(memory_usage()).encode())
+            os._exit(0)
+        os.close(write_end)
+        pipes.append(read_end)
+
+    usages = []
+    for read_end in pipes:
+        with os.fdopen(read_end, "rb") as f:
+            usages.append(json.loads(f.read()))
+    for _ in range(workers):
+        os.wait()
+    return dict(master=memory_usage(), workers=usages)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_path", nargs="?", default=str(get_project_root() / "recipe" / "adapters" / "data"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)  # one mode per fresh interpreter
+    args = parser.parse_args(argv[1:])
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.workers, Path(args.data_path))))
+        return
+
+    print(f"{args.workers} workers, catalog from {args.data_path}")
+    print(f"  {'mode':<16} {'shared/worker':>14} {'private/worker':>15} {'master rss':>11} {'total private':>14}")
+    for mode in MODES:
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_preload_memory", "--mode", mode,
+                                 "--workers", str(args.workers), args.data_path],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        shared = sum(u["shared"] for u in result["workers"]) / args.workers
+        private = sum(u["private"] for u in result["workers"]) / args.workers
+        total = result["master"]["private"] + sum(u["private"] for u in result["workers"])
+        print(f"  {mode:<16} {shared / MIB:11.1f} MiB {private / MIB:12.1f} MiB "
+              f"{result['master']['rss'] / MIB:7.1f} MiB {total / MIB:10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
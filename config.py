@@ -16,6 +16,23 @@ class Config:
 
     REPOSITORY = environ.get('REPOSITORY')
 
+    # Cache the parsed catalog in recipes.csv.snapshot so memory-repository boots skip CSV parsing
+    snapshot_string = environ.get('CATALOG_SNAPSHOT', 'False')
+    CATALOG_SNAPSHOT = snapshot_string.lower().strip() == "true"
+
+    # Decode recipe ingredients/instructions from the memory-mapped CSV on first access (memory repository)
+    lazy_details_string = environ.get('LAZY_RECIPE_DETAILS', 'False')
+    LAZY_RECIPE_DETAILS = lazy_details_string.lower().strip() == "true"
+
+    # Time each ingest stage at startup and log the report (also kept in app.extensions['ingest_report'])
+    ingest_report_string = environ.get('INGEST_REPORT', 'False')
+    INGEST_REPORT = ingest_report_string.lower().strip() == "true"
+
+    # Write-ahead log that keeps memory-repository users, reviews and favourites across restarts (empty: off)
+    USER_DATA_LOG = environ.get('USER_DATA_LOG', '').strip()
+    log_fsync_string = environ.get('USER_DATA_LOG_FSYNC', 'True')
+    USER_DATA_LOG_FSYNC = log_fsync_string.lower().strip() == "true"
+
     # Database configuration
     SQLALCHEMY_DATABASE_URI = environ.get('SQLALCHEMY_DATABASE_URI')
 
@@ -0,0 +1,46 @@
+"""
+Gunicorn settings for serving the memory repository from several worker processes:
+
+    gunicorn -c gunicorn.conf.py
+
+preload_app runs create_app() and populate() once in the master, and the workers are forked from it
+with the catalog already in shared memory (see recipe/preload.py and benchmarks/bench_preload_memory.py).
+"""
+import gc
+from os import environ
+
+from config import Config
+from recipe.preload import prepare_for_fork, memory_usage
+
+wsgi_app = "wsgi:app"
+bind = environ.get("GUNICORN_BIND", "127.0.0.1:5000")
+workers = int(environ.get("WEB_CONCURRENCY", "4"))
+threads = int(environ.get("GUNICORN_THREADS", "1"))
+preload_app = True
+
+# Every worker has its own copy of users, reviews and favourites, so only one of them may own the log
+if Config.REPOSITORY == 'memory' and Config.USER_DATA_LOG and workers > 1:
+    raise RuntimeError("USER_DATA_LOG needs WEB_CONCURRENCY=1 (or REPOSITORY=database) with several workers")
+
+# No collections in the master while the catalog loads: objects freed there leave holes that later
+# allocations fill, writing to pages the workers share
+gc.disable()
+
+
+def pre_fork(server, worker):
+    frozen = prepare_for_fork()
+    server.log.info("Froze %d objects before forking", frozen)
+
+
+def post_fork(server, worker):
+    gc.enable()
+
+
+def post_worker_init(worker):
+    # Only a log line: a platform without /proc/self/smaps_rollup (macOS, older kernels) must still boot
+    try:
+        usage = memory_usage()
+    except OSError:
+        return
+    worker.log.info("Worker memory: %.1f MiB shared, %.1f MiB private",
+                    usage["shared"] / 2 ** 20, usage["private"] / 2 ** 20)
@@ -1,3 +1,5 @@
+import atexit
+
 from pathlib import Path
 
 from flask import Flask, session
@@ -10,10 +12,11 @@ from sqlalchemy.pool import NullPool
 import recipe.adapters.repository as repo
 from recipe.adapters.memory_repository import MemoryRepository
 from recipe.adapters.database_repository import SqlAlchemyRepository
-from recipe.adapters.orm import mapper_registry, map_model_to_tables
+from recipe.adapters.orm import mapper_registry, map_model_to_tables, upgrade_rating_aggregates
 
 from recipe.adapters.datareader.csvdatareader import CSVDataReader
 from recipe.adapters.repository_populate import populate
+from recipe.adapters.write_ahead_log import WriteAheadLog, replay
 
 
 def create_app(test_config=None):
@@ -25,10 +28,25 @@ def create_app(test_config=None):
         # Load test configuration, and override any configuration settings.
         app.config.from_mapping(test_config)
         data_path = Path(app.config['TEST_DATA_PATH'])
+    app.config['DATA_PATH'] = str(data_path)
 
     if app.config['REPOSITORY'] == 'memory':
         repo.repo_instance = MemoryRepository()
-        populate(data_path, repo.repo_instance, database_mode=False)
+        app.extensions['ingest_report'] = populate(
+            data_path, repo.repo_instance, database_mode=False,
+            use_snapshot=app.config.get('CATALOG_SNAPSHOT', False),
+            lazy_details=app.config.get('LAZY_RECIPE_DETAILS', False),
+            with_report=app.config.get('INGEST_REPORT', False))
+
+        log_path = app.config.get('USER_DATA_LOG')
+        if log_path:
+            # Bring back the users, reviews and favourites of earlier runs, then log new ones
+            log = WriteAheadLog(log_path, sync=app.config.get('USER_DATA_LOG_FSYNC', True))
+            replayed = replay(log, repo.repo_instance)
+            repo.repo_instance.attach_write_ahead_log(log)
+            repo.repo_instance.compact_write_ahead_log()
+            atexit.register(log.close)
+            print(f"[user data] replayed {replayed} records from {log_path}")
 
     elif app.config['REPOSITORY'] == 'database':
         database_uri = app.config['SQLALCHEMY_DATABASE_URI']
@@ -51,11 +69,18 @@ def create_app(test_config=None):
                     conn.execute(table.delete())
                     
             map_model_to_tables()
-            populate(data_path, repo.repo_instance, database_mode=True)
+            app.extensions['ingest_report'] = populate(data_path, repo.repo_instance, database_mode=True,
+                                                       with_report=app.config.get('INGEST_REPORT', False))
             print("REPOPULATING DATABASE...")
         else:
+            # Databases created before the rating aggregate columns get them, filled in from their reviews
+            if upgrade_rating_aggregates(database_engine):
+                print("UPGRADED recipe rating aggregates")
             map_model_to_tables()
 
+    from .commands import ingest_report_command
+    app.cli.add_command(ingest_report_command)
+
     # Build the application - these steps require an application context.
     with app.app_context():
         login_manager = LoginManager()
@@ -1,6 +1,6 @@
 from datetime import date
-from typing import List
-from sqlalchemy import desc, asc
+from typing import Dict, List, Iterable, Iterator, Set
+from sqlalchemy import desc, asc, func, select, update
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm import scoped_session
 
@@ -10,12 +10,13 @@ from recipe.domainmodel.category import Category
 from recipe.domainmodel.favourite import Favourite
 from recipe.domainmodel.nutrition import Nutrition
 from recipe.domainmodel.recipe import Recipe
-from recipe.domainmodel.review import Review
+from recipe.domainmodel.review import Review, rating_level
 from recipe.domainmodel.user import User
 from recipe.domainmodel.recipe_image import RecipeImage
 from recipe.domainmodel.recipe_ingredient import RecipeIngredient
 from recipe.domainmodel.recipe_instruction import RecipeInstruction
 
+from recipe.adapters.orm import recipe_table
 from recipe.adapters.repository import AbstractRepository
 
 
@@ -123,6 +124,19 @@ class SqlAlchemyRepository(AbstractRepository):
             self._bulk_populate_recipes(recipes, scm.session)
             return recipes
 
+    def iter_recipes(self, batch_size: int = 500) -> Iterator[Recipe]:
+        """Stream recipes from the database batch_size rows at a time, populating each batch"""
+        with self._session_cm as scm:
+            batch = []
+            for recipe in scm.session.query(Recipe).yield_per(batch_size):
+                batch.append(recipe)
+                if len(batch) == batch_size:
+                    self._bulk_populate_recipes(batch, scm.session)
+                    yield from batch
+                    batch = []
+            self._bulk_populate_recipes(batch, scm.session)
+            yield from batch
+
     def get_featured_recipes(self, limit: int = 6) -> List[Recipe]:
         with self._session_cm as scm:
             # First, get all recipe IDs only (very fast query)
@@ -326,6 +340,41 @@ class SqlAlchemyRepository(AbstractRepository):
                 RecipeIngredient._RecipeIngredient__ingredient.ilike(f"%{ingredient_text}%")
             ).count()
 
+    # ====================
+    # Facet Methods
+    # ====================
+
+    @staticmethod
+    def _matching_recipe_ids(filter_by: str, query: str):
+        """SELECT of the ids of the recipes a browse search matches"""
+        pattern = f"%{(query or '').strip()}%"
+        if filter_by == 'ingredient':
+            return select(RecipeIngredient._RecipeIngredient__recipe_id).where(
+                RecipeIngredient._RecipeIngredient__ingredient.ilike(pattern))
+        if filter_by == 'author':
+            return select(Recipe._Recipe__id).join(Recipe._Recipe__author).where(
+                Author._Author__name.ilike(pattern))
+        if filter_by == 'category':
+            return select(Recipe._Recipe__id).join(Recipe._Recipe__category).where(
+                Category._Category__name.ilike(pattern))
+        return select(Recipe._Recipe__id).where(Recipe._Recipe__name.ilike(pattern))
+
+    def get_facet_counts(self, filter_by: str, query: str, limit: int = None) -> Dict[str, Dict[str, int]]:
+        """One GROUP BY per facet over the matching recipe ids"""
+        matching_ids = self._matching_recipe_ids(filter_by, query)
+        facets = dict()
+        with self._session_cm as scm:
+            for field, relationship, name in (('category', Recipe._Recipe__category, Category._Category__name),
+                                              ('author', Recipe._Recipe__author, Author._Author__name)):
+                count = func.count(Recipe._Recipe__id)
+                rows = scm.session.query(name, count).select_from(Recipe).join(relationship).filter(
+                    Recipe._Recipe__id.in_(matching_ids)
+                ).group_by(name).order_by(desc(count), asc(name))
+                if limit is not None:
+                    rows = rows.limit(limit)
+                facets[field] = dict(rows.all())
+        return facets
+
     # ====================
     # Review Methods
     # ====================
@@ -336,9 +385,9 @@ class SqlAlchemyRepository(AbstractRepository):
             # SQLAlchemy will automatically add it to recipe.__reviews via the ORM relationship
             scm.session.add(review)
             
-            # Now that the review is in the recipe's reviews list (via ORM),
-            # update the rating based on all reviews (including the new one)
-            review.recipe.update_rating()
+            # Fold the new rating into the recipe's stored aggregates,
+            # without loading the recipe's other reviews
+            self._adjust_rating(scm.session, review.recipe.id, review.rating, 1)
             
             # Commit both the review and the updated rating together
             scm.commit()
@@ -357,9 +406,8 @@ class SqlAlchemyRepository(AbstractRepository):
                     # SQLAlchemy will automatically remove it from recipe.__reviews via the ORM relationship
                     scm.session.delete(review)
                     
-                    # Now that the review is removed from the recipe's reviews list (via ORM),
-                    # update the rating based on remaining reviews
-                    recipe.update_rating()
+                    # Take the rating back out of the recipe's stored aggregates
+                    self._adjust_rating(scm.session, recipe.id, review.rating, -1)
                     
                     # Commit both the deletion and the updated rating together
                     scm.commit()
@@ -368,6 +416,28 @@ class SqlAlchemyRepository(AbstractRepository):
             except NoResultFound:
                 return False
 
+    @staticmethod
+    def _adjust_rating(session, recipe_id: int, rating: float, step: int):
+        """
+        Add (step 1) or remove (step -1) a review rating in the recipe row's aggregates. The counters
+        are incremented in SQL rather than read, changed and written back from the Recipe, so reviews
+        committed concurrently are all counted.
+        """
+        if rating is None:
+            return
+        level_count = recipe_table.c[f'rating_{rating_level(rating)}_count']
+        c = recipe_table.c
+        session.execute(update(recipe_table).where(c.id == recipe_id).values({
+            c.rating_sum: c.rating_sum + step * rating,
+            c.rating_count: c.rating_count + step,
+            level_count: level_count + step,
+        }))
+        # The row stays locked by this transaction, so the average is taken from the updated counters
+        total, count = session.execute(
+            select(c.rating_sum, c.rating_count).where(c.id == recipe_id)).one()
+        session.execute(update(recipe_table).where(c.id == recipe_id).values(
+            rating=round(total / count, 1) if count > 0 else None))
+
     # ====================
     # Favourite Methods
     # ====================
@@ -419,6 +489,19 @@ class SqlAlchemyRepository(AbstractRepository):
             ).first()
             return favourite is not None
 
+    def get_favourite_ids(self, username: str, recipe_ids: Iterable[int]) -> Set[int]:
+        recipe_ids = {recipe_id for recipe_id in recipe_ids if recipe_id is not None}
+        if not username or not recipe_ids:
+            return set()
+        with self._session_cm as scm:
+            rows = scm.session.query(Favourite._Favourite__recipe_id).join(
+                User, User._User__id == Favourite._Favourite__user_id
+            ).filter(
+                User._User__username == username,
+                Favourite._Favourite__recipe_id.in_(recipe_ids)
+            ).all()
+            return {recipe_id for (recipe_id,) in rows}
+
     # ====================
     # User Methods
     # ====================
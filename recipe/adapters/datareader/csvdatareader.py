@@ -1,114 +1,415 @@
 import os
 import csv
-import ast
+import hashlib
 import re
 
 from datetime import datetime
+from functools import lru_cache, partial
 from recipe.domainmodel.author import Author
 from recipe.domainmodel.category import Category
 from recipe.domainmodel.nutrition import Nutrition
 from recipe.domainmodel.recipe import Recipe
+from recipe.adapters.datareader.listparser import parse_list_literal
+from recipe.adapters.datareader import snapshot
+from recipe.adapters.datareader.records import iter_records, read_fieldnames, parse_record, RecordStore
+from recipe.adapters.datareader.interning import StringTable
+
+
+# Upper bound on distinct DatePublished strings remembered by parse_date
+DATE_CACHE_SIZE = 8192
+
+_MONTHS = {month: number for number, month in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1)}
+
+_ORDINAL_SUFFIXES = ("st", "nd", "rd", "th")
+
+
+def parse_date_strptime(date_str: str) -> datetime:
+    # Remove common ordinal suffixes
+    clean_str = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_str)
+    # Parse the cleaned string
+    return datetime.strptime(clean_str, "%d %b %Y")
+
+
+def parse_date_tokens(date_str: str):
+    """Parse the export's "9th Aug 2009" format by hand; returns None for anything else"""
+    parts = date_str.split()
+    if len(parts) != 3:
+        return None
+    day, month, year = parts
+    if day[-2:].lower() in _ORDINAL_SUFFIXES:
+        day = day[:-2]
+    month_number = _MONTHS.get(month.title())
+    if month_number is None or not day.isdigit() or not year.isdigit() or len(year) != 4:
+        return None
+    try:
+        return datetime(int(year), month_number, int(day))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(date_str: str) -> datetime:
+    """Parse a DatePublished value, memoised on the raw string (datetimes are immutable, so sharing is safe)"""
+    parsed = parse_date_tokens(date_str)
+    if parsed is None:
+        parsed = parse_date_strptime(date_str)
+    return parsed
+
+
+def date_cache_info():
+    """Hit/miss counters of the parse_date memo in this process (each parallel worker has its own)"""
+    return parse_date.cache_info()
+
+
+def row_digest(row: dict) -> bytes:
+    """Stable digest of a raw CSV row's values, used to spot changed rows on reload"""
+    text = "\x1f".join(value or "" for value in row.values())
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def parse_row(row: dict, with_details: bool = True, record_span: tuple = None,
+              list_parser=parse_list_literal) -> dict:
+    """
+    Convert one raw CSV row into plain Python values (no domain objects).
+
+    Kept free of reader state so it can run in worker processes; CSVDataReader turns the
+    result into Recipe/Author/Category objects. Without details, the ingredient and
+    instruction lists are left as None and record_span is kept so they can be decoded later.
+    list_parser lets an IngestReport time the list-literal parsing separately.
+    """
+    # NUTRITION
+    nutrition = dict(
+        calories=int(float(row["Calories"])) if row["Calories"] else 0,
+        fat=float(row["FatContent"]) if row["FatContent"] else 0.0,
+        saturated_fat=float(row["SaturatedFatContent"]) if row["SaturatedFatContent"] else 0.0,
+        cholesterol=int(float(row["CholesterolContent"])) if row["CholesterolContent"] else 0,
+        sodium=int(float(row["SodiumContent"])) if row["SodiumContent"] else 0,
+        carbohydrates=float(row["CarbohydrateContent"]) if row["CarbohydrateContent"] else 0.0,
+        fiber=float(row["FiberContent"]) if row["FiberContent"] else 0.0,
+        sugar=float(row["SugarContent"]) if row["SugarContent"] else 0.0,
+        protein=float(row["ProteinContent"]) if row["ProteinContent"] else 0.0,
+    )
+
+    if with_details:
+        # INGREDIENTS
+        ingredient_quantities = list_parser(row["RecipeIngredientQuantities"]) if row[
+            "RecipeIngredientQuantities"] else []
+        ingredients = list_parser(row["RecipeIngredientParts"]) if row[
+            "RecipeIngredientParts"] else []
+
+        # INSTRUCTIONS
+        instructions = list_parser(row["RecipeInstructions"]) if row["RecipeInstructions"] else []
+    else:
+        ingredient_quantities = ingredients = instructions = None
+
+    # YIELD VALUE
+    yield_value = row["RecipeYield"].strip() if row["RecipeYield"] else ""
+    recipe_yield = "Not specified" if not yield_value or yield_value == "NA" else yield_value
+
+    # IMAGES
+    images = list_parser(row.get("Images")) if row.get("Images") else []
+
+    return dict(
+        recipe_id=int(row["RecipeId"]),
+        name=row["Name"].strip(),
+        author_id=int(row["AuthorId"]),
+        author_name=row["AuthorName"],
+        category_name=row["RecipeCategory"].strip(),
+        cook_time=row["CookTime"],
+        preparation_time=row["PrepTime"],
+        description=row["Description"],
+        images=images,
+        ingredient_quantities=ingredient_quantities,
+        ingredients=ingredients,
+        nutrition=nutrition,
+        servings=row["RecipeServings"],
+        recipe_yield=recipe_yield,
+        instructions=instructions,
+        created_date=parse_date(row["DatePublished"]),
+        record_span=record_span,
+        row_digest=row_digest(row),
+    )
+
 
 class CSVDataReader:
-    def __init__(self, csv_path):
+    def __init__(self, csv_path, use_snapshot: bool = False, lazy_details: bool = False,
+                 intern_strings: bool = True, report=None, nutrition_table=None,
+                 link_recipes: bool = True, string_stats: bool = False):
         self.__csv_path = csv_path
+        self.__use_snapshot = use_snapshot
+        self.__lazy_details = lazy_details
+        # string_stats keeps the per-field figures behind memory_report(), at the cost of a set per field
+        self.__strings = StringTable(collect_stats=string_stats) if intern_strings else None
+        # Optional NutritionTable: nutrients go into its columns instead of one Nutrition per recipe
+        self.__nutrition_table = nutrition_table
+        # Whether iter_recipes adds each recipe to its author's and category's recipe lists
+        self.__link_recipes = link_recipes
+        # Optional IngestReport timing csv_decode, row_convert, list_parse and domain_build
+        self.__report = report
+        self.__parse_row = self.__timed_parse_row if report is not None else parse_row
+        self.__timed_list_parser = report.wrap("list_parse", parse_list_literal) if report is not None else None
+        self.__record_store = None
+        self.__row_digests = {}
+        self.__record_spans = {}
         self.__recipes = []
         self.__authors = {}
         self.__categories = {}
-        
+
 
     def parse_date(self, date_str: str) -> datetime:
-        # Remove common ordinal suffixes
-        clean_str = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_str)
-        # Parse the cleaned string
-        return datetime.strptime(clean_str, "%d %b %Y")
+        return parse_date(date_str)
+
+    def csv_read(self, workers: int = 1):
+        for recipe in self.iter_recipes(workers):
+            self.__recipes.append(recipe)
+
+    def iter_recipes(self, workers: int = 1):
+        """
+        Yield each Recipe as soon as its row is parsed, without keeping it in self.recipes.
+
+        With workers > 1 the rows are parsed in a process pool (see parallel.py); recipes are
+        still yielded in file order and authors/categories are deduplicated here, so the output
+        is the same as the serial path.
+        """
+        for fields in self.__iter_fields(workers):
+            self.__row_digests[fields["recipe_id"]] = fields["row_digest"]
+            if self.__report is None:
+                yield self.__build_recipe(fields, self.__link_recipes)
+                continue
+            self.__report.start("domain_build")
+            recipe = self.__build_recipe(fields, self.__link_recipes)
+            self.__report.stop(rows=1)
+            yield recipe
+
+    def iter_changed_recipes(self, known_digests: dict, workers: int = 1,
+                             authors: dict = None, categories: dict = None):
+        """
+        Yield only the recipes whose row digest differs from known_digests (recipe id -> digest).
+
+        Every row's digest is still recorded in row_digests, so rows missing from the file can be
+        found afterwards. Unchanged rows are parsed but no domain objects are built for them.
+        Recipes reuse the given authors (id -> Author) and categories (name -> Category) but are
+        not added to their recipe lists; the caller decides how to link them.
+        """
+        self.__authors.update(authors or {})
+        self.__categories.update(categories or {})
+        for fields in self.__iter_fields(workers):
+            recipe_id = fields["recipe_id"]
+            self.__row_digests[recipe_id] = fields["row_digest"]
+            if known_digests.get(recipe_id) == fields["row_digest"]:
+                if fields["record_span"] is not None:
+                    self.__record_spans[recipe_id] = fields["record_span"]
+                continue
+            yield self.__build_recipe(fields, link=False)
+
+    def detail_loader(self, recipe_id: int):
+        """Loader for an unchanged row's lazy details in this file (see iter_changed_recipes), or None"""
+        span = self.__record_spans.get(recipe_id)
+        if span is None or self.__record_store is None:
+            return None
+        return partial(self.__record_store.load_details, *span)
+
+    def __iter_fields(self, workers: int):
+        rows = self.__iter_parsed_rows(workers)
+        report = self.__report
+        if report is None:
+            yield from rows
+            return
+        # csv_decode covers reading each row (DictReader, snapshot or parallel workers);
+        # the time spent in parse_row is booked under row_convert and list_parse instead
+        while True:
+            report.start("csv_decode")
+            fields = next(rows, None)
+            report.stop(rows=0 if fields is None else 1)
+            if fields is None:
+                return
+            yield fields
+
+    def __timed_parse_row(self, row: dict, **kwargs) -> dict:
+        self.__report.start("row_convert")
+        try:
+            return parse_row(row, list_parser=self.__timed_list_parser, **kwargs)
+        finally:
+            self.__report.stop(rows=1)
+
+    def __iter_parsed_rows(self, workers: int):
+        if not self.__use_snapshot:
+            yield from self.__parse_rows(workers)
+            return
+
+        cached_rows = snapshot.iter_snapshot_rows(self.__csv_path, self.__lazy_details)
+        already_yielded = 0
+        if cached_rows is not None:
+            if self.__lazy_details:
+                # The stored record spans point into this (unchanged) CSV
+                self.__open_record_store()
+            try:
+                for fields in cached_rows:
+                    yield fields
+                    already_yielded += 1
+                return
+            except snapshot.SnapshotError as e:
+                # The snapshot rows are the CSV rows in order, so carry on from the CSV where it broke off
+                print(f"[snapshot] {e}; parsing {self.__csv_path} instead")
+
+        # No usable snapshot: parse the CSV and write a fresh one alongside it
+        writer = snapshot.SnapshotWriter(self.__csv_path, self.__lazy_details)
+        try:
+            for i, fields in enumerate(self.__parse_rows(workers)):
+                writer.add(fields)
+                if i >= already_yielded:
+                    yield fields
+        except BaseException:
+            writer.discard()
+            raise
+        writer.commit()
+
+    def __parse_rows(self, workers: int):
+        if self.__lazy_details:
+            yield from self.__parse_rows_without_details(workers)
+            return
+
+        if workers > 1:
+            from recipe.adapters.datareader.parallel import iter_parsed_rows_parallel
+            yield from iter_parsed_rows_parallel(self.__csv_path, workers)
+            return
 
-    def csv_read(self):
         with open(self.__csv_path, mode='r', newline='', encoding='utf-8') as file:
             reader = csv.DictReader(file)
 
             for row in reader:
-                #CREATION OF AUTHOR
-                author_id = int(row["AuthorId"])
-                author = self.__authors.get(author_id)
-                if author is None:
-                    author = Author(author_id, row["AuthorName"])
-                    self.__authors[author_id] = author
-
-                #CREATION OF CATEGORY
-                category_name = row["RecipeCategory"].strip()
-                category = self.__categories.get(category_name)
-                if category is None:
-                    category = Category(category_name)
-                    self.__categories[category_name] = category
-
-                #CREATION OF NUTRITION
-                nutrition = Nutrition(
-                    nutrition_id=int(row["RecipeId"]),
-                    calories=int(float(row["Calories"])) if row["Calories"] else 0,
-                    fat=float(row["FatContent"]) if row["FatContent"] else 0.0,
-                    saturated_fat=float(row["SaturatedFatContent"]) if row["SaturatedFatContent"] else 0.0,
-                    cholesterol=int(float(row["CholesterolContent"])) if row["CholesterolContent"] else 0,
-                    sodium=int(float(row["SodiumContent"])) if row["SodiumContent"] else 0,
-                    carbohydrates=float(row["CarbohydrateContent"]) if row["CarbohydrateContent"] else 0.0,
-                    fiber=float(row["FiberContent"]) if row["FiberContent"] else 0.0,
-                    sugar=float(row["SugarContent"]) if row["SugarContent"] else 0.0,
-                    protein=float(row["ProteinContent"]) if row["ProteinContent"] else 0.0,
-                )
-
-                # INGREDIENTS
-                ingredient_quantities = ast.literal_eval(row["RecipeIngredientQuantities"]) if row[
-                    "RecipeIngredientQuantities"] else []
-                ingredients = ast.literal_eval(row["RecipeIngredientParts"]) if row[
-                    "RecipeIngredientParts"] else []
-
-                # INSTRUCTIONS
-                instructions = ast.literal_eval(row["RecipeInstructions"]) if row["RecipeInstructions"] else []
-
-                # YIELD VALUE
-                yield_value = row["RecipeYield"].strip() if row["RecipeYield"] else ""
-                recipe_yield = "Not specified" if not yield_value or yield_value == "NA" else yield_value
-
-                # IMAGES
-                images = ast.literal_eval(row.get("Images")) if row.get("Images") else []
-
-                # DATE
-                date_string = row["DatePublished"]
-                created_date = self.parse_date(date_string)
-
-                #RECIPE
-                recipe = Recipe(
-                    recipe_id=int(row["RecipeId"]),
-                    name=row["Name"].strip(),
-                    author=author,
-                    cook_time=row["CookTime"],
-                    preparation_time=row["PrepTime"],
-                    description=row["Description"],
-                    images=images,
-                    category=category,
-                    ingredient_quantities=ingredient_quantities,
-                    ingredients=ingredients,
-                    nutrition=nutrition,
-                    servings=row["RecipeServings"],
-                    recipe_yield=recipe_yield,
-                    instructions=instructions,
-                    created_date=created_date
-                )
-
-                #UPDATE RELATIONSHIPS
-                self.__recipes.append(recipe)
-                author.add_recipe(recipe)
-                category.add_recipe(recipe)
+                yield self.__parse_row(row)
+
+    def __open_record_store(self):
+        """Open the RecordStore that decodes lazy details; returns the CSV's field names (None if empty)"""
+        records = iter_records(self.__csv_path)
+        header = next(records, None)
+        records.close()
+        if header is None:
+            return None
+        fieldnames = read_fieldnames(self.__csv_path, header[:2])
+        if self.__record_store is None:
+            self.__record_store = RecordStore(self.__csv_path, fieldnames, self.__strings)
+        return fieldnames
+
+    def __parse_rows_without_details(self, workers: int):
+        fieldnames = self.__open_record_store()
+        if fieldnames is None:
+            return
+
+        if workers > 1:
+            from recipe.adapters.datareader.parallel import iter_parsed_rows_parallel
+            yield from iter_parsed_rows_parallel(self.__csv_path, workers, with_details=False)
+            return
+
+        records = iter_records(self.__csv_path)
+        next(records)  # the header
+        for start, end, record in records:
+            row = parse_record(record, fieldnames)
+            if row is not None:
+                yield self.__parse_row(row, with_details=False, record_span=(start, end))
+
+    def iter_batches(self, batch_size: int, workers: int = 1):
+        """Yield lists of at most batch_size recipes, parsed incrementally"""
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive int.")
+        batch = []
+        for recipe in self.iter_recipes(workers):
+            batch.append(recipe)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def __build_recipe(self, fields: dict, link: bool = True) -> Recipe:
+        #CREATION OF AUTHOR
+        author_id = fields["author_id"]
+        author = self.__authors.get(author_id)
+        if author is None:
+            author = Author(author_id, fields["author_name"])
+            self.__authors[author_id] = author
+
+        #CREATION OF CATEGORY
+        category_name = fields["category_name"]
+        category = self.__categories.get(category_name)
+        if category is None:
+            category = Category(category_name)
+            self.__categories[category_name] = category
+
+        #CREATION OF NUTRITION
+        if self.__nutrition_table is not None:
+            nutrition = self.__nutrition_table.append(fields["recipe_id"], **fields["nutrition"])
+        else:
+            nutrition = Nutrition(nutrition_id=fields["recipe_id"], **fields["nutrition"])
+
+        #SHARED STRINGS
+        images = fields["images"]
+        ingredient_quantities = fields["ingredient_quantities"]
+        ingredients = fields["ingredients"]
+        if self.__strings is not None:
+            images = self.__strings.pack_images(images)
+            ingredient_quantities = self.__strings.intern_list(ingredient_quantities, "ingredient_quantities")
+            ingredients = self.__strings.intern_list(ingredients, "ingredients")
+
+        #RECIPE
+        recipe = Recipe(
+            recipe_id=fields["recipe_id"],
+            name=fields["name"],
+            author=author,
+            cook_time=fields["cook_time"],
+            preparation_time=fields["preparation_time"],
+            description=fields["description"],
+            images=images,
+            category=category,
+            ingredient_quantities=ingredient_quantities,
+            ingredients=ingredients,
+            nutrition=nutrition,
+            servings=fields["servings"],
+            recipe_yield=fields["recipe_yield"],
+            instructions=fields["instructions"],
+            created_date=fields["created_date"]
+        )
+
+        # Heavy lists are decoded from the memory-mapped CSV on first access
+        if fields.get("record_span") is not None and self.__record_store is not None:
+            recipe.defer_details(partial(self.__record_store.load_details, *fields["record_span"]))
+
+        #UPDATE RELATIONSHIPS
+        if link:
+            author.add_recipe(recipe)
+            category.add_recipe(recipe)
+        return recipe
 
     # Accessors
     @property
     def recipes(self):
         return self.__recipes
 
+    @property
+    def record_store(self):
+        """The RecordStore backing lazily-decoded recipe details, or None when not in lazy mode"""
+        return self.__record_store
+
+    @property
+    def row_digests(self) -> dict:
+        """Recipe id -> digest of its raw CSV row, for every row read so far"""
+        return self.__row_digests
+
+    @property
+    def string_table(self):
+        """The StringTable shared by the recipes read so far, or None when interning is off"""
+        return self.__strings
+
+    def memory_report(self) -> dict:
+        """Bytes saved per field by string interning and image prefix packing; needs string_stats"""
+        return self.__strings.memory_report() if self.__strings is not None else {}
+
     @property
     def authors(self):
         return list(self.__authors.values())
 
     @property
     def categories(self):
-        return list(self.__categories.values())
\ No newline at end of file
+        return list(self.__categories.values())
@@ -0,0 +1,138 @@
+"""
+Deduplication of repeated catalog strings during ingest.
+
+Ingredient names ("salt", "butter") and quantities ("1", "1/2") repeat thousands of times across
+recipes, and every image URL starts with one of a handful of long CDN prefixes. StringTable stores
+each distinct ingredient/quantity string once and keeps image URLs as (prefix id, suffix) pairs that
+are only joined back into full URLs when Recipe.images is read.
+"""
+import re
+import sys
+
+# The CDN prefix ends right before the first path segment that starts with a digit,
+# e.g. ".../v1/img/recipes/" + "38/YUeirxMLQaeE1h3v3qnM_229.jpg"
+_IMAGE_PREFIX_RE = re.compile(r"^(.*?/)(?=\d)")
+
+
+def split_image_url(url: str):
+    """Return (prefix, suffix) with prefix + suffix == url"""
+    match = _IMAGE_PREFIX_RE.match(url)
+    if match is None:
+        cut = url.rfind("/") + 1
+        return url[:cut], url[cut:]
+    prefix = match.group(1)
+    return prefix, url[len(prefix):]
+
+
+class PackedImages:
+    """
+    A recipe's image URLs held as alternating prefix ids and suffixes.
+
+    Iterating yields the full URLs; Recipe.images turns this back into a list on access.
+    """
+    __slots__ = ("__prefixes", "__refs")
+
+    def __init__(self, prefixes: list[str], refs: tuple):
+        self.__prefixes = prefixes
+        self.__refs = refs
+
+    def __iter__(self):
+        refs = self.__refs
+        prefixes = self.__prefixes
+        for index in range(0, len(refs), 2):
+            yield prefixes[refs[index]] + refs[index + 1]
+
+    def __len__(self) -> int:
+        return len(self.__refs) // 2
+
+    def __repr__(self) -> str:
+        return f"<PackedImages {list(self)}>"
+
+
+class StringTable:
+    """
+    Interns ingest strings per field. With collect_stats it also keeps the size figures used by
+    memory_report(), which hold a second reference to every distinct string; the table outlives
+    ingest when lazy details are interned on access, so they are off unless asked for.
+    """
+
+    def __init__(self, collect_stats: bool = False):
+        self.__strings = {}
+        self.__prefixes = []
+        self.__prefix_ids = {}
+        self.__collect_stats = collect_stats
+        # field -> [occurrences, bytes stored one copy per occurrence, bytes actually kept]
+        self.__fields = {}
+        self.__seen = {}
+
+    @property
+    def collects_stats(self) -> bool:
+        return self.__collect_stats
+
+    def intern(self, value: str, field: str = "strings") -> str:
+        cached = self.__strings.get(value)
+        if cached is None:
+            cached = self.__strings[value] = value
+        if not self.__collect_stats:
+            return cached
+
+        stats = self.__field_stats(field)
+        size = sys.getsizeof(value)
+        stats[0] += 1
+        stats[1] += size
+        seen = self.__seen[field]
+        if cached not in seen:
+            seen.add(cached)
+            stats[2] += size
+        return cached
+
+    def intern_list(self, values: list[str], field: str = "strings") -> list[str]:
+        if not values:
+            return values
+        return [self.intern(value, field) for value in values]
+
+    def pack_images(self, urls: list[str]):
+        """Return urls as a PackedImages sharing this table's prefixes ([] stays [])"""
+        if not urls:
+            return urls
+        stats = self.__field_stats("images") if self.__collect_stats else None
+        refs = []
+        for url in urls:
+            prefix, suffix = split_image_url(url)
+            prefix_id = self.__prefix_ids.get(prefix)
+            if prefix_id is None:
+                prefix_id = self.__prefix_ids[prefix] = len(self.__prefixes)
+                self.__prefixes.append(prefix)
+                if stats is not None:
+                    stats[2] += sys.getsizeof(prefix)
+            refs.append(prefix_id)
+            refs.append(suffix)
+            if stats is not None:
+                stats[0] += 1
+                stats[1] += sys.getsizeof(url)
+                stats[2] += sys.getsizeof(suffix)
+        return PackedImages(self.__prefixes, tuple(refs))
+
+    @property
+    def image_prefixes(self) -> list[str]:
+        return list(self.__prefixes)
+
+    def memory_report(self) -> dict:
+        """
+        Per-field string sizes: field -> dict(count, distinct, bytes_before, bytes_after, bytes_saved).
+        bytes_before assumes one string object per occurrence, as the parser produces them;
+        for images, distinct is the number of shared URL prefixes. Empty without collect_stats.
+        """
+        report = {}
+        for field, (count, before, after) in self.__fields.items():
+            distinct = len(self.__prefixes) if field == "images" else len(self.__seen[field])
+            report[field] = dict(count=count, distinct=distinct, bytes_before=before,
+                                 bytes_after=after, bytes_saved=before - after)
+        return report
+
+    def __field_stats(self, field: str) -> list:
+        stats = self.__fields.get(field)
+        if stats is None:
+            stats = self.__fields[field] = [0, 0, 0]
+            self.__seen[field] = set()
+        return stats
@@ -0,0 +1,90 @@
+import ast
+
+# Escape sequences that Python's repr() emits for the strings in the Food.com export
+_SIMPLE_ESCAPES = {
+    '\\': '\\',
+    "'": "'",
+    '"': '"',
+    'n': '\n',
+    't': '\t',
+    'r': '\r',
+}
+
+
+def parse_string_list(text: str) -> list[str]:
+    """
+    Parse a list-of-strings literal such as "['1/2', 'salt', \"cook's salt\"]" without building an AST.
+
+    Only plain single or double quoted items separated by commas are accepted. Anything else
+    (numbers, nested lists, string prefixes, implicit concatenation, unknown escapes) raises
+    ValueError so that the caller can fall back to ast.literal_eval.
+    """
+    s = text.strip()
+    if len(s) < 2 or s[0] != '[' or s[-1] != ']':
+        raise ValueError("Not a list literal")
+
+    items = []
+    end = len(s) - 1
+    i = _skip_spaces(s, 1, end)
+    if i == end:
+        return items
+
+    while True:
+        quote = s[i]
+        if quote != "'" and quote != '"':
+            raise ValueError(f"Unsupported list item at position {i}")
+
+        start = i + 1
+        close = s.find(quote, start, end)
+        if close == -1:
+            raise ValueError("Unterminated string")
+
+        if s.find('\\', start, close) == -1:
+            items.append(s[start:close])
+            i = close + 1
+        else:
+            value, i = _parse_escaped(s, start, end, quote)
+            items.append(value)
+
+        i = _skip_spaces(s, i, end)
+        if i == end:
+            return items
+        if s[i] != ',':
+            raise ValueError(f"Expected ',' at position {i}")
+        i = _skip_spaces(s, i + 1, end)
+        if i == end:
+            # Trailing comma, e.g. "['a', ]"
+            return items
+
+
+def parse_list_literal(text: str) -> list:
+    """Parse a list cell with the fast path, falling back to ast.literal_eval for anything it rejects"""
+    try:
+        return parse_string_list(text)
+    except ValueError:
+        return ast.literal_eval(text)
+
+
+def _skip_spaces(s: str, i: int, end: int) -> int:
+    while i < end and s[i] in ' \t\r\n':
+        i += 1
+    return i
+
+
+def _parse_escaped(s: str, i: int, end: int, quote: str):
+    parts = []
+    while True:
+        close = s.find(quote, i, end)
+        if close == -1:
+            raise ValueError("Unterminated string")
+        backslash = s.find('\\', i, close)
+        if backslash == -1:
+            parts.append(s[i:close])
+            return ''.join(parts), close + 1
+
+        parts.append(s[i:backslash])
+        replacement = _SIMPLE_ESCAPES.get(s[backslash + 1:backslash + 2])
+        if replacement is None:
+            raise ValueError(f"Unsupported escape at position {backslash}")
+        parts.append(replacement)
+        i = backslash + 2
@@ -0,0 +1,94 @@
+"""
+Multi-process parsing of recipes.csv.
+
+The data rows are cut into equal byte ranges without reading them. Each worker process realigns
+its range on record boundaries (see records.record_start_at), parses it with parse_row(), and
+the parsed rows are handed back in file order. Building domain objects (and deduplicating
+authors and categories) stays in the parent process.
+"""
+import csv
+import io
+import mmap
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from recipe.adapters.datareader.csvdatareader import parse_row
+from recipe.adapters.datareader.records import iter_records, read_fieldnames, parse_record, record_start_at
+
+# Each worker gets a few ranges so that a slow range does not leave the other workers idle
+RANGES_PER_WORKER = 4
+
+# Ranges submitted ahead of the one being yielded, per worker; bounds the parsed rows held in memory
+IN_FLIGHT_PER_WORKER = 2
+
+
+def split_byte_ranges(csv_path, parts: int):
+    """
+    Return (header_span, ranges) where ranges are parts equal byte ranges covering the data rows.
+    The cuts are not record-aligned; parse_range realigns them.
+    """
+    header_span = next(((start, end) for start, end, _ in iter_records(csv_path)), None)
+    if header_span is None:
+        return None, []
+
+    data_start = header_span[1]
+    size = os.path.getsize(csv_path)
+    parts = max(1, min(parts, size - data_start))
+    cuts = [data_start + (size - data_start) * i // parts for i in range(parts + 1)]
+    return header_span, [(start, end) for start, end in zip(cuts, cuts[1:]) if start < end]
+
+
+def align_range(csv_path, start: int, end: int):
+    """The record-aligned (start, end) holding the records that begin in the byte range [start, end)"""
+    with open(csv_path, mode='rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return record_start_at(data, start), record_start_at(data, end)
+
+
+def parse_range(csv_path, fieldnames: list[str], start: int, end: int, with_details: bool = True) -> list[dict]:
+    """
+    Parse the records that begin in the byte range [start, end) of the file; runs in a worker process.
+    Without details, each row records its byte span instead (see CSVDataReader lazy_details).
+    """
+    start, end = align_range(csv_path, start, end)
+    if start >= end:
+        return []
+
+    if not with_details:
+        rows = []
+        for record_start, record_end, record in iter_records(csv_path, start, end):
+            row = parse_record(record, fieldnames)
+            if row is not None:
+                rows.append(parse_row(row, with_details=False, record_span=(record_start, record_end)))
+        return rows
+
+    with open(csv_path, mode='rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode('utf-8')
+    reader = csv.DictReader(io.StringIO(text, newline=''), fieldnames=fieldnames)
+    return [parse_row(row) for row in reader]
+
+
+def iter_parsed_rows_parallel(csv_path, workers: int, with_details: bool = True):
+    """Yield parse_row() results for every data row, in file order, using a pool of workers"""
+    csv_path = str(csv_path)
+    header_span, ranges = split_byte_ranges(csv_path, workers * RANGES_PER_WORKER)
+    if not ranges:
+        return
+    fieldnames = read_fieldnames(csv_path, header_span)
+
+    pending = iter(ranges)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit_next():
+            byte_range = next(pending, None)
+            if byte_range is not None:
+                futures.append(executor.submit(parse_range, csv_path, fieldnames, *byte_range, with_details))
+
+        futures = deque()
+        for _ in range(workers * IN_FLIGHT_PER_WORKER):
+            submit_next()
+        while futures:
+            rows = futures.popleft().result()
+            submit_next()
+            yield from rows
@@ -0,0 +1,167 @@
+"""
+Record-level access to recipes.csv by byte offset.
+
+A quoted field may contain newlines, so a line only ends a record when the number of double
+quotes seen since the record started is even ('""' escapes count as two). These helpers are
+shared by the parallel reader (realigning byte ranges on records) and the lazy detail store
+(per-row offsets).
+"""
+import csv
+import io
+import mmap
+import os
+
+from recipe.adapters.datareader.listparser import parse_list_literal
+
+
+def iter_records(csv_path, start: int = 0, end: int = None):
+    """Yield (record_start, record_end, record_bytes) for each record beginning in [start, end)"""
+    with open(csv_path, mode='rb') as file:
+        file.seek(start)
+        record_start = start
+        offset = start
+        in_quotes = False
+        lines = []
+        for line in file:
+            offset += len(line)
+            lines.append(line)
+            if line.count(b'"') & 1:
+                in_quotes = not in_quotes
+            if not in_quotes:
+                yield record_start, offset, b''.join(lines)
+                lines = []
+                record_start = offset
+                if end is not None and offset >= end:
+                    return
+        if lines:
+            yield record_start, offset, b''.join(lines)
+
+
+def _starts_inside_quotes(data, pos: int) -> bool:
+    """
+    Whether the line starting at pos begins inside a quoted field, decided by reading forward.
+
+    Both answers are followed at once. Outside quotes a quote may only open a field (follow a comma
+    or a line break); inside, it is either doubled or closes the field (precedes a comma or a line
+    break). An answer that breaks either rule is wrong, which well-formed data shows within a few
+    quotes. If both survive to the end of the file, the right one is the one that ends outside.
+    """
+    size = len(data)
+    in_quotes = [False, True]   # current state under each answer
+    escaped = [False, False]    # the quote just seen was the first of a doubled pair
+    alive = [True, True]
+    i = data.find(b'"', pos)
+    while i >= 0:
+        for answer in (0, 1):
+            if not alive[answer]:
+                continue
+            if escaped[answer]:
+                escaped[answer] = False
+            elif not in_quotes[answer]:
+                if i > 0 and data[i - 1] not in b',\r\n':
+                    alive[answer] = False
+                in_quotes[answer] = True
+            elif i + 1 < size and data[i + 1] == 0x22:
+                escaped[answer] = True
+            elif i + 1 >= size or data[i + 1] in b',\r\n':
+                in_quotes[answer] = False
+            else:
+                alive[answer] = False
+        if alive[0] != alive[1]:
+            return alive[1]
+        if not alive[0]:
+            raise ValueError(f"malformed CSV quoting after byte {pos}")
+        i = data.find(b'"', i + 1)
+    return in_quotes[0]
+
+
+def record_start_at(data, pos: int) -> int:
+    """
+    Offset of the first record starting at or after byte pos of data (the mapped file; len(data)
+    when there is none). Any pos gives the same boundaries, so ranges cut at arbitrary offsets can
+    each be realigned on their own.
+    """
+    size = len(data)
+    if 0 < pos < size and data[pos - 1] != 0x0A:
+        line_end = data.find(b'\n', pos)
+        pos = size if line_end < 0 else line_end + 1
+    if pos >= size:
+        return size
+    in_quotes = _starts_inside_quotes(data, pos)
+    while in_quotes:
+        line_end = data.find(b'\n', pos)
+        line_end = size if line_end < 0 else line_end + 1
+        if data[pos:line_end].count(b'"') & 1:
+            in_quotes = False
+        pos = line_end
+        if pos >= size:
+            return size
+    return pos
+
+
+def read_fieldnames(csv_path, header_span) -> list[str]:
+    with open(csv_path, mode='rb') as file:
+        file.seek(header_span[0])
+        header = file.read(header_span[1] - header_span[0]).decode('utf-8')
+    return next(csv.reader(io.StringIO(header, newline='')))
+
+
+def parse_record(record: bytes, fieldnames: list[str]) -> dict:
+    """Decode a single record into a DictReader-style row; returns None for a blank line"""
+    values = next(csv.reader(io.StringIO(record.decode('utf-8'), newline='')), None)
+    if not values:
+        return None
+    return dict(zip(fieldnames, values))
+
+
+class StaleRecordError(RuntimeError):
+    """The CSV behind a RecordStore was rewritten in place, so its record offsets no longer hold"""
+
+
+class RecordStore:
+    """
+    Memory-mapped view of recipes.csv used to decode a recipe's heavy list fields on demand.
+    Decoded ingredients and quantities go through the reader's StringTable when one is given.
+
+    The mapping stays open until close() (MemoryRepository closes it when a reload replaces it);
+    pages are only read when a recipe's details are first accessed. A CSV replaced by a new file
+    keeps the old one mapped, but one rewritten in place would return garbage or fault, so every
+    read first checks that the open file still has the size and mtime it was mapped with.
+    """
+
+    def __init__(self, csv_path, fieldnames: list[str], strings=None):
+        self.__csv_path = str(csv_path)
+        self.__fieldnames = fieldnames
+        self.__strings = strings
+        self.__file = open(self.__csv_path, mode='rb')
+        stat = os.fstat(self.__file.fileno())
+        self.__version = (stat.st_size, stat.st_mtime_ns)
+        self.__mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def csv_path(self) -> str:
+        return self.__csv_path
+
+    def load_details(self, start: int, end: int):
+        """Return (ingredient_quantities, ingredients, instructions) for the record at [start, end)"""
+        stat = os.fstat(self.__file.fileno())
+        if (stat.st_size, stat.st_mtime_ns) != self.__version:
+            raise StaleRecordError(f"{self.__csv_path} was rewritten in place; reload the catalog")
+        row = parse_record(self.__mmap[start:end], self.__fieldnames)
+        quantities = row["RecipeIngredientQuantities"]
+        ingredients = row["RecipeIngredientParts"]
+        instructions = row["RecipeInstructions"]
+        quantities = parse_list_literal(quantities) if quantities else []
+        ingredients = parse_list_literal(ingredients) if ingredients else []
+        if self.__strings is not None:
+            quantities = self.__strings.intern_list(quantities, "ingredient_quantities")
+            ingredients = self.__strings.intern_list(ingredients, "ingredients")
+        return (
+            quantities,
+            ingredients,
+            parse_list_literal(instructions) if instructions else [],
+        )
+
+    def close(self) -> None:
+        self.__mmap.close()
+        self.__file.close()
@@ -0,0 +1,157 @@
+"""
+Binary snapshot of the parsed catalog, stored next to recipes.csv as recipes.csv.snapshot
+(recipes.csv.lazy.snapshot for rows parsed without details, see CSVDataReader lazy_details).
+
+The snapshot holds the parse_row() output for every row, so a later boot can skip CSV decoding,
+list parsing and date parsing. It is keyed on the CSV's size, mtime and content hash and is
+ignored (and rewritten) whenever the CSV changes or the snapshot format version changes.
+"""
+import hashlib
+import os
+import pickle
+import struct
+
+from pathlib import Path
+
+SNAPSHOT_SUFFIX = ".snapshot"
+LAZY_SNAPSHOT_SUFFIX = ".lazy.snapshot"
+
+# Bump whenever parse_row() output changes shape, so old snapshots are not loaded
+SNAPSHOT_VERSION = 4
+
+# Rows are pickled in batches: small enough to keep streaming, large enough to share pickle memos
+SNAPSHOT_BATCH_SIZE = 500
+
+_MAGIC = b"RCPSNAP"
+
+# Fixed-size header after the magic: format version, CSV size, CSV mtime_ns, CSV sha256 digest.
+# Fixed size so that a touched but unchanged CSV's new mtime can be stamped in place.
+_HEADER = struct.Struct("<Iqq32s")
+
+# Pickled after the last batch; reaching the end of the file before it means the snapshot was cut short
+_END = None
+
+
+class SnapshotError(Exception):
+    """The snapshot turned out to be truncated or corrupt while its rows were being read"""
+
+
+def snapshot_path(csv_path, lazy_details: bool = False) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + (LAZY_SNAPSHOT_SUFFIX if lazy_details else SNAPSHOT_SUFFIX))
+
+
+def csv_fingerprint(csv_path, with_hash: bool = True) -> dict:
+    stat = os.stat(csv_path)
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": None}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(csv_path, mode="rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        fingerprint["sha256"] = digest.hexdigest()
+    return fingerprint
+
+
+def _pack_header(fingerprint: dict) -> bytes:
+    return _HEADER.pack(SNAPSHOT_VERSION, fingerprint["size"], fingerprint["mtime_ns"],
+                        bytes.fromhex(fingerprint["sha256"]))
+
+
+def _header_matches(header: bytes, csv_path, path) -> bool:
+    if len(header) != _HEADER.size:
+        return False
+    version, size, mtime_ns, sha256 = _HEADER.unpack(header)
+    if version != SNAPSHOT_VERSION:
+        return False
+    current = csv_fingerprint(csv_path, with_hash=False)
+    if size != current["size"]:
+        return False
+    if mtime_ns == current["mtime_ns"]:
+        return True
+    # Touched but possibly unchanged (e.g. a fresh checkout): fall back to the content hash
+    current = csv_fingerprint(csv_path)
+    if sha256 != bytes.fromhex(current["sha256"]):
+        return False
+    # Unchanged: stamp the new mtime so that later boots skip the hash
+    try:
+        with open(path, mode="r+b") as file:
+            file.seek(len(_MAGIC))
+            file.write(_pack_header(current))
+    except OSError:
+        pass
+    return True
+
+
+def iter_snapshot_rows(csv_path, lazy_details: bool = False):
+    """
+    Yield the parsed rows stored in the snapshot for csv_path.
+    Returns None instead of a generator if there is no valid snapshot. The generator raises
+    SnapshotError if the snapshot turns out to be truncated or corrupt part way through.
+    """
+    path = snapshot_path(csv_path, lazy_details)
+    try:
+        with open(path, mode="rb") as file:
+            preamble = file.read(len(_MAGIC) + _HEADER.size)
+    except OSError:
+        return None
+    if not preamble.startswith(_MAGIC) or not _header_matches(preamble[len(_MAGIC):], csv_path, path):
+        return None
+    return _iter_batches(path, preamble)
+
+
+def _contents_key(preamble: bytes):
+    version, size, _, sha256 = _HEADER.unpack(preamble[len(_MAGIC):])
+    return version, size, sha256
+
+
+def _iter_batches(path, preamble: bytes):
+    with open(path, mode="rb") as file:
+        # Reopened by name, so make sure it is still the snapshot that was checked (bar a new mtime)
+        reread = file.read(len(preamble))
+        if len(reread) != len(preamble) or _contents_key(reread) != _contents_key(preamble):
+            raise SnapshotError(f"snapshot {path} was replaced while being opened")
+        while True:
+            try:
+                batch = pickle.load(file)
+            except (pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError, IndexError) as e:
+                raise SnapshotError(f"unreadable snapshot {path}: {e!r}") from e
+            if batch is _END:
+                return
+            yield from batch
+
+
+class SnapshotWriter:
+    """Writes rows to a temporary file and only replaces the snapshot once every row is written"""
+
+    def __init__(self, csv_path, lazy_details: bool = False):
+        self.__path = snapshot_path(csv_path, lazy_details)
+        self.__tmp_path = self.__path.with_name(self.__path.name + f".{os.getpid()}.tmp")
+        self.__batch = []
+
+        self.__file = open(self.__tmp_path, mode="wb")
+        self.__file.write(_MAGIC)
+        self.__file.write(_pack_header(csv_fingerprint(csv_path)))
+
+    def add(self, row: dict) -> None:
+        self.__batch.append(row)
+        if len(self.__batch) >= SNAPSHOT_BATCH_SIZE:
+            self.__flush_batch()
+
+    def commit(self) -> None:
+        self.__flush_batch()
+        pickle.dump(_END, self.__file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__file.close()
+        os.replace(self.__tmp_path, self.__path)
+
+    def discard(self) -> None:
+        self.__file.close()
+        try:
+            os.remove(self.__tmp_path)
+        except OSError:
+            pass
+
+    def __flush_batch(self) -> None:
+        if self.__batch:
+            pickle.dump(self.__batch, self.__file, protocol=pickle.HIGHEST_PROTOCOL)
+            self.__batch = []
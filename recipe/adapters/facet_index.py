@@ -0,0 +1,27 @@
+"""
+Facet counts (matches per category, per author) for the memory repository's searches.
+
+Each facet keeps one dict from recipe id to that recipe's value (e.g. its category name), so the
+index is a single entry per recipe whatever the number of values. A search's counts come from one
+pass over its matching ids, touching no Recipe and no value the search did not match.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable
+
+
+class FacetIndex:
+    def __init__(self, value_by_id: dict[int, str]):
+        """value_by_id maps each recipe id to its facet value; recipes without a value are left out"""
+        self.__value_of = value_by_id
+
+    def __len__(self) -> int:
+        return len(self.__value_of)
+
+    def counts(self, matching_ids: Iterable[int], limit: int = None) -> dict[str, int]:
+        """Number of matches per value, most frequent first (ties by value), without zeros"""
+        counts = Counter(map(self.__value_of.get, matching_ids))
+        counts.pop(None, None)
+        ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return dict(ordered[:limit] if limit is not None else ordered)
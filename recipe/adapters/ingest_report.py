@@ -0,0 +1,191 @@
+"""
+Timing and throughput report for repository_populate.populate().
+
+populate() runs in phases (recipes, authors, categories, users). Each phase records wall time,
+rows, rows/sec and peak memory. Inside the phases, per-row work is split into stages (csv_decode,
+list_parse, row_convert, domain_build, repository_add, db_flush, password_hash), timed exclusively:
+a stage started inside another is not counted twice.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None where the platform does not report it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageTiming:
+    def __init__(self, name: str, seconds: float = 0.0, rows: int = 0, peak_memory: int = None):
+        self.__name = name
+        self.__seconds = seconds
+        self.__rows = rows
+        self.__peak_memory = peak_memory
+
+    def __repr__(self) -> str:
+        return f"<StageTiming {self.__name}: {self.__seconds:.3f}s, {self.__rows} rows>"
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def seconds(self) -> float:
+        return self.__seconds
+
+    @property
+    def rows(self) -> int:
+        return self.__rows
+
+    @property
+    def rows_per_sec(self) -> float | None:
+        return self.__rows / self.__seconds if self.__rows and self.__seconds > 0 else None
+
+    @property
+    def peak_memory(self) -> int | None:
+        """Peak bytes: traced Python heap if the report traces memory, otherwise process peak RSS"""
+        return self.__peak_memory
+
+    def add(self, seconds: float, rows: int = 0) -> None:
+        self.__seconds += seconds
+        self.__rows += rows
+
+    def as_dict(self) -> dict:
+        return dict(name=self.__name, seconds=self.__seconds, rows=self.__rows,
+                    rows_per_sec=self.rows_per_sec, peak_memory=self.__peak_memory)
+
+
+class IngestReport:
+    """
+    Collects phase and stage timings for one populate() run.
+
+    With trace_memory, each phase's peak is measured with tracemalloc (accurate per phase, but
+    slows ingest down several times); otherwise it is the process peak RSS when the phase ends.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.__trace_memory = trace_memory
+        self.__phases = []
+        self.__stages = {}
+        self.__stack = []
+        self.__started = time.perf_counter()
+        self.__finished = None
+
+    @property
+    def phases(self) -> list[StageTiming]:
+        return list(self.__phases)
+
+    @property
+    def stages(self) -> list[StageTiming]:
+        return list(self.__stages.values())
+
+    def stage(self, name: str) -> StageTiming | None:
+        return self.__stages.get(name)
+
+    @property
+    def total_seconds(self) -> float:
+        end = self.__finished if self.__finished is not None else time.perf_counter()
+        return end - self.__started
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a top-level phase; the body reports its row count through the yielded dict"""
+        tracing = self.__trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.__trace_memory:
+            tracemalloc.reset_peak()
+        counter = {"rows": 0}
+        started = time.perf_counter()
+        try:
+            yield counter
+        finally:
+            seconds = time.perf_counter() - started
+            if self.__trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                if tracing:
+                    tracemalloc.stop()
+            else:
+                peak = peak_rss_bytes()
+            self.__phases.append(StageTiming(name, seconds, counter["rows"], peak))
+
+    def start(self, name: str) -> None:
+        self.__stack.append([name, time.perf_counter(), 0.0])
+
+    def stop(self, rows: int = 0) -> None:
+        name, started, nested = self.__stack.pop()
+        elapsed = time.perf_counter() - started
+        self.add_time(name, elapsed - nested, rows)
+        if self.__stack:
+            self.__stack[-1][2] += elapsed
+
+    def add_time(self, name: str, seconds: float, rows: int = 0) -> None:
+        timing = self.__stages.get(name)
+        if timing is None:
+            timing = self.__stages[name] = StageTiming(name)
+        timing.add(seconds, rows)
+
+    def wrap(self, name: str, func):
+        """Return func timed under stage name, one row per call"""
+        def timed(*args, **kwargs):
+            self.start(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stop(rows=1)
+        return timed
+
+    def finish(self) -> "IngestReport":
+        self.__finished = time.perf_counter()
+        return self
+
+    def as_dict(self) -> dict:
+        return dict(total_seconds=self.total_seconds, trace_memory=self.__trace_memory,
+                    phases=[p.as_dict() for p in self.__phases],
+                    stages=[s.as_dict() for s in self.__stages.values()])
+
+    def to_json(self) -> str:
+        return json.dumps(self.as_dict(), indent=2)
+
+    def format(self) -> str:
+        memory_label = "traced MB" if self.__trace_memory else "peak RSS MB"
+        lines = [f"[ingest] total {self.total_seconds:.2f} s",
+                 f"  {'phase':<16} {'seconds':>9} {'rows':>9} {'rows/sec':>11} {memory_label:>12}"]
+        for timing in self.__phases:
+            lines.append(f"  {timing.name:<16} {timing.seconds:9.3f} {timing.rows:9,} "
+                         f"{_format_rate(timing.rows_per_sec):>11} {_format_mb(timing.peak_memory):>12}")
+        if self.__stages:
+            lines.append(f"  {'stage':<16} {'seconds':>9} {'rows':>9} {'rows/sec':>11}")
+            for timing in self.__stages.values():
+                lines.append(f"  {timing.name:<16} {timing.seconds:9.3f} {timing.rows:9,} "
+                             f"{_format_rate(timing.rows_per_sec):>11}")
+        return "\n".join(lines)
+
+    def log(self, level: int = logging.INFO) -> None:
+        logger.log(level, "%s", self.format())
+
+
+def _format_rate(rate) -> str:
+    return "-" if rate is None else f"{rate:,.0f}"
+
+
+def _format_mb(size) -> str:
+    return "-" if size is None else f"{size / (1024 * 1024):.1f}"
@@ -1,7 +1,20 @@
+import threading
+
+from bisect import bisect_left
+from functools import wraps
+from itertools import islice
 from pathlib import Path
-from typing import List, Iterable
+from collections.abc import Sequence
+from typing import Callable, Dict, List, Iterable, Iterator, Set
 from recipe.adapters.datareader.csvdatareader import CSVDataReader
 from recipe.adapters.repository import AbstractRepository, RepositoryException
+from recipe.adapters.nutrition_table import NutritionTable, NutritionView, NUTRIENTS
+from recipe.adapters.trigram_index import TrigramIndex
+from recipe.adapters.name_index import NameIndex
+from recipe.adapters.facet_index import FacetIndex
+from recipe.adapters.rwlock import ReadWriteLock
+from recipe.adapters.write_ahead_log import (WriteAheadLog, user_record, review_record, delete_review_record,
+                                             favourite_record, next_review_id_record)
 from recipe.domainmodel.recipe import Recipe
 from recipe.domainmodel.author import Author
 from recipe.domainmodel.category import Category
@@ -10,24 +23,186 @@ from recipe.domainmodel.user import User
 import csv # to read users.csv, for recipes.csv we use the CSVDataReader class
 from werkzeug.security import generate_password_hash
 
+# Name matches are sorted directly when they are at most 1/SPARSE_MATCH_FACTOR of the catalog,
+# otherwise they are read off the maintained name order
+SPARSE_MATCH_FACTOR = 8
+
+
+# MemoryRepository locking: catalog reads share repo.lock, catalog writes (add_recipe, reloads)
+# hold it exclusively, and user data (users, reviews, favourites) is changed under repo.user_lock
+# while holding the catalog for reading. Locks are always taken in that order. Changes to user data
+# are appended to the write-ahead log (if attached) under the lock and made durable after it.
+def _reads_catalog(method):
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.read():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+def _writes_catalog(method):
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.write():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+def _reads_user_data(method):
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.read(), self.user_lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
+def _writes_user_data(method):
+    # Logged changes are made durable after the locks are released, so other writers are not held up
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.read(), self.user_lock:
+            result = method(self, *args, **kwargs)
+        self.commit_user_data()
+        return result
+    return locked
+
+
+class RecipeSequence(Sequence):
+    """
+    Read-only view of the repository's recipe list, returned by get_recipes() instead of a copy.
+    It follows later changes to the catalog; take list(view) for a snapshot.
+
+    Every access fetches the current list under the repository's read lock. Deletions replace that
+    list rather than editing it, so a fetched list (and an iterator over it) stays consistent while
+    a reload runs.
+    """
+    __slots__ = ("__current", "__lock")
+
+    def __init__(self, current: Callable[[], List[Recipe]], lock: ReadWriteLock):
+        self.__current = current
+        self.__lock = lock
+
+    def __recipes(self) -> List[Recipe]:
+        with self.__lock.read():
+            return self.__current()
+
+    def __getitem__(self, index):
+        # A slice copies only the slice
+        return self.__recipes()[index]
+
+    def __len__(self) -> int:
+        return len(self.__recipes())
+
+    def __iter__(self) -> Iterator[Recipe]:
+        return iter(self.__recipes())
+
+    def __contains__(self, recipe) -> bool:
+        return recipe in self.__recipes()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RecipeSequence):
+            return self.__recipes() == other.__recipes()
+        if isinstance(other, list):
+            return self.__recipes() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<RecipeSequence of {len(self)} recipes>"
+
+
 class MemoryRepository(AbstractRepository):
 
     def __init__(self):
+        self.__lock = ReadWriteLock()
+        self.__user_lock = threading.RLock()
+        self.__ingredient_index_lock = threading.Lock()
+        self.__facet_lock = threading.Lock()
+        self.__log = None  # WriteAheadLog of user data changes, see attach_write_ahead_log
         self.__recipes: List[Recipe] = []
         self.__recipes_index = dict()  # id -> Recipe
         self.__categories = dict() # name -> Category
         self.__users = dict() # username -> User
         self.__reviews = dict()  # review_id -> Review
+        self.__next_review_id = 1  # never reused, even after deletions
+        self.__reviews_by_recipe = dict()  # recipe id -> {review_id: Review}
+        self.__reviews_by_user = dict()  # username -> {review_id: Review}
+        self.__favourite_ids = dict()  # username -> set of favourite recipe ids
 
         self.__authors_by_id = dict()  # id -> Author
         self.__categories_by_id = dict() # id -> Category
         self.__authors_by_name = dict() # name -> List(Author)
+        self.__catalog_digests = dict() # recipe id -> digest of its recipes.csv row
+        self.__record_store = None # RecordStore that lazily-decoded recipe details are read from
+        self.__nutrition = NutritionTable() # one column per nutrient, see nutrition_table.py
+        self.__stale_nutrition_rows = 0 # rows of deleted recipes, reclaimed by __compact_nutrition
+        self.__positions = dict() # recipe id -> catalog position (monotonic, follows self.__recipes order)
+        self.__next_position = 0
+        self.__name_index = TrigramIndex() # recipe id -> lowercased name, searchable by substring
+        self.__name_keys = dict() # recipe id -> (lowercased name, position)
+        self.__name_order_keys = [] # sorted name keys ...
+        self.__name_order: List[Recipe] = [] # ... and the recipes in that order
+        self.__author_name_index = NameIndex(self.__positions.__getitem__) # author name -> recipe ids
+        self.__category_name_index = NameIndex(self.__positions.__getitem__) # category name -> recipe ids
+        self.__ingredient_index = None # ingredient -> recipe ids, built on the first ingredient search
+        self.__ingredient_terms = dict() # recipe id -> the ingredients it is indexed under
+        self.__facets = None # field -> FacetIndex, built on the first facet count, dropped by catalog changes
+
+    @property
+    def lock(self) -> ReadWriteLock:
+        """Guards the catalog; hold lock.read() to make several reads consistent with each other"""
+        return self.__lock
+
+    @property
+    def user_lock(self) -> threading.RLock:
+        return self.__user_lock
+
+    # Write-ahead log functions
+    @property
+    def write_ahead_log(self) -> WriteAheadLog | None:
+        return self.__log
+
+    def attach_write_ahead_log(self, log: WriteAheadLog):
+        """Log every later user, review and favourite change to log (replay it into this repository first)"""
+        with self.__user_lock:
+            self.__log = log
+
+    def commit_user_data(self):
+        """Wait until this thread's logged changes are durable, compacting the log when it has grown"""
+        log = self.__log
+        if log is None:
+            return
+        log.commit()
+        if log.needs_compaction:
+            self.compact_write_ahead_log()
+
+    def compact_write_ahead_log(self):
+        with self.lock.read(), self.__user_lock:
+            if self.__log is not None:
+                self.__log.compact(self.__user_data_records())
+
+    def __user_data_records(self):
+        yield next_review_id_record(self.__next_review_id)
+        for user in self.__users.values():
+            yield user_record(user)
+        for review_id in sorted(self.__reviews):
+            yield review_record(self.__reviews[review_id])
+        for username, favourite_ids in self.__favourite_ids.items():
+            for fav in self.__users[username].favourite_recipes:
+                if fav.recipe is not None and fav.recipe.id in favourite_ids:
+                    yield favourite_record(username, fav.recipe.id)
+
+    def __log_change(self, record: dict):
+        if self.__log is not None:
+            self.__log.append(record)
 
-    
     # User functions
    
+    @_writes_user_data
     def add_user(self, user: User):
         self.__users[user.username] = user
+        self.__favourite_ids[user.username] = {
+            fav.recipe.id for fav in user.favourite_recipes if getattr(fav, 'recipe', None) is not None}
+        self.__log_change(user_record(user))
 
     def get_user(self, username) -> User:
         if username not in self.__users:
@@ -37,6 +212,7 @@ class MemoryRepository(AbstractRepository):
     
     # Recipe functions
 
+    @_writes_catalog
     def add_recipe(self, recipe: Recipe):
         if not isinstance(recipe, Recipe):
             raise TypeError("Expected a Recipe instance")
@@ -49,6 +225,15 @@ class MemoryRepository(AbstractRepository):
             #return  # ignore duplicates
         self.__recipes_index[recipe_id] = recipe
         self.__recipes.append(recipe)
+        self.__positions[recipe_id] = self.__next_position
+        self.__next_position += 1
+        self.__index_recipe(recipe)
+
+        # Keep every recipe's nutrients in the columnar table (ingest already fills it directly)
+        nutrition = recipe.nutrition
+        if nutrition is not None and not (isinstance(nutrition, NutritionView) and nutrition.table is self.__nutrition):
+            recipe.nutrition = self.__nutrition.append(
+                nutrition.id, **{name: getattr(nutrition, name) for name in NUTRIENTS})
         
         # Update Category and Author objects' recipes list
         recipe.category.add_recipe(recipe)
@@ -57,45 +242,169 @@ class MemoryRepository(AbstractRepository):
     def get_recipe_by_id(self, recipe_id: int):
         return self.__recipes_index.get(recipe_id)
 
-    def get_recipes(self) -> List[Recipe]:
-        return list(self.__recipes)
+    def get_recipes(self) -> Sequence[Recipe]:
+        return RecipeSequence(self.__current_recipes, self.lock)
 
+    @_reads_catalog
+    def iter_recipes(self) -> Iterator[Recipe]:
+        return iter(self.__recipes)
+
+    def __current_recipes(self) -> List[Recipe]:
+        return self.__recipes
+
+    @_reads_catalog
     def get_featured_recipes(self, limit: int = 6) -> List[Recipe]:
         import random
         return random.sample(self.__recipes, k=min(limit, len(self.__recipes))) if self.__recipes else []
 
+    @_reads_catalog
     def get_recipes_paginated(self, page: int, per_page: int) -> List[Recipe]:
         """Get a page of recipes using list slicing"""
         start = (page - 1) * per_page
         end = start + per_page
         return self.__recipes[start:end]
 
+    @_reads_catalog
     def get_recipes_by_name_paginated(self, name: str, page: int, per_page: int) -> List[Recipe]:
-        """Search recipes by name with pagination - filters first, then paginates"""
-        matching_recipes = self.get_recipes_by_name(name)
+        """Search recipes by name with pagination - reads the name order only as far as the page"""
         start = (page - 1) * per_page
         end = start + per_page
-        return matching_recipes[start:end]
+        if start < 0 or end < start:
+            return self.get_recipes_by_name(name)[start:end]
+        return list(islice(self.__iter_recipes_by_name(name), start, end))
 
     def count_recipes(self) -> int:
         """Count total recipes in memory"""
         return len(self.__recipes)
 
+    @_reads_catalog
     def count_recipes_by_name(self, name: str) -> int:
         """Count recipes matching name in memory"""
-        return len(self.get_recipes_by_name(name))
+        name = (name or "").strip().lower()
+        if not name:
+            return len(self.__recipes)
+        matching_ids = self.__name_index.search(name)
+        if matching_ids is None:
+            return sum(1 for key in self.__name_order_keys if name in key[0])
+        return len(matching_ids)
 
     def get_number_of_recipe(self):
         return len(self.__recipes)
 
+    @_reads_catalog
     def get_recipes_by_name(self, name: str) -> List[Recipe]:
+        return list(self.__iter_recipes_by_name(name))
+
+    def __iter_recipes_by_name(self, name: str):
+        """Recipes whose name contains name, ordered by lowercased name (ties in catalog order)"""
         name = (name or "").strip().lower()
-        def _name_key(r: Recipe):
-            return (getattr(r, "name", "") or "").lower()
         if not name:
-            return sorted(self.__recipes, key=_name_key)
-        matches = [r for r in self.__recipes if name in _name_key(r)]
-        return sorted(matches, key=_name_key)
+            return iter(self.__name_order)
+        matching_ids = self.__name_index.search(name)
+        if matching_ids is None:
+            # Shorter than a trigram: filter the name order itself
+            return (r for r, key in zip(self.__name_order, self.__name_order_keys) if name in key[0])
+        if len(matching_ids) * SPARSE_MATCH_FACTOR <= len(self.__name_order):
+            recipes_index = self.__recipes_index
+            return (recipes_index[i] for i in sorted(matching_ids, key=self.__name_keys.__getitem__))
+        return (r for r in self.__name_order if r.id in matching_ids)
+
+    # Index maintenance, shared by add_recipe and apply_catalog_delta
+    def __index_recipe(self, recipe: Recipe):
+        self.__facets = None
+        name = getattr(recipe, "name", "") or ""
+        self.__name_index.add(recipe.id, name)
+        if recipe.author is not None:
+            self.__author_name_index.add(recipe.author.name, recipe.id)
+        if recipe.category is not None:
+            self.__category_name_index.add(recipe.category.name, recipe.id)
+        if self.__ingredient_index is not None:
+            self.__index_ingredients(self.__ingredient_index, recipe)
+
+        key = (name.lower(), self.__positions[recipe.id])
+        self.__name_keys[recipe.id] = key
+        i = bisect_left(self.__name_order_keys, key)
+        self.__name_order_keys.insert(i, key)
+        self.__name_order.insert(i, recipe)
+
+    def __unindex_recipe(self, recipe: Recipe):
+        self.__facets = None
+        self.__name_index.remove(recipe.id)
+        if recipe.author is not None:
+            self.__author_name_index.remove(recipe.author.name, recipe.id)
+        if recipe.category is not None:
+            self.__category_name_index.remove(recipe.category.name, recipe.id)
+        for term in self.__ingredient_terms.pop(recipe.id, ()):
+            self.__ingredient_index.remove(term, recipe.id)
+
+        key = self.__name_keys.pop(recipe.id, None)
+        if key is not None:
+            i = bisect_left(self.__name_order_keys, key)
+            del self.__name_order_keys[i]
+            del self.__name_order[i]
+
+    def __index_ingredients(self, index: NameIndex, recipe: Recipe):
+        # read_ingredients() leaves lazily loaded details deferred
+        terms = tuple(dict.fromkeys((ingredient or "").lower() for ingredient in recipe.read_ingredients()))
+        self.__ingredient_terms[recipe.id] = terms
+        for term in terms:
+            index.add(term, recipe.id)
+
+    def __get_ingredient_index(self) -> NameIndex:
+        # Built by the first search, which only holds the catalog for reading: concurrent searches
+        # wait for one build and see the index only once it is complete
+        if self.__ingredient_index is None:
+            with self.__ingredient_index_lock:
+                if self.__ingredient_index is None:
+                    index = NameIndex(self.__positions.__getitem__, multi_valued=True, term_index=True)
+                    for recipe in self.__recipes:
+                        self.__index_ingredients(index, recipe)
+                    self.__ingredient_index = index
+        return self.__ingredient_index
+
+    def __get_facets(self) -> Dict[str, FacetIndex]:
+        # Built under the catalog read lock like the ingredient index; catalog writes drop it
+        if self.__facets is None:
+            with self.__facet_lock:
+                if self.__facets is None:
+                    by_category, by_author = dict(), dict()
+                    for recipe in self.__recipes:
+                        if recipe.category is not None:
+                            by_category[recipe.id] = recipe.category.name
+                        if recipe.author is not None:
+                            by_author[recipe.id] = recipe.author.name
+                    self.__facets = dict(category=FacetIndex(by_category), author=FacetIndex(by_author))
+        return self.__facets
+
+    def __matching_ids(self, filter_by: str, query: str) -> Iterable[int]:
+        """Ids of the recipes a browse search matches, in no particular order"""
+        query = (query or "").strip().lower()
+        if filter_by == "ingredient":
+            return self.__get_ingredient_index().iter_ids(query)
+        if filter_by == "author":
+            return self.__author_name_index.iter_ids(query)
+        if filter_by == "category":
+            return self.__category_name_index.iter_ids(query)
+        if not query:
+            return self.__recipes_index.keys()
+        matching_ids = self.__name_index.search(query)
+        if matching_ids is None:
+            return (r.id for r, key in zip(self.__name_order, self.__name_order_keys) if query in key[0])
+        return matching_ids
+
+    @_reads_catalog
+    def get_facet_counts(self, filter_by: str, query: str, limit: int = None) -> Dict[str, Dict[str, int]]:
+        """Matches of a search (filter_by name, ingredient, author or category) per category and per author"""
+        facets = self.__get_facets()
+        # Materialised once, as the ids are counted for every facet
+        matching_ids = list(self.__matching_ids(filter_by, query))
+        return {field: facet.counts(matching_ids, limit) for field, facet in facets.items()}
+
+    @_reads_catalog
+    def build_search_indexes(self):
+        """Build the indexes that are otherwise built by the first search (see recipe/preload.py)"""
+        self.__get_ingredient_index()
+        self.__get_facets()
 
     def get_first_recipe(self):
         return self.__recipes[0] if self.__recipes else None
@@ -103,11 +412,184 @@ class MemoryRepository(AbstractRepository):
     def get_last_recipe(self):
         return self.__recipes[-1] if self.__recipes else None
 
+    @_reads_catalog
     def get_recipes_by_id(self, id_list: List[int]) -> List[Recipe]:
         return [self.__recipes_index[i] for i in id_list if i in self.__recipes_index]
 
+    # Nutrition functions
+    def get_nutrition_table(self) -> NutritionTable:
+        return self.__nutrition
+
+    @_reads_catalog
+    def get_recipes_by_nutrient_range(self, nutrient: str, minimum: float = None,
+                                      maximum: float = None) -> List[Recipe]:
+        """Recipes whose nutrient value lies in [minimum, maximum], found with one scan of its column"""
+        table = self.__nutrition
+        ids = table.ids
+        recipes = []
+        for position in table.positions_between(nutrient, minimum, maximum):
+            recipe = self.__recipes_index.get(ids[position])
+            # Skip rows left behind by recipes that were reloaded or removed
+            nutrition = getattr(recipe, 'nutrition', None)
+            if isinstance(nutrition, NutritionView) and nutrition.table is table and nutrition.position == position:
+                recipes.append(recipe)
+        return recipes
+
+
+    # Catalog reload functions
+    @_writes_catalog
+    def set_catalog_digests(self, digests: dict):
+        """Remember the row digest of every recipe loaded from recipes.csv (see CSVDataReader.row_digests)"""
+        self.__catalog_digests = dict(digests)
+
+    @_reads_catalog
+    def get_catalog_digests(self) -> dict:
+        return dict(self.__catalog_digests)
+
+    @_writes_catalog
+    def set_record_store(self, record_store):
+        """Keep the RecordStore that lazy recipe details are decoded from, closing the one it replaces"""
+        self.__replace_record_store(record_store)
+
+    def __replace_record_store(self, record_store):
+        old, self.__record_store = self.__record_store, record_store
+        if old is not None and old is not record_store:
+            old.close()
+
+    @_reads_catalog
+    def get_authors_by_id(self) -> dict:
+        return dict(self.__authors_by_id)
+
+    @_reads_catalog
+    def get_categories_by_name(self) -> dict:
+        return dict(self.__categories)
+
+    @_writes_catalog
+    def apply_catalog_delta(self, changed: Iterable[Recipe], digests: dict, detail_loader=None,
+                            record_store=None) -> dict:
+        """
+        Apply a re-read of recipes.csv without rebuilding the repository.
+
+        changed holds the new and modified recipes (built against this repository's authors and
+        categories, but not linked to them) and digests the row digest of every recipe still in
+        the file. Modified recipes are updated in place, so the reviews and favourites that refer
+        to them are kept; recipes that left the file are removed together with their reviews and
+        favourites. detail_loader(recipe_id), if given, re-points unchanged lazy recipes at the
+        new file; record_store, the RecordStore of the new file, then replaces (and closes) the old
+        one. Returns the number of inserted, updated, deleted and unchanged recipes.
+        """
+        inserted = updated = 0
+        changed_ids = set()
+        for recipe in changed:
+            changed_ids.add(recipe.id)
+            if recipe.author.id not in self.__authors_by_id:
+                self.add_author(recipe.author)
+            if recipe.category.name not in self.__categories:
+                self.add_category(recipe.category)
+
+            existing = self.__recipes_index.get(recipe.id)
+            if existing is None:
+                self.add_recipe(recipe)
+                inserted += 1
+                continue
+
+            old_author, old_category, old_nutrition = existing.author, existing.category, existing.nutrition
+            self.__unindex_recipe(existing)
+            existing.refresh_from(recipe)
+            self.__refresh_nutrition(existing, old_nutrition)
+            self.__index_recipe(existing)
+            if old_author is not existing.author:
+                old_author.remove_recipe(existing)
+                existing.author.add_recipe(existing)
+            if old_category is not existing.category:
+                old_category.remove_recipe(existing)
+                existing.category.add_recipe(existing)
+            updated += 1
+
+        deleted_ids = {recipe_id for recipe_id in self.__catalog_digests
+                       if recipe_id not in digests and recipe_id in self.__recipes_index}
+        for recipe_id in deleted_ids:
+            self.__remove_catalog_recipe(self.__recipes_index.pop(recipe_id))
+        if deleted_ids:
+            # A new list, so iterators and RecipeSequence reads already under way keep a consistent one
+            self.__recipes = [r for r in self.__recipes if r.id not in deleted_ids]
+        # Deleted recipes leave their rows behind; rebuild the table once they are a quarter of it
+        if self.__stale_nutrition_rows * 4 > len(self.__nutrition):
+            self.__compact_nutrition()
+
+        if detail_loader is not None:
+            for recipe_id in digests:
+                recipe = self.__recipes_index.get(recipe_id)
+                if recipe_id in changed_ids or recipe is None or recipe.details_loaded:
+                    continue
+                loader = detail_loader(recipe_id)
+                if loader is not None:
+                    recipe.defer_details(loader)
+            if record_store is not None:
+                self.__replace_record_store(record_store)
+
+        self.__catalog_digests = dict(digests)
+        return dict(inserted=inserted, updated=updated, deleted=len(deleted_ids),
+                    unchanged=len(digests) - len(changed_ids))
+
+    def __owns_nutrition(self, nutrition) -> bool:
+        return isinstance(nutrition, NutritionView) and nutrition.table is self.__nutrition
+
+    def __refresh_nutrition(self, recipe: Recipe, old_nutrition):
+        """Write the nutrition a reload parsed for recipe into the table row it already had"""
+        nutrition = recipe.nutrition
+        if nutrition is None:
+            self.__stale_nutrition_rows += self.__owns_nutrition(old_nutrition)
+        elif self.__owns_nutrition(old_nutrition):
+            self.__nutrition.update(old_nutrition.position, **{name: getattr(nutrition, name) for name in NUTRIENTS})
+            recipe.nutrition = old_nutrition
+        elif not self.__owns_nutrition(nutrition):
+            recipe.nutrition = self.__nutrition.append(
+                nutrition.id, **{name: getattr(nutrition, name) for name in NUTRIENTS})
+
+    def __compact_nutrition(self):
+        """Copy the live rows into a new table and point each recipe at its new row"""
+        owners = [recipe for recipe in self.__recipes if self.__owns_nutrition(recipe.nutrition)]
+        table = self.__nutrition.copy_rows([recipe.nutrition.position for recipe in owners])
+        for position, recipe in enumerate(owners):
+            recipe.nutrition = table.view(position)
+        self.__nutrition = table
+        self.__stale_nutrition_rows = 0
+
+    def __remove_catalog_recipe(self, recipe: Recipe):
+        self.__stale_nutrition_rows += self.__owns_nutrition(recipe.nutrition)
+        self.__unindex_recipe(recipe)
+        del self.__positions[recipe.id]
+        recipe.author.remove_recipe(recipe)
+        recipe.category.remove_recipe(recipe)
+        with self.__user_lock:
+            self.__remove_user_data_of(recipe)
+
+    def __remove_user_data_of(self, recipe: Recipe):
+        for review in list(self.__reviews_by_recipe.pop(recipe.id, {}).values()):
+            review.user.remove_review(review)
+            self.__reviews.pop(review.id, None)
+            self.__reviews_by_user.get(review.user.username, {}).pop(review.id, None)
+        for username, favourite_ids in self.__favourite_ids.items():
+            if recipe.id in favourite_ids:
+                self.__remove_favourite(self.__users[username], recipe)
+
+    # Ingredient functions
+    @_reads_catalog
+    def get_recipes_by_ingredient_name(self, ingredient_text: str) -> List[Recipe]:
+        return [self.__recipes_index[i] for i in self.__get_ingredient_index().iter_ids(ingredient_text)]
+
+    @_reads_catalog
+    def get_recipes_by_ingredient_name_paginated(self, ingredient_text: str, page: int, per_page: int) -> List[Recipe]:
+        """Search recipes by ingredient with pagination (case-insensitive, partial), in catalog order"""
+        return self.__page_of_ids(self.__get_ingredient_index().iter_ids(ingredient_text), page, per_page)
+
+    @_reads_catalog
+    def count_recipes_by_ingredient_name(self, ingredient_text: str) -> int:
+        return self.__get_ingredient_index().count(ingredient_text)
 
     # Author functions
+    @_writes_catalog
     def add_author(self, author: Author):
         if not isinstance(author, Author):
             raise TypeError("Expected an Author instance")
@@ -129,6 +611,7 @@ class MemoryRepository(AbstractRepository):
             self.__authors_by_name[author.name].append(author)
 
 
+    @_reads_catalog
     def get_authors_by_name(self, name: str) -> Author:
         if name not in self.__authors_by_name:
             raise RepositoryException(f"Author with name: {name} does not exist")
@@ -139,16 +622,35 @@ class MemoryRepository(AbstractRepository):
             raise RepositoryException(f"Author with id: {author_id} does not exist")
         return self.__authors_by_id[author_id]
     
+    @_reads_catalog
     def get_recipes_by_author_id(self, author_id: int) -> List[Recipe]:
         if author_id not in self.__authors_by_id:
             raise RepositoryException(f"Author with id: {author_id} does not exist")
         return [r for r in self.__recipes if getattr(getattr(r, "author", None), "id", None) == author_id]
 
+    @_reads_catalog
+    def get_recipes_by_author_name_paginated(self, author_name: str, page: int, per_page: int) -> List[Recipe]:
+        """Search recipes by author name with pagination (case-insensitive, partial), in catalog order"""
+        return self.__page_of_ids(self.__author_name_index.iter_ids(author_name), page, per_page)
+
+    @_reads_catalog
+    def count_recipes_by_author_name(self, author_name: str) -> int:
+        return self.__author_name_index.count(author_name)
+
+    def __page_of_ids(self, ids, page: int, per_page: int) -> List[Recipe]:
+        start = (page - 1) * per_page
+        end = start + per_page
+        if start < 0 or end < start:
+            return [self.__recipes_index[i] for i in ids][start:end]
+        return [self.__recipes_index[i] for i in islice(ids, start, end)]
+
+    @_reads_catalog
     def get_recipes_by_author_name(self, author_name: str) -> List[Recipe]:
         #return [r for r in self.__recipes if getattr(getattr(r, "author", None), "author_name", None) == author_name]
         return [r for r in self.__recipes if getattr(getattr(r, "author", None), "name", None) == author_name]
 
     # Category functions
+    @_writes_catalog
     def add_category(self, category: Category):
         if not isinstance(category, Category):
             raise TypeError("Expected a Category instance")
@@ -172,6 +674,16 @@ class MemoryRepository(AbstractRepository):
             raise RepositoryException(f"Category with name: {category_name} does not exist")
         return self.__categories.get(category_name)
 
+    @_reads_catalog
+    def get_recipes_by_category_name_paginated(self, category_name: str, page: int, per_page: int) -> List[Recipe]:
+        """Search recipes by category name with pagination (case-insensitive, partial), in catalog order"""
+        return self.__page_of_ids(self.__category_name_index.iter_ids(category_name), page, per_page)
+
+    @_reads_catalog
+    def count_recipes_by_category_name(self, category_name: str) -> int:
+        return self.__category_name_index.count(category_name)
+
+    @_reads_catalog
     def get_recipes_by_category_name(self, category_name: str) -> List[Recipe]:
         if not isinstance(category_name, str):
             raise TypeError("category_name must be a str")
@@ -180,8 +692,13 @@ class MemoryRepository(AbstractRepository):
         return [r for r in self.__recipes if getattr(getattr(r, "category", None), "name", None) == category_name]
 
     # Review functions
+    def advance_next_review_id(self, review_id: int):
+        """Never hand out a review id below review_id (restores the counter of a compacted log)"""
+        with self.__user_lock:
+            self.__next_review_id = max(self.__next_review_id, review_id)
+
+    @_writes_user_data
     def add_review(self, review):
-        print("Added a review successfully")
         if not hasattr(review, 'recipe') or not hasattr(review, 'user'):
             raise RepositoryException("Review must have recipe and user")
         
@@ -189,41 +706,27 @@ class MemoryRepository(AbstractRepository):
         if recipe is None:
             raise RepositoryException("Recipe not found")
         
-        # Auto-generate ID if not provided (for new reviews)
+        # Auto-generate ID if not provided (for new reviews). Ids come from a counter that only
+        # moves forward, so an id freed by a deletion is never handed out again.
         if review.id is None:
-            # Generate the review ID based on the maximum existing ID to avoid collisions
-            # Using len() would cause ID reuse after deletions!
-            if self.__reviews:
-                max_id = max(self.__reviews.keys())
-                review.id = max_id + 1
-            else:
-                review.id = 1
-
-            # OLD BUGGY VERSION: Using len() causes ID reuse after deletions! 
-            # hence test_Review_id_no_colission_after_deletion fails
-            # review.id = len(self.__reviews) + 1
+            review.id = self.__next_review_id
+        self.__next_review_id = max(self.__next_review_id, review.id + 1)
             
         recipe.add_review(review)
         review.user.add_review(review)
         self.__reviews[review.id] = review
-        
-        print("Added a review successfully")
+        self.__reviews_by_recipe.setdefault(recipe.id, {})[review.id] = review
+        self.__reviews_by_user.setdefault(review.user.username, {})[review.id] = review
+        self.__log_change(review_record(review))
 
+    @_writes_user_data
     def delete_review(self, review_id: int, username: str):
-        print(f"[DEBUG] Attempting to delete review_id={review_id} by username={username}")
-        print(f"[DEBUG] Available review IDs: {list(self.__reviews.keys())}")
-        
         review = self.__reviews.get(review_id)
-
         if review is None:
-            print(f"[DEBUG] Review {review_id} not found in repository")
             return False
 
-        print(f"[DEBUG] Review found. Owner: {review.user.username}")
-        
         # Check that the user created this review
         if review.user.username != username:
-            print(f"[DEBUG] Username mismatch: {review.user.username} != {username}")
             return False
 
         recipe = review.recipe
@@ -232,51 +735,75 @@ class MemoryRepository(AbstractRepository):
         recipe.remove_review(review)
         user.remove_review(review)
         del self.__reviews[review_id]
-        
-        print(f"[DEBUG] Review {review_id} deleted successfully")
+        self.__reviews_by_recipe.get(recipe.id, {}).pop(review_id, None)
+        self.__reviews_by_user.get(username, {}).pop(review_id, None)
+        self.__log_change(delete_review_record(review_id, username))
         return True
+
+    @_reads_user_data
+    def get_reviews_by_recipe_id(self, recipe_id: int) -> list:
+        return list(self.__reviews_by_recipe.get(recipe_id, {}).values())
+
+    @_reads_user_data
+    def get_reviews_by_username(self, username: str) -> list:
+        return list(self.__reviews_by_user.get(username, {}).values())
             
 
     # Favourite function
+    @_writes_user_data
     def add_favourite(self, user: User, recipe: Recipe):
         if user is None or recipe is None:
             return
+        favourite_ids = self.__favourite_ids.setdefault(user.username, set())
+        if recipe.id in favourite_ids:
+            return  # already a favourite
         # create a Favourite domain object and add to user's favourites
         from recipe.domainmodel.favourite import Favourite
         identifier = getattr(user, 'username', None) or getattr(user, 'id', None)
         fav = Favourite(user_id=identifier, user=user, recipe=recipe)
-        try:
-            user.add_favourite_recipe(fav)
-        except Exception:
-            # if user.add_favourite_recipe raises (duplicate), ignore
-            pass
+        # The id set already rules out a duplicate, so skip User.add_favourite_recipe's linear check
+        user.favourite_recipes.append(fav)
+        favourite_ids.add(recipe.id)
+        self.__log_change(favourite_record(user.username, recipe.id))
 
+    @_writes_user_data
     def remove_favourite(self, user: User, recipe: Recipe):
+        self.__remove_favourite(user, recipe)
+
+    def __remove_favourite(self, user: User, recipe: Recipe):
+        # Callers hold the user-data lock and commit the logged change themselves
         if user is None or recipe is None:
             return
+        favourite_ids = self.__favourite_ids.get(user.username)
+        if not favourite_ids or recipe.id not in favourite_ids:
+            return
+        favourite_ids.discard(recipe.id)
         # find the Favourite object for this recipe and remove it
-        fav_to_remove = None
-        for fav in list(getattr(user, 'favourite_recipes', [])):
-            if getattr(getattr(fav, 'recipe', None), 'id', None) == getattr(recipe, 'id', None):
-                fav_to_remove = fav
+        favourites = user.favourite_recipes
+        for i, fav in enumerate(favourites):
+            if getattr(getattr(fav, 'recipe', None), 'id', None) == recipe.id:
+                del favourites[i]
                 break
-        if fav_to_remove:
-            try:
-                user.remove_favourite_recipe(fav_to_remove)
-            except Exception:
-                pass
+        self.__log_change(favourite_record(user.username, recipe.id, added=False))
 
+    @_reads_user_data
     def get_user_favourites(self, username: str) -> List[Recipe]:
         user = self.get_user(username)
         if user is None:
             return []
         return [fav.recipe for fav in user.favourite_recipes if fav.recipe is not None]
 
+    @_reads_user_data
     def is_recipe_in_favourites(self, username: str, recipe_id: int) -> bool:
-        user = self.get_user(username)
-        if user is None:
+        if username not in self.__users:
             return False
-        return any(fav.recipe.id == recipe_id for fav in user.favourite_recipes if fav.recipe is not None)
+        return recipe_id in self.__favourite_ids.get(username, ())
+
+    @_reads_user_data
+    def get_favourite_ids(self, username: str, recipe_ids: Iterable[int]) -> Set[int]:
+        if username not in self.__users:
+            return set()
+        return self.__favourite_ids.get(username, set()).intersection(recipe_ids)
 
 def read_general_csv_file(filename: str): # Used for any csv file that is NOT recipes.csv, which is read with CSVDataReader
     with open(filename, encoding='utf-8-sig') as infile:
@@ -295,13 +822,14 @@ def load_recipes(data_path: Path, repo: MemoryRepository):
     csv_path = data_path / "recipes.csv"
     if not csv_path.exists():
         raise RepositoryException(f"CSV file not found: {csv_path}")
-    reader = CSVDataReader(str(csv_path))
-    reader.csv_read()
-    for recipe in getattr(reader, "recipes", []):
+    # add_recipe links each recipe to its author and category, so the reader must not
+    reader = CSVDataReader(str(csv_path), nutrition_table=repo.get_nutrition_table(), link_recipes=False)
+    for recipe in reader.iter_recipes():
         try:
             repo.add_recipe(recipe)
         except Exception:
             pass
+    repo.set_catalog_digests(reader.row_digests)
     return reader
 
 def load_authors(reader, repo: MemoryRepository):
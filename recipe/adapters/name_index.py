@@ -0,0 +1,90 @@
+"""
+Name -> recipe ids index for the memory repository's author, category and ingredient searches.
+
+Each distinct (lowercased) name keeps the ids of its recipes in catalog order. A substring query
+first picks the matching names, which are few compared to recipes, then merges their id lists
+by catalog position, so results come out in catalog order and a page can stop reading early.
+
+With multi_valued, a recipe may be filed under several names (one per ingredient), so merged
+ids are deduplicated and counts are of distinct recipes. With term_index, the distinct names
+are themselves kept in a TrigramIndex, which answers queries of three or more characters
+without scanning every name.
+"""
+from __future__ import annotations
+
+from heapq import merge
+
+from recipe.adapters.trigram_index import TrigramIndex
+
+
+class NameIndex:
+    def __init__(self, position_of, multi_valued: bool = False, term_index: bool = False):
+        """position_of(recipe_id) gives the recipe's catalog position, used to order and merge ids"""
+        self.__position_of = position_of
+        self.__multi_valued = multi_valued
+        self.__ids_by_name = dict()  # lowercased name -> recipe ids in catalog order
+        self.__terms = TrigramIndex() if term_index else None  # name -> name, searchable by substring
+
+    def __len__(self) -> int:
+        return len(self.__ids_by_name)
+
+    def add(self, name: str, recipe_id: int) -> None:
+        name = (name or "").lower()
+        ids = self.__ids_by_name.get(name)
+        if ids is None:
+            ids = self.__ids_by_name[name] = []
+            if self.__terms is not None:
+                self.__terms.add(name, name)
+        position = self.__position_of(recipe_id)
+        if not ids or self.__position_of(ids[-1]) < position:
+            # Ingest appends in catalog order
+            ids.append(recipe_id)
+            return
+        i = len(ids)
+        while i > 0 and self.__position_of(ids[i - 1]) > position:
+            i -= 1
+        if i > 0 and ids[i - 1] == recipe_id:
+            return
+        ids.insert(i, recipe_id)
+
+    def remove(self, name: str, recipe_id: int) -> None:
+        name = (name or "").lower()
+        ids = self.__ids_by_name.get(name)
+        if ids is None or recipe_id not in ids:
+            return
+        ids.remove(recipe_id)
+        if not ids:
+            del self.__ids_by_name[name]
+            if self.__terms is not None:
+                self.__terms.remove(name)
+
+    def matching_names(self, query: str) -> list[str]:
+        query = (query or "").lower()
+        if self.__terms is not None:
+            names = self.__terms.search(query)
+            if names is not None:
+                return list(names)
+        return [name for name in self.__ids_by_name if query in name]
+
+    def count(self, query: str) -> int:
+        id_lists = [self.__ids_by_name[name] for name in self.matching_names(query)]
+        if self.__multi_valued and len(id_lists) > 1:
+            return len(set().union(*id_lists))
+        return sum(len(ids) for ids in id_lists)
+
+    def iter_ids(self, query: str):
+        """Ids of recipes whose name contains query (case-insensitive), in catalog order"""
+        id_lists = [self.__ids_by_name[name] for name in self.matching_names(query)]
+        if len(id_lists) == 1:
+            return iter(id_lists[0])
+        merged = merge(*id_lists, key=self.__position_of)
+        return _unique_adjacent(merged) if self.__multi_valued else merged
+
+
+def _unique_adjacent(ids):
+    # Merged by position, the copies of one id are next to each other
+    previous = None
+    for recipe_id in ids:
+        if recipe_id != previous:
+            yield recipe_id
+            previous = recipe_id
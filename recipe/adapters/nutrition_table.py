@@ -0,0 +1,134 @@
+"""
+Columnar nutrition storage for the memory repository.
+
+Instead of one Nutrition object (nine private attributes) per recipe, every nutrient is kept in
+its own array('d') indexed by a dense position assigned at ingest. Recipe.nutrition holds a
+NutritionView, which reads and writes its position in the columns, so templates and
+health_star_rating() work unchanged, while catalog-wide scans run over one flat array.
+"""
+from array import array
+
+from recipe.domainmodel.nutrition import Nutrition
+
+# Nutrient name -> type returned by the view (the columns themselves are all doubles)
+NUTRIENTS = {
+    "calories": int,
+    "fat": float,
+    "saturated_fat": float,
+    "cholesterol": int,
+    "sodium": int,
+    "carbohydrates": float,
+    "fiber": float,
+    "sugar": float,
+    "protein": float,
+}
+
+
+class NutritionTable:
+    def __init__(self):
+        self.__ids = array('q')
+        self.__columns = {name: array('d') for name in NUTRIENTS}
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def append(self, nutrition_id: int, **values) -> "NutritionView":
+        """Add a row (missing nutrients are 0) and return the view over it"""
+        unknown = set(values) - set(NUTRIENTS)
+        if unknown:
+            raise ValueError(f"Unknown nutrients: {sorted(unknown)}")
+        position = len(self.__ids)
+        self.__ids.append(nutrition_id)
+        for name, column in self.__columns.items():
+            column.append(values.get(name) or 0)
+        return NutritionView(self, position)
+
+    def update(self, position: int, **values) -> None:
+        """Overwrite the row at position (missing nutrients are 0), keeping its id"""
+        unknown = set(values) - set(NUTRIENTS)
+        if unknown:
+            raise ValueError(f"Unknown nutrients: {sorted(unknown)}")
+        for name, column in self.__columns.items():
+            column[position] = values.get(name) or 0
+
+    def copy_rows(self, positions: list[int]) -> "NutritionTable":
+        """A new table holding the rows at positions, in that order (row i comes from positions[i])"""
+        table = NutritionTable()
+        table.__ids = array('q', (self.__ids[position] for position in positions))
+        for name, column in self.__columns.items():
+            table.__columns[name] = array('d', (column[position] for position in positions))
+        return table
+
+    def view(self, position: int) -> "NutritionView":
+        if not 0 <= position < len(self.__ids):
+            raise IndexError("nutrition position out of range")
+        return NutritionView(self, position)
+
+    def column(self, name: str) -> array:
+        """The array('d') holding nutrient name for every position; treat it as read-only"""
+        if name not in self.__columns:
+            raise ValueError(f"Unknown nutrient: {name}")
+        return self.__columns[name]
+
+    @property
+    def ids(self) -> array:
+        """Nutrition (recipe) id of each position"""
+        return self.__ids
+
+    def positions_between(self, name: str, minimum: float = None, maximum: float = None) -> list[int]:
+        """Positions whose nutrient value lies in [minimum, maximum], in one pass over the column"""
+        low = float("-inf") if minimum is None else minimum
+        high = float("inf") if maximum is None else maximum
+        return [position for position, value in enumerate(self.column(name)) if low <= value <= high]
+
+    def get_value(self, position: int, name: str):
+        return NUTRIENTS[name](self.__columns[name][position])
+
+    def set_value(self, position: int, name: str, value) -> None:
+        self.__columns[name][position] = value
+
+
+def _nutrient_property(name: str):
+    def getter(self):
+        return self._NutritionView__table.get_value(self._NutritionView__position, name)
+
+    def setter(self, value):
+        self._NutritionView__table.set_value(self._NutritionView__position, name, value)
+
+    return property(getter, setter)
+
+
+class NutritionView(Nutrition):
+    """A Nutrition whose values live in a NutritionTable row"""
+    __slots__ = ("__table", "__position")
+
+    def __init__(self, table: NutritionTable, position: int):
+        # Nutrition.__init__ is skipped on purpose: the values are stored in the table
+        self.__table = table
+        self.__position = position
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)}" for name in NUTRIENTS)
+        return f"Nutrition(id={self.id}, {values})"
+
+    @property
+    def id(self) -> int:
+        return self.__table.ids[self.__position]
+
+    @property
+    def table(self) -> NutritionTable:
+        return self.__table
+
+    @property
+    def position(self) -> int:
+        return self.__position
+
+    calories = _nutrient_property("calories")
+    fat = _nutrient_property("fat")
+    saturated_fat = _nutrient_property("saturated_fat")
+    cholesterol = _nutrient_property("cholesterol")
+    sodium = _nutrient_property("sodium")
+    carbohydrates = _nutrient_property("carbohydrates")
+    fiber = _nutrient_property("fiber")
+    sugar = _nutrient_property("sugar")
+    protein = _nutrient_property("protein")
@@ -1,4 +1,5 @@
-from sqlalchemy import Table, Column, Integer, Float, String, DateTime, ForeignKey, Index
+from sqlalchemy import (Table, Column, Integer, Float, String, DateTime, ForeignKey, Index, func, inspect,
+                        select, text, update, bindparam)
 
 from sqlalchemy.orm import registry, relationship
 
@@ -7,11 +8,12 @@ from recipe.domainmodel.category import Category
 from recipe.domainmodel.favourite import Favourite
 from recipe.domainmodel.nutrition import Nutrition
 from recipe.domainmodel.recipe import Recipe
-from recipe.domainmodel.review import Review
+from recipe.domainmodel.review import Review, RATING_LEVELS
 from recipe.domainmodel.user import User
 from recipe.domainmodel.recipe_image import RecipeImage
 from recipe.domainmodel.recipe_instruction import RecipeInstruction
 from recipe.domainmodel.recipe_ingredient import RecipeIngredient
+from recipe.domainmodel.recipe_set import RecipeSet
 
 mapper_registry = registry()
 
@@ -24,6 +26,14 @@ recipe_table = Table('recipe', mapper_registry.metadata,
                       Column('date', DateTime),
                       Column('description', String(255)),
                       Column('rating', Float),
+                      # Running aggregates over the recipe's reviews (see Recipe.add_rating)
+                      Column('rating_sum', Float, nullable=False, server_default='0'),
+                      Column('rating_count', Integer, nullable=False, server_default='0'),
+                      Column('rating_1_count', Integer, nullable=False, server_default='0'),
+                      Column('rating_2_count', Integer, nullable=False, server_default='0'),
+                      Column('rating_3_count', Integer, nullable=False, server_default='0'),
+                      Column('rating_4_count', Integer, nullable=False, server_default='0'),
+                      Column('rating_5_count', Integer, nullable=False, server_default='0'),
                       Column('servings', String(255)),
                       Column('recipe_yield', String(255)),
                       Column('category_id', Integer, ForeignKey('category.id')),
@@ -132,6 +142,13 @@ def map_model_to_tables():
         '_Recipe__date': recipe_table.c.date,
         '_Recipe__description': recipe_table.c.description,
         '_Recipe__rating': recipe_table.c.rating,
+        '_Recipe__rating_sum': recipe_table.c.rating_sum,
+        '_Recipe__rating_count': recipe_table.c.rating_count,
+        '_Recipe__rating_1_count': recipe_table.c.rating_1_count,
+        '_Recipe__rating_2_count': recipe_table.c.rating_2_count,
+        '_Recipe__rating_3_count': recipe_table.c.rating_3_count,
+        '_Recipe__rating_4_count': recipe_table.c.rating_4_count,
+        '_Recipe__rating_5_count': recipe_table.c.rating_5_count,
         '_Recipe__servings': recipe_table.c.servings,
         '_Recipe__recipe_yield': recipe_table.c.recipe_yield,
         '_Recipe__category': relationship(Category, back_populates="_Category__recipes"),
@@ -184,14 +201,14 @@ def map_model_to_tables():
     mapper_registry.map_imperatively(Author, author_table, properties={
         '_Author__id': author_table.c.id,
         '_Author__name': author_table.c.name,
-        '_Author__recipes': relationship(Recipe, back_populates="_Recipe__author")
+        '_Author__recipes': relationship(Recipe, back_populates="_Recipe__author", collection_class=RecipeSet)
     })
 
     # category mapping
     mapper_registry.map_imperatively(Category, category_table, properties={
         '_Category__id': category_table.c.id,
         '_Category__name': category_table.c.name,
-        '_Category__recipes': relationship(Recipe, back_populates="_Recipe__category")
+        '_Category__recipes': relationship(Recipe, back_populates="_Recipe__category", collection_class=RecipeSet)
     })
 
     # user mapping
@@ -220,3 +237,40 @@ def map_model_to_tables():
         '_Review__review_text': review_table.c.review_text,
         '_Review__date': review_table.c.date
     })
+
+
+def upgrade_rating_aggregates(engine) -> bool:
+    """
+    Add the rating aggregate columns to a recipe table created before they existed, and fill them
+    in from the reviews already stored. Returns whether the table needed upgrading.
+    """
+    existing = {column['name'] for column in inspect(engine).get_columns('recipe')}
+    missing = [column for column in recipe_table.columns
+               if column.name.startswith('rating_') and column.name not in existing]
+    if not missing:
+        return False
+
+    recipe, review = recipe_table.c, review_table.c
+    def per_recipe(aggregate, *conditions):
+        return select(aggregate).where(review.recipe_id == recipe.id, *conditions).scalar_subquery()
+
+    with engine.begin() as connection:
+        for column in missing:
+            connection.execute(text(f'ALTER TABLE recipe ADD COLUMN {column.name} '
+                                    f'{column.type.compile(dialect=engine.dialect)} NOT NULL DEFAULT 0'))
+        aggregates = dict(rating_sum=per_recipe(func.coalesce(func.sum(review.rating), 0)),
+                          rating_count=per_recipe(func.count(review.rating)))
+        # Bucketed as review.rating_level does, half stars rounding up (SQLite keeps a REAL in an
+        # INTEGER column when it isn't whole)
+        for level in RATING_LEVELS:
+            aggregates[f'rating_{level}_count'] = per_recipe(
+                func.count(), review.rating >= level - 0.5, review.rating < level + 0.5)
+        connection.execute(update(recipe_table).values(aggregates))
+        # The average is rounded in Python, as Recipe.add_rating does
+        averages = [dict(recipe_id=recipe_id, average=round(total / count, 1)) for recipe_id, total, count in
+                    connection.execute(select(recipe.id, recipe.rating_sum, recipe.rating_count)
+                                       .where(recipe.rating_count > 0))]
+        if averages:
+            connection.execute(update(recipe_table).where(recipe.id == bindparam('recipe_id'))
+                               .values(rating=bindparam('average')), averages)
+    return True
@@ -1,5 +1,5 @@
 import abc
-from typing import List
+from typing import Dict, List, Iterable, Iterator, Sequence, Set
 from datetime import date
 
 from recipe.domainmodel.recipe import Recipe
@@ -41,7 +41,13 @@ class AbstractRepository(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def get_recipes(self) -> List[Recipe]:
+    def get_recipes(self) -> Sequence[Recipe]:
+        """All recipes; may be a read-only view, so take list() of it before changing it"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_recipes(self) -> Iterator[Recipe]:
+        """Iterate over all recipes without building a catalog-sized list"""
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -85,6 +91,16 @@ class AbstractRepository(abc.ABC):
     def get_recipes_by_author_name(self, author_name: str) -> List[Recipe]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_recipes_by_author_name_paginated(self, author_name: str, page: int, per_page: int) -> List[Recipe]:
+        """Get recipes whose author name contains author_name (case-insensitive) with pagination support"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def count_recipes_by_author_name(self, author_name: str) -> int:
+        """Get total count of recipes whose author name contains author_name"""
+        raise NotImplementedError
+
     @abc.abstractmethod
     def add_category(self, category: Category):
         raise NotImplementedError
@@ -97,6 +113,35 @@ class AbstractRepository(abc.ABC):
     def get_recipes_by_category_name(self, category_name: str) -> List[Recipe]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_recipes_by_category_name_paginated(self, category_name: str, page: int, per_page: int) -> List[Recipe]:
+        """Get recipes whose category name contains category_name (case-insensitive) with pagination support"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def count_recipes_by_category_name(self, category_name: str) -> int:
+        """Get total count of recipes whose category name contains category_name"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_recipes_by_ingredient_name_paginated(self, ingredient_text: str, page: int, per_page: int) -> List[Recipe]:
+        """Get recipes with an ingredient containing ingredient_text (case-insensitive) with pagination support"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def count_recipes_by_ingredient_name(self, ingredient_text: str) -> int:
+        """Get total count of recipes with an ingredient containing ingredient_text"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_facet_counts(self, filter_by: str, query: str, limit: int = None) -> Dict[str, Dict[str, int]]:
+        """
+        Count the recipes a search matches (filter_by 'name', 'ingredient', 'author' or 'category', and a
+        case-insensitive substring query) per category and per author:
+        {'category': {name: count}, 'author': {name: count}}, each most frequent first, at most limit entries
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get_recipes_by_name(self, name: str) -> List[Recipe]:
         raise NotImplementedError
@@ -135,6 +180,11 @@ class AbstractRepository(abc.ABC):
     def is_recipe_in_favourites(self, username: str, recipe_id: int) -> bool:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_favourite_ids(self, username: str, recipe_ids: Iterable[int]) -> Set[int]:
+        """Return the ids among recipe_ids that are in the user's favourites, in one lookup"""
+        raise NotImplementedError
+
     @abc.abstractmethod
     def delete_review(self, review_id: int, username: str):
         """Delete a review if it belongs to the specified user"""
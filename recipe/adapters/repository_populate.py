@@ -1,9 +1,11 @@
+from contextlib import nullcontext
 from pathlib import Path
 from werkzeug.security import generate_password_hash
 import csv
 
 from recipe.adapters.repository import AbstractRepository, RepositoryException
 from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.ingest_report import IngestReport
 from recipe.domainmodel.user import User
 from recipe.domainmodel.author import Author
 from recipe.domainmodel.category import Category
@@ -24,24 +26,45 @@ def read_general_csv_file(filename: str):
             row = [item.strip() for item in row]
             yield row
 
-def load_recipes(data_path: Path, repo, database_mode: bool = False):
-    """Load recipes from CSV file"""
+# Number of recipes parsed and flushed to the database at a time
+RECIPE_BATCH_SIZE = 500
+
+def load_recipes(data_path: Path, repo, database_mode: bool = False, batch_size: int = RECIPE_BATCH_SIZE,
+                 workers: int = 1, use_snapshot: bool = False, lazy_details: bool = False,
+                 report: IngestReport = None):
+    """Load recipes from CSV file, streaming them into the repository as rows are parsed.
+    With workers > 1 the CSV rows are parsed by a pool of worker processes.
+    With use_snapshot the parsed rows are cached in recipes.csv.snapshot for the next boot.
+    With lazy_details (memory repository only) ingredients and instructions are decoded
+    from the memory-mapped CSV the first time each recipe needs them.
+    Stage timings are added to report when one is given."""
     csv_path = data_path / "recipes.csv"
     if not csv_path.exists():
         raise RepositoryException(f"CSV file not found: {csv_path}")
     
-    reader = CSVDataReader(str(csv_path))
-    reader.csv_read()   
-
+    # MemoryRepository.add_recipe links recipes to their author and category itself
+    reader = CSVDataReader(str(csv_path), use_snapshot=use_snapshot,
+                           lazy_details=lazy_details and not database_mode, report=report,
+                           nutrition_table=None if database_mode else repo.get_nutrition_table(),
+                           link_recipes=database_mode)
 
     if not database_mode:
-        for recipe in getattr(reader, "recipes", []):
+        for recipe in reader.iter_recipes(workers):
+            if report:
+                report.start("repository_add")
             try: 
                 repo.add_recipe(recipe)
 
             except Exception as e:
                 print(f"Error adding recipe {recipe.id}: {e}")
                 continue
+            finally:
+                if report:
+                    report.stop(rows=1)
+        # Baseline for reload_recipes
+        repo.set_catalog_digests(reader.row_digests)
+        if reader.record_store is not None:
+            repo.set_record_store(reader.record_store)
     else:
         # For database repository, do everything in one session
         with repo._session_cm as scm:
@@ -49,44 +72,83 @@ def load_recipes(data_path: Path, repo, database_mode: bool = False):
             unique_authors = {}
             unique_categories = {}
             
-            for recipe in getattr(reader, "recipes", []):
-                try:
-                    # Track unique authors
-                    if recipe.author.name not in unique_authors:
-                        unique_authors[recipe.author.name] = recipe.author
-                        scm.session.add(recipe.author)
-                    
-                    # Track unique categories
-                    if recipe.category.name not in unique_categories:
-                        unique_categories[recipe.category.name] = recipe.category
-                        scm.session.add(recipe.category)
-                    
-                    scm.session.add(recipe)
-                    
-                    # Add recipe images
-                    for position, image_url in enumerate(recipe.images, 1):
-                        recipe_image = RecipeImage(recipe.id, image_url, position)
-                        scm.session.add(recipe_image)
-                    
-                    # Add recipe ingredients
-                    for position, (quantity, ingredient) in enumerate(zip(recipe.ingredient_quantities, recipe.ingredients), 1):
-                        recipe_ingredient = RecipeIngredient(recipe.id, quantity, ingredient, position)
-                        scm.session.add(recipe_ingredient)
-                    
-                    # Add recipe instructions
-                    for position, instruction in enumerate(recipe.instructions, 1):
-                        recipe_instruction = RecipeInstruction(recipe.id, instruction, position)
-                        scm.session.add(recipe_instruction)
-    
-                except Exception as e:
-                    print(f"Error adding recipe {recipe.id}: {e}")
-                    continue
+            for batch in reader.iter_batches(batch_size, workers):
+                if report:
+                    report.start("repository_add")
+                for recipe in batch:
+                    try:
+                        # Track unique authors
+                        if recipe.author.name not in unique_authors:
+                            unique_authors[recipe.author.name] = recipe.author
+                            scm.session.add(recipe.author)
+                        
+                        # Track unique categories
+                        if recipe.category.name not in unique_categories:
+                            unique_categories[recipe.category.name] = recipe.category
+                            scm.session.add(recipe.category)
+                        
+                        scm.session.add(recipe)
+                        
+                        # Add recipe images
+                        for position, image_url in enumerate(recipe.images, 1):
+                            recipe_image = RecipeImage(recipe.id, image_url, position)
+                            scm.session.add(recipe_image)
+                        
+                        # Add recipe ingredients
+                        for position, (quantity, ingredient) in enumerate(zip(recipe.ingredient_quantities, recipe.ingredients), 1):
+                            recipe_ingredient = RecipeIngredient(recipe.id, quantity, ingredient, position)
+                            scm.session.add(recipe_ingredient)
+                        
+                        # Add recipe instructions
+                        for position, instruction in enumerate(recipe.instructions, 1):
+                            recipe_instruction = RecipeInstruction(recipe.id, instruction, position)
+                            scm.session.add(recipe_instruction)
+        
+                    except Exception as e:
+                        print(f"Error adding recipe {recipe.id}: {e}")
+                        continue
+                if report:
+                    report.stop(rows=len(batch))
+
+                # Flush each batch so the pending image/ingredient/instruction rows can be released
+                if report:
+                    report.start("db_flush")
+                scm.session.flush()
+                if report:
+                    report.stop(rows=len(batch))
 
             # Single commit for everything
+            if report:
+                report.start("db_commit")
             scm.commit()
+            if report:
+                report.stop()
 
     return reader
 
+def reload_recipes(data_path: Path, repo, workers: int = 1, lazy_details: bool = False) -> dict:
+    """Re-read recipes.csv into a populated MemoryRepository, applying only inserted, changed and deleted rows.
+    Rows are compared by RecipeId using the digests recorded at load time; recipes that did not change
+    keep their objects, and changed ones are updated in place so reviews and favourites survive.
+    Returns the counts from MemoryRepository.apply_catalog_delta."""
+    csv_path = data_path / "recipes.csv"
+    if not csv_path.exists():
+        raise RepositoryException(f"CSV file not found: {csv_path}")
+
+    # Changed rows get plain Nutrition objects: apply_catalog_delta writes them into the rows their
+    # recipes already have, so the repository's table only grows by the inserted recipes
+    reader = CSVDataReader(str(csv_path), lazy_details=lazy_details)
+    # Parse the whole file before touching the repository, so it keeps serving the old catalog meanwhile
+    changed = list(reader.iter_changed_recipes(repo.get_catalog_digests(), workers,
+                                               repo.get_authors_by_id(), repo.get_categories_by_name()))
+    result = repo.apply_catalog_delta(changed, reader.row_digests,
+                                      reader.detail_loader if lazy_details else None,
+                                      reader.record_store if lazy_details else None)
+
+    print(f"[reload] {result['inserted']} inserted, {result['updated']} updated, "
+          f"{result['deleted']} deleted, {result['unchanged']} unchanged recipes")
+    return result
+
 def load_authors(reader, repo, database_mode: bool = False):
     """Load authors from CSV reader"""
     if database_mode:
@@ -117,10 +179,11 @@ def load_categories(reader, repo, database_mode: bool = False):
             except Exception:
                 pass
 
-def load_users(data_path: Path, repo, database_mode: bool = False):
-    """Load users from CSV file"""
+def load_users(data_path: Path, repo, database_mode: bool = False, report: IngestReport = None):
+    """Load users from CSV file; password hashing is timed as its own stage when a report is given"""
     users = dict()
     users_filename = str(Path(data_path) / "users.csv")
+    hash_password = report.wrap("password_hash", generate_password_hash) if report else generate_password_hash
     
     if database_mode:
         # For database repository, do everything in one session
@@ -128,32 +191,54 @@ def load_users(data_path: Path, repo, database_mode: bool = False):
             for data_row in read_general_csv_file(users_filename):
                 user = User(
                     username=data_row[1],
-                    password=generate_password_hash(data_row[2])
+                    password=hash_password(data_row[2])
                 )
                 scm.session.add(user)
                 users[data_row[0]] = user
+            if report:
+                report.start("db_commit")
             scm.commit()
+            if report:
+                report.stop()
     else:
         # For memory repository, use existing logic
         for data_row in read_general_csv_file(users_filename):
             user = User(
                 username=data_row[1],
-                password=generate_password_hash(data_row[2])
+                password=hash_password(data_row[2])
             )
             repo.add_user(user)
             users[data_row[0]] = user
     
     return users
 
-def populate(data_path: Path, repo, database_mode: bool = False):
-    """Universal populate function that works with both MemoryRepository and SqlAlchemyRepository"""
+def populate(data_path: Path, repo, database_mode: bool = False, batch_size: int = RECIPE_BATCH_SIZE,
+             workers: int = 1, use_snapshot: bool = False, lazy_details: bool = False,
+             with_report: bool = False, trace_memory: bool = False):
+    """Universal populate function that works with both MemoryRepository and SqlAlchemyRepository.
+    With with_report (or trace_memory), returns an IngestReport with the wall time, rows/sec and
+    peak memory of each stage; otherwise no stage is timed and None is returned."""
+    report = IngestReport(trace_memory=trace_memory) if with_report or trace_memory else None
+
+    def phase(name):
+        return report.phase(name) if report else nullcontext({"rows": 0})
+
     # Load recipes and related data into the repository
-    reader = load_recipes(data_path, repo, database_mode)
-    load_authors(reader, repo, database_mode)
-    load_categories(reader, repo, database_mode)
+    with phase("recipes") as counter:
+        reader = load_recipes(data_path, repo, database_mode, batch_size, workers, use_snapshot, lazy_details,
+                              report)
+        counter["rows"] = len(reader.row_digests)
+    with phase("authors") as counter:
+        load_authors(reader, repo, database_mode)
+        counter["rows"] = len(reader.authors)
+    with phase("categories") as counter:
+        load_categories(reader, repo, database_mode)
+        counter["rows"] = len(reader.categories)
     
     # Load users into the repository
-    users = load_users(data_path, repo, database_mode)
+    with phase("users") as counter:
+        users = load_users(data_path, repo, database_mode, report)
+        counter["rows"] = len(users)
     
     # Print statistics
     if hasattr(repo, '_MemoryRepository__authors_by_id'):
@@ -165,3 +250,8 @@ def populate(data_path: Path, repo, database_mode: bool = False):
     else:
         # Database repository
         print(f"[populate] loaded {repo.get_number_of_recipe()} recipes")
+
+    if report:
+        report.finish()
+        report.log()
+    return report
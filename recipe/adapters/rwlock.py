@@ -0,0 +1,92 @@
+"""
+Readers-writer lock for the memory repository.
+
+Any number of threads may hold the lock for reading at once; a writer waits for the readers to
+drain and then has it to itself. Waiting writers are preferred, so a steady stream of searches
+cannot starve a catalog reload. The lock is reentrant the ways the repository needs: the writing
+thread may take read() or write() again, and a reading thread may take read() again (without
+queueing behind a waiting writer, which would deadlock). Upgrading read() to write() raises.
+"""
+import threading
+
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    def __init__(self):
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__waiting_writers = 0
+        self.__writer = None
+        self.__write_depth = 0
+        # Per thread: one entry per read() held, True if it was counted in __readers
+        self.__local = threading.local()
+
+    def __held_reads(self) -> list:
+        reads = getattr(self.__local, "reads", None)
+        if reads is None:
+            reads = self.__local.reads = []
+        return reads
+
+    def acquire_read(self) -> None:
+        reads = self.__held_reads()
+        if self.__writer == threading.get_ident():
+            reads.append(False)
+            return
+        with self.__condition:
+            if not reads:
+                while self.__writer is not None or self.__waiting_writers:
+                    self.__condition.wait()
+            self.__readers += 1
+        reads.append(True)
+
+    def release_read(self) -> None:
+        if not self.__held_reads().pop():
+            return
+        with self.__condition:
+            self.__readers -= 1
+            if not self.__readers:
+                self.__condition.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        if self.__writer == me:
+            self.__write_depth += 1
+            return
+        if self.__held_reads():
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+        with self.__condition:
+            self.__waiting_writers += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__condition.wait()
+            finally:
+                self.__waiting_writers -= 1
+            self.__writer = me
+            self.__write_depth = 1
+
+    def release_write(self) -> None:
+        if self.__writer != threading.get_ident():
+            raise RuntimeError("Write lock released by a thread that does not hold it")
+        self.__write_depth -= 1
+        if self.__write_depth:
+            return
+        with self.__condition:
+            self.__writer = None
+            self.__condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
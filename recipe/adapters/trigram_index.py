@@ -0,0 +1,82 @@
+"""
+Trigram posting-list index for case-insensitive substring search.
+
+Every indexed text is lowercased and broken into its overlapping three-character slices; each
+trigram maps to the set of keys whose text contains it. A query of three or more characters can
+only match keys that appear in the postings of all of its trigrams, so those postings are
+intersected (smallest first) and the few surviving candidates are verified with a plain
+substring test. Shorter queries have no trigrams; search() returns None for them and the caller
+falls back to a scan.
+"""
+from __future__ import annotations
+
+TRIGRAM_LENGTH = 3
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)}
+
+
+class TrigramIndex:
+    def __init__(self):
+        self.__postings = dict()  # trigram -> set of keys
+        self.__texts = dict()  # key -> lowercased text
+
+    def __len__(self) -> int:
+        return len(self.__texts)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__texts
+
+    def add(self, key, text: str) -> None:
+        """Index text under key, replacing whatever key was indexed with before"""
+        if key in self.__texts:
+            self.remove(key)
+        text = (text or "").lower()
+        self.__texts[key] = text
+        for trigram in trigrams(text):
+            postings = self.__postings.get(trigram)
+            if postings is None:
+                postings = self.__postings[trigram] = set()
+            postings.add(key)
+
+    def remove(self, key) -> None:
+        text = self.__texts.pop(key, None)
+        if text is None:
+            return
+        for trigram in trigrams(text):
+            postings = self.__postings.get(trigram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self.__postings[trigram]
+
+    def text(self, key) -> str | None:
+        return self.__texts.get(key)
+
+    def search(self, query: str) -> set | None:
+        """
+        Keys whose text contains query (case-insensitive), or None if the query is shorter than
+        a trigram and cannot be answered from the index.
+        """
+        query = (query or "").lower()
+        if len(query) < TRIGRAM_LENGTH:
+            return None
+
+        postings = []
+        for trigram in trigrams(query):
+            keys = self.__postings.get(trigram)
+            if not keys:
+                return set()
+            postings.append(keys)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for keys in postings[1:]:
+            candidates &= keys
+            if not candidates:
+                return candidates
+
+        # Sharing every trigram does not guarantee they appear contiguously and in order
+        texts = self.__texts
+        return {key for key in candidates if query in texts[key]}
@@ -0,0 +1,216 @@
+"""
+Append-only write-ahead log for the memory repository's user data.
+
+With REPOSITORY=memory the catalog is rebuilt from recipes.csv on every boot, but registered users,
+reviews and favourites only ever lived in memory. MemoryRepository appends one JSON line per change
+(add_user, add_review, delete_review, add_favourite, remove_favourite) to this log while it holds
+its user-data lock, and waits for the line to be durable after releasing it.
+
+Durability uses group commit: a writer waiting for its record becomes the leader if no flush is in
+progress, writes every record buffered so far (its own and other threads') and fsyncs once; writers
+that arrive meanwhile wait for that flush or lead the next one. Under load many records share one
+fsync.
+
+On boot, replay() re-applies the log to a freshly populated repository. compact() rewrites the log
+as the minimal set of records that recreates the current state, including the review id counter so
+ids of deleted reviews stay retired; the repository calls it once the log has grown by
+compact_after records since the last rewrite.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from recipe.domainmodel.review import Review
+from recipe.domainmodel.user import User
+
+
+class WriteAheadLog:
+    def __init__(self, path, sync: bool = True, compact_after: int = 10_000):
+        """sync=False skips fsync (the OS still gets every record on commit), for tests and development"""
+        self.__path = Path(path)
+        self.__sync = sync
+        self.__compact_after = compact_after
+        self.__condition = threading.Condition()
+        self.__pending = []  # encoded records not yet written
+        self.__appended = 0  # sequence number of the last appended record
+        self.__durable = 0  # sequence number of the last record written (and synced)
+        self.__flushing = False
+        self.__sync_count = 0
+        self.__local = threading.local()
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        self.__since_compaction = sum(1 for _ in self.records())
+        self.__file = open(self.__path, "ab")
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    @property
+    def sync_count(self) -> int:
+        """How many times the log has been flushed; lower than the record count when commits are grouped"""
+        return self.__sync_count
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.__since_compaction >= self.__compact_after
+
+    def append(self, record: dict) -> int:
+        """Buffer record and return its sequence number; commit() makes it durable"""
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self.__condition:
+            self.__pending.append(line)
+            self.__appended += 1
+            self.__since_compaction += 1
+            self.__local.last = self.__appended
+            return self.__appended
+
+    def commit(self, sequence: int = None) -> None:
+        """Wait until record sequence (by default the calling thread's last append) is on disk"""
+        if sequence is None:
+            sequence = getattr(self.__local, "last", 0)
+        with self.__condition:
+            while self.__durable < sequence:
+                if self.__flushing:
+                    self.__condition.wait()
+                    continue
+                self.__flush_pending()
+
+    def flush(self) -> None:
+        """Make every record appended so far durable"""
+        with self.__condition:
+            sequence = self.__appended
+        self.commit(sequence)
+
+    def __flush_pending(self) -> None:
+        # Called holding the condition; writes outside it so other threads can keep appending
+        batch, self.__pending = self.__pending, []
+        upto = self.__appended
+        self.__flushing = True
+        self.__condition.release()
+        try:
+            self.__file.write(b"".join(batch))
+            self.__file.flush()
+            if self.__sync:
+                os.fsync(self.__file.fileno())
+        except BaseException:
+            self.__condition.acquire()
+            self.__pending[:0] = batch
+            self.__flushing = False
+            self.__condition.notify_all()
+            raise
+        self.__condition.acquire()
+        self.__durable = upto
+        self.__sync_count += 1
+        self.__flushing = False
+        self.__condition.notify_all()
+
+    def records(self) -> Iterator[dict]:
+        """Records on disk, oldest first; a torn last line (crash mid-write) is ignored"""
+        if not self.__path.exists():
+            return
+        with open(self.__path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                yield json.loads(line)
+
+    def compact(self, records: Iterable[dict]) -> None:
+        """
+        Replace the log with records (the current state); the caller stops appends meanwhile.
+        The new log is written beside the old one and swapped in atomically.
+        """
+        self.flush()
+        temporary = self.__path.with_name(self.__path.name + ".compact")
+        count = 0
+        with open(temporary, "wb") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+                count += 1
+            f.flush()
+            if self.__sync:
+                os.fsync(f.fileno())
+        with self.__condition:
+            self.__file.close()
+            os.replace(temporary, self.__path)
+            self.__file = open(self.__path, "ab")
+            self.__since_compaction = count
+
+    def close(self) -> None:
+        self.flush()
+        self.__file.close()
+
+
+# Records
+def user_record(user: User) -> dict:
+    return dict(op="add_user", id=user.id, username=user.username, password=user.password)
+
+
+def review_record(review: Review) -> dict:
+    return dict(op="add_review", id=review.id, username=review.user.username, recipe_id=review.recipe.id,
+                rating=review.rating, text=review.review_text, date=review.date.isoformat())
+
+
+def delete_review_record(review_id: int, username: str) -> dict:
+    return dict(op="delete_review", id=review_id, username=username)
+
+
+def favourite_record(username: str, recipe_id: int, added: bool = True) -> dict:
+    return dict(op="add_favourite" if added else "remove_favourite", username=username, recipe_id=recipe_id)
+
+
+def next_review_id_record(review_id: int) -> dict:
+    return dict(op="next_review_id", id=review_id)
+
+
+def replay(log: WriteAheadLog, repo) -> int:
+    """
+    Apply the log's records to repo (before the log is attached to it, so nothing is logged twice).
+    Records naming a user or recipe that no longer exists are skipped and counted in a warning;
+    a user or review the repository already has is skipped silently. Returns the number applied.
+    """
+    applied = 0
+    missing = 0
+    for record in log.records():
+        op = record["op"]
+        if op == "next_review_id":
+            repo.advance_next_review_id(record["id"])
+            continue
+        if op == "add_user":
+            if repo.get_user(record["username"]) is None:
+                repo.add_user(User(record["username"], record["password"], user_id=record.get("id")))
+                applied += 1
+            continue
+
+        user = repo.get_user(record["username"])
+        if user is None:
+            missing += 1
+            continue
+        if op == "delete_review":
+            applied += bool(repo.delete_review(record["id"], user.username))
+            continue
+
+        recipe = repo.get_recipe_by_id(record["recipe_id"])
+        if recipe is None:
+            missing += 1
+            continue
+        if op == "add_review":
+            if any(review.id == record["id"] for review in repo.get_reviews_by_recipe_id(recipe.id)):
+                continue
+            repo.add_review(Review(user, recipe, record["rating"], record["text"],
+                                   date=datetime.fromisoformat(record["date"]), review_id=record["id"]))
+        elif op == "add_favourite":
+            repo.add_favourite(user, recipe)
+        elif op == "remove_favourite":
+            repo.remove_favourite(user, recipe)
+        else:
+            continue
+        applied += 1
+    if missing:
+        print(f"[user data] skipped {missing} records of {log.path} naming a user or recipe that no longer exists")
+    return applied
@@ -33,7 +33,12 @@ def browse():
         recipes = []
         total_recipes = 0
 
-    services.annotate_is_favourite(recipes, repo.repo_instance)
+    favourite_ids = services.annotate_is_favourite(recipes, repo.repo_instance)
+
+    # Category and author counts of the whole result set, shown beside the results
+    facets = {}
+    if filter_by and query and recipes:
+        facets = services.get_search_facets(filter_by, query, repo.repo_instance)
     
     # Calculate pagination info
     total_pages = (total_recipes + recipes_per_page - 1) // recipes_per_page  # Ceiling division
@@ -66,14 +71,17 @@ def browse():
         query=query,
         mode="browse",
         current_page=page,
-        total_pages=total_pages
+        total_pages=total_pages,
+        total_recipes=total_recipes,
+        facets=facets,
+        favourite_ids=favourite_ids
     )
 
 @recipes_blueprint.route('/recipe/<int:recipe_id>')
 def recipe(recipe_id):
     recipe = services.get_recipe(recipe_id, repo.repo_instance)
-    services.annotate_is_favourite([recipe], repo.repo_instance)
-    return render_template('recipe.html', recipe=recipe)
+    favourite_ids = services.annotate_is_favourite([recipe], repo.repo_instance)
+    return render_template('recipe.html', recipe=recipe, favourite_ids=favourite_ids)
 
 @browse_blueprint.route('/recipe/<int:recipe_id>/toggle-favourite', methods=['POST'])
 @login_required
@@ -100,7 +108,7 @@ def toggle_favourite_recipe(recipe_id):
 
 from flask import redirect, url_for
 
-def _render_list(recipes, filter_by=None, query=""):
+def _render_list(recipes, favourite_ids, filter_by=None, query=""):
     recipes_per_page = 9
     cursor = request.args.get('cursor')
     cursor = 0 if cursor is None else int(cursor)
@@ -138,7 +146,8 @@ def _render_list(recipes, filter_by=None, query=""):
         prev_recipe_url=prev_recipe_url,
         filter_by=filter_by,
         query=query,
-        mode=mode
+        mode=mode,
+        favourite_ids=favourite_ids
     )
 
 @browse_blueprint.route('/favourites', methods=['GET'])
@@ -153,5 +162,5 @@ def favourites():
             recipes = services.get_favourites(repo.repo_instance)
     except services.NonExistentRecipeException:
         recipes = []
-    services.annotate_is_favourite(recipes, repo.repo_instance)
-    return _render_list(recipes, filter_by=filter_by, query=query)
+    favourite_ids = services.annotate_is_favourite(recipes, repo.repo_instance)
+    return _render_list(recipes, favourite_ids, filter_by=filter_by, query=query)
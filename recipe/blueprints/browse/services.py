@@ -1,6 +1,7 @@
-from typing import List
+from collections import Counter
+from typing import Dict, List, Set
 from flask_login import current_user
-from recipe.adapters.repository import AbstractRepository
+from recipe.adapters.repository import AbstractRepository, RepositoryException
 from recipe.domainmodel.favourite import Favourite
 from recipe.domainmodel.recipe import Recipe
 
@@ -66,7 +67,7 @@ def search_recipes_paginated(filter_by: str, query: str, page: int, per_page: in
                 recipes = repo.get_recipes_by_author_name_paginated(query, page, per_page)
             else:
                 # Repo-agnostic fallback: filter all recipes by author substring (case-insensitive)
-                all_recipes = repo.get_recipes()
+                all_recipes = repo.iter_recipes()
                 matches = [r for r in all_recipes if query in ((getattr(getattr(r, 'author', None), 'name', '') or '').lower())]
                 start = (page - 1) * per_page
                 end = start + per_page
@@ -76,7 +77,7 @@ def search_recipes_paginated(filter_by: str, query: str, page: int, per_page: in
                 recipes = repo.get_recipes_by_category_name_paginated(query, page, per_page)
             else:
                 # Repo-agnostic fallback: filter all recipes by category substring (case-insensitive)
-                all_recipes = repo.get_recipes()
+                all_recipes = repo.iter_recipes()
                 matches = [r for r in all_recipes if query in ((getattr(getattr(r, 'category', None), 'name', '') or '').lower())]
                 start = (page - 1) * per_page
                 end = start + per_page
@@ -87,7 +88,7 @@ def search_recipes_paginated(filter_by: str, query: str, page: int, per_page: in
                 recipes = repo.get_recipes_by_ingredient_name_paginated(query, page, per_page)
             else:
                 # Fallback: filter all recipes by ingredient substring (case-insensitive)
-                all_recipes = repo.get_recipes()
+                all_recipes = repo.iter_recipes()
                 def _has_ing(r):
                     ings = getattr(r, 'ingredients', []) or []
                     return any(query in ((ing or '').lower()) for ing in ings)
@@ -124,7 +125,7 @@ def count_search_results(filter_by: str, query: str, repo: AbstractRepository) -
             return repo.count_recipes_by_ingredient_name(query)
         else:
             # Fallback: compute via in-Python filtering over all recipes
-            all_recipes = repo.get_recipes()
+            all_recipes = repo.iter_recipes()
             if filter_by == 'name':
                 matches = [r for r in all_recipes if query in ((getattr(r, 'name', '') or '').lower())]
             elif filter_by == 'author':
@@ -150,8 +151,8 @@ def count_recipes_by_name(name: str, repo: AbstractRepository):
 def search_recipes(filter_by: str, query: str, repo: AbstractRepository):
     query = query.lower()
 
-    # Use existing function to get all recipes by passing empty string
-    all_recipes = repo.get_recipes()
+    # Stream the catalog; only the matches are kept
+    all_recipes = repo.iter_recipes()
 
     filtered = []
 
@@ -177,6 +178,29 @@ def search_recipes(filter_by: str, query: str, repo: AbstractRepository):
     return filtered
 
 
+# Number of categories and authors listed next to search results
+FACET_LIMIT = 8
+
+def get_search_facets(filter_by: str, query: str, repo: AbstractRepository,
+                      limit: int = FACET_LIMIT) -> Dict[str, Dict[str, int]]:
+    """Per-category and per-author counts of a search's matches, most frequent first"""
+    query = (query or "").lower()
+    try:
+        if hasattr(repo, 'get_facet_counts'):
+            return repo.get_facet_counts(filter_by, query, limit)
+        # Fallback: count over the matching recipes themselves
+        matches = search_recipes(filter_by, query, repo)
+        facets = dict()
+        for field in ('category', 'author'):
+            counts = Counter(getattr(getattr(r, field, None), 'name', None) for r in matches)
+            counts.pop(None, None)
+            ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            facets[field] = dict(ordered[:limit])
+        return facets
+    except (RepositoryException, NonExistentRecipeException):
+        return {}
+
+
 def _require_user():
     if not getattr(current_user, 'is_authenticated', False):
         raise UnknownUserException("User must be logged in")
@@ -191,22 +215,22 @@ def _current_user_identifier() -> str:
     return get_id() if callable(get_id) else getattr(user, 'username')
 
 
-def annotate_is_favourite(recipes: List[Recipe], repo: AbstractRepository) -> None:
-    """Mark each recipe with is_favourite using repository checks so DB and memory are consistent."""
+def annotate_is_favourite(recipes: List[Recipe], repo: AbstractRepository) -> Set[int]:
+    """
+    Return the ids among recipes that the current user has favourited, using one repository lookup
+    so DB and memory are consistent. Recipe objects are shared between requests (and threads), so
+    the result is passed to the templates rather than set on the recipes.
+    """
     if not getattr(current_user, 'is_authenticated', False):
-        for r in recipes:
-            setattr(r, 'is_favourite', False)
-        return
+        return set()
 
     # Use username string for status checks
     username = getattr(getattr(current_user, '_user', current_user), 'username', None)
-    for r in recipes:
-        rid = getattr(r, 'id', None)
-        try:
-            is_fav = repo.is_recipe_in_favourites(username, rid) if (username and rid is not None) else False
-        except Exception:
-            is_fav = False
-        setattr(r, 'is_favourite', is_fav)
+    ids = [r.id for r in recipes if getattr(r, 'id', None) is not None]
+    try:
+        return set(repo.get_favourite_ids(username, ids)) if username else set()
+    except Exception:
+        return set()
 
 
 def get_favourites(repo: AbstractRepository) -> List[Recipe]:
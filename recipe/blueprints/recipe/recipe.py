@@ -27,11 +27,11 @@ def recipe(recipe_id):
 
     # Ensure favourite state is annotated
     try:
-        browse_services.annotate_is_favourite([recipe_obj], repo.repo_instance)
+        favourite_ids = browse_services.annotate_is_favourite([recipe_obj], repo.repo_instance)
     except Exception:
-        pass
+        favourite_ids = set()
 
-    return render_template('recipe.html', recipe=recipe_obj, form=form)
+    return render_template('recipe.html', recipe=recipe_obj, form=form, favourite_ids=favourite_ids)
 
 @recipe_blueprint.route('/recipe/<int:recipe_id>/review', methods=['POST'])
 @login_required
@@ -58,12 +58,12 @@ def review_on_recipe(recipe_id):
     
     # Ensure favourite state is annotated
     try:
-        browse_services.annotate_is_favourite([recipe_obj], repo.repo_instance)
+        favourite_ids = browse_services.annotate_is_favourite([recipe_obj], repo.repo_instance)
     except Exception:
-        pass
+        favourite_ids = set()
 
     # When re-rendering with errors, include anchor in the response
-    return render_template('recipe.html', recipe=recipe_obj, form=form), 422
+    return render_template('recipe.html', recipe=recipe_obj, form=form, favourite_ids=favourite_ids), 422
 
 @recipe_blueprint.route('/delete_review/<int:review_id>', methods=['POST'])
 @login_required
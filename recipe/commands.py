@@ -0,0 +1,42 @@
+"""Flask CLI commands, run from the project root as `flask <command>`."""
+from pathlib import Path
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, clear_mappers
+from sqlalchemy.pool import StaticPool
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.database_repository import SqlAlchemyRepository
+from recipe.adapters.orm import mapper_registry, map_model_to_tables
+from recipe.adapters.repository_populate import populate
+
+
+@click.command("ingest-report")
+@click.option("--database", is_flag=True,
+              help="Populate a throwaway in-memory SQLite database instead of a MemoryRepository.")
+@click.option("--workers", default=1, show_default=True, help="Number of CSV parser processes.")
+@click.option("--trace-memory", is_flag=True, help="Measure each phase's peak heap with tracemalloc (slower).")
+@click.option("--json", "as_json", is_flag=True, help="Print the report as JSON.")
+@with_appcontext
+def ingest_report_command(database, workers, trace_memory, as_json):
+    """Run a fresh populate of the configured data folder and print its timing report."""
+    data_path = Path(current_app.config['DATA_PATH'])
+
+    if database:
+        # Never touch the configured database: time the same populate against an in-memory one
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        clear_mappers()
+        mapper_registry.metadata.create_all(engine)
+        map_model_to_tables()
+        repository = SqlAlchemyRepository(sessionmaker(autocommit=False, autoflush=True, bind=engine))
+    else:
+        repository = MemoryRepository()
+
+    report = populate(data_path, repository, database_mode=database, workers=workers,
+                      use_snapshot=not database and current_app.config.get('CATALOG_SNAPSHOT', False),
+                      with_report=True, trace_memory=trace_memory)
+    click.echo(report.to_json() if as_json else report.format())
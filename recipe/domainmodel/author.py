@@ -1,10 +1,13 @@
+from typing import Iterable
+
 from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.recipe_set import RecipeSet
 
 class Author:
-    def __init__(self, author_id: int, name: str, recipes: list["Recipe"] = None):
+    def __init__(self, author_id: int, name: str, recipes: Iterable["Recipe"] = None):
         self.__id = author_id
         self.__name = name
-        self.__recipes = recipes if recipes is not None else []
+        self.__recipes = RecipeSet(recipes) if recipes is not None else RecipeSet()
 
     def __repr__(self) -> str:
         return f"<Author {self.id}: {self.name}>"
@@ -31,13 +34,15 @@ class Author:
         return self.__name
 
     @property
-    def recipes(self) -> list["Recipe"]:
+    def recipes(self) -> RecipeSet:
         return self.__recipes
 
     def add_recipe(self, recipe: "Recipe") -> None:
         from recipe.domainmodel.recipe import Recipe
         if not isinstance(recipe, Recipe):
             raise TypeError("Expected a Recipe instance")
-        if recipe not in self.__recipes:
-            self.__recipes.append(recipe)
+        self.__recipes.add(recipe)
         # Silently ignore duplicates - this is the expected behavior
+
+    def remove_recipe(self, recipe: "Recipe") -> None:
+        self.__recipes.discard(recipe)
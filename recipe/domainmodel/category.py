@@ -1,10 +1,13 @@
+from typing import Iterable
+
 from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.recipe_set import RecipeSet
 
 class Category:
-    def __init__(self, name: str, recipes: list[Recipe] = None, category_id: int = None):
+    def __init__(self, name: str, recipes: Iterable[Recipe] = None, category_id: int = None):
         self.__id = category_id
         self.__name = name
-        self.__recipes = recipes if recipes is not None else []
+        self.__recipes = RecipeSet(recipes) if recipes is not None else RecipeSet()
 
     def __repr__(self) -> str:
         return f"<Category {self.id}: {self.name}>"
@@ -31,12 +34,16 @@ class Category:
         return self.__name
 
     @property
-    def recipes(self) -> list[Recipe]:
+    def recipes(self) -> RecipeSet:
         return self.__recipes
 
     def add_recipe(self, recipe: Recipe) -> None:
         from recipe.domainmodel.recipe import Recipe
         if isinstance(recipe, Recipe):
-            self.__recipes.append(recipe)
+            self.__recipes.add(recipe)
+            # Silently ignore duplicates, as Author does
         else:
             raise TypeError("Expected a Recipe instance")
+
+    def remove_recipe(self, recipe: Recipe) -> None:
+        self.__recipes.discard(recipe)
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
 
 if TYPE_CHECKING:
     from recipe.domainmodel.author import Author
@@ -8,9 +8,14 @@ if TYPE_CHECKING:
 from datetime import datetime
 
 from recipe.domainmodel.nutrition import Nutrition
-from recipe.domainmodel.review import Review
+from recipe.domainmodel.review import Review, RATING_LEVELS, rating_level
+
 
 class Recipe:
+    # Optional callable returning (ingredient_quantities, ingredients, instructions), see defer_details.
+    # A class-level default so ORM-loaded instances, which skip __init__, still have it.
+    __details_loader = None
+
     def __init__(self, recipe_id: int, name: str, author: "Author",
                  cook_time: int = 0,
                  preparation_time: int = 0,
@@ -49,7 +54,9 @@ class Recipe:
         self.__servings = servings if servings else "Not specified"
         self.__recipe_yield = recipe_yield if recipe_yield else "Not specified"
         self.__instructions = instructions if instructions else []
-        self.__reviews = []
+        # The review list and the rating aggregates (see add_rating) are only set once a review or
+        # rating arrives, so the many recipes without reviews carry neither. They are read through
+        # getattr because mapped columns can't keep class defaults: clear_mappers() deletes them.
 
     def __repr__(self) -> str:
         return (f"<Recipe {self.__name} with id: {self.id} was created by {self.__author.name} "
@@ -120,7 +127,9 @@ class Recipe:
 
     @property
     def images(self) -> list[str]:
-        return self.__images
+        # Ingest may hold the URLs packed as prefix id + suffix (see datareader.interning)
+        images = self.__images
+        return images if isinstance(images, list) else list(images)
 
     @images.setter
     def images(self, value: list[str]):
@@ -138,10 +147,12 @@ class Recipe:
 
     @property
     def ingredient_quantities(self) -> list[str]:
+        self.__load_details()
         return self.__ingredient_quantities
 
     @property
     def ingredients(self) -> list[str]:
+        self.__load_details()
         return self.__ingredients
 
     @property
@@ -180,41 +191,138 @@ class Recipe:
 
     @property
     def instructions(self) -> list[str]:
+        self.__load_details()
         return self.__instructions
 
     @instructions.setter
     def instructions(self, steps: list[str]):
         if not isinstance(steps, list):
             raise ValueError("Instructions must be provided as a list of strings.")
+        self.__load_details()
         self.__instructions = steps
 
     @property
-    def reviews(self) -> list[Review]:
-        return self.__reviews
+    def details_loaded(self) -> bool:
+        return self.__details_loader is None
+
+    def defer_details(self, loader) -> None:
+        """Decode ingredient_quantities, ingredients and instructions with loader() on first access"""
+        self.__details_loader = loader
+        # Dropped until then rather than kept as three empty lists
+        self.__ingredient_quantities = self.__ingredients = self.__instructions = None
+
+    def read_ingredients(self) -> list[str]:
+        """The ingredients, decoded without keeping them if details are still deferred"""
+        loader = self.__details_loader
+        if loader is None:
+            return self.__ingredients
+        return loader()[1] or []
+
+    def __load_details(self) -> None:
+        loader = self.__details_loader
+        if loader is not None:
+            # Cleared only once loader() succeeds, so a failed load can be retried
+            quantities, ingredients, instructions = loader()
+            self.__details_loader = None
+            self.__ingredient_quantities = quantities if quantities else []
+            self.__ingredients = ingredients if ingredients else []
+            self.__instructions = instructions if instructions else []
+
+    def refresh_from(self, other: Recipe) -> None:
+        """
+        Copy the catalog fields of other (a newer parse of the same recipe) into this instance.
+        Reviews and the rating derived from them are kept, as are references held elsewhere.
+        """
+        if not isinstance(other, Recipe) or other.id != self.__id:
+            raise ValueError("Can only refresh from a Recipe with the same id.")
+        self.__name = other.__name
+        self.__author = other.__author
+        self.__cook_time = other.__cook_time
+        self.__preparation_time = other.__preparation_time
+        self.__date = other.__date
+        self.__description = other.__description
+        self.__images = other.__images
+        self.__category = other.__category
+        self.__ingredient_quantities = other.__ingredient_quantities
+        self.__ingredients = other.__ingredients
+        self.__nutrition = other.__nutrition
+        self.__servings = other.__servings
+        self.__recipe_yield = other.__recipe_yield
+        self.__instructions = other.__instructions
+        self.__details_loader = other.__details_loader
+
+    @property
+    def reviews(self) -> Sequence[Review]:
+        """The reviews, or an empty tuple before the first add_review"""
+        reviews = getattr(self, "_Recipe__reviews", None)
+        return reviews if reviews is not None else ()
 
     def add_review(self, review: Review) -> None:
         if isinstance(review, Review):
+            # Counted first, so a rejected rating leaves the review out as well
+            self.add_rating(review.rating)
+            if getattr(self, "_Recipe__reviews", None) is None:
+                self.__reviews = []
             self.__reviews.append(review)
-            self.update_rating()
         else:
             raise TypeError("Expected a Review instance")
 
     def remove_review(self, review: Review) -> None:
-        if review in self.__reviews:
+        if review in self.reviews:
             self.__reviews.remove(review)
-            self.update_rating()
+            self.remove_rating(review.rating)
         else:
             raise ValueError("Review not found in recipe's reviews")
 
-    def update_rating(self) -> None:
-        """Recalculate recipe rating based on all current reviews."""
-        if self.__reviews:
-            ratings = [r.rating for r in self.__reviews if
-                       hasattr(r, "rating") and r.rating is not None]
-            if ratings:
-                average_rating = sum(ratings) / len(ratings)
-                self.__rating = round(average_rating, 1)
-            else:
-                self.__rating = None
+    @property
+    def rating_sum(self) -> float:
+        return getattr(self, "_Recipe__rating_sum", None) or 0
+
+    @property
+    def rating_count(self) -> int:
+        return getattr(self, "_Recipe__rating_count", None) or 0
+
+    @property
+    def rating_histogram(self) -> dict[int, int]:
+        """Number of reviews per whole-star rating, 1 to 5"""
+        return {level: getattr(self, _histogram_attribute(level), None) or 0 for level in RATING_LEVELS}
+
+    def add_rating(self, rating: float | None) -> None:
+        """Count one more review rating in the aggregates and the average, without reading the reviews"""
+        self.__adjust_rating(rating, 1)
+
+    def remove_rating(self, rating: float | None) -> None:
+        self.__adjust_rating(rating, -1)
+
+    def __adjust_rating(self, rating: float | None, step: int) -> None:
+        if rating is None:
+            return
+        attribute = _histogram_attribute(rating_level(rating))
+        self.__rating_sum = self.rating_sum + step * rating
+        self.__rating_count = self.rating_count + step
+        setattr(self, attribute, (getattr(self, attribute, None) or 0) + step)
+        self.__set_average()
+
+    def __set_average(self) -> None:
+        if self.rating_count > 0:
+            self.__rating = round(self.rating_sum / self.rating_count, 1)
         else:
-            self.__rating = None
\ No newline at end of file
+            self.__rating = None
+
+    def update_rating(self) -> None:
+        """Rebuild the rating aggregates from all current reviews (add_rating/remove_rating keep them current)."""
+        ratings = [r.rating for r in self.reviews if
+                   hasattr(r, "rating") and r.rating is not None]
+        levels = [rating_level(rating) for rating in ratings]
+        self.__rating_sum = sum(ratings)
+        self.__rating_count = len(ratings)
+        for level in RATING_LEVELS:
+            setattr(self, _histogram_attribute(level), 0)
+        for level in levels:
+            attribute = _histogram_attribute(level)
+            setattr(self, attribute, getattr(self, attribute) + 1)
+        self.__set_average()
+
+
+def _histogram_attribute(level: int) -> str:
+    return f"_Recipe__rating_{level}_count"
\ No newline at end of file
@@ -0,0 +1,82 @@
+from typing import Iterable, Iterator
+
+
+class RecipeSet:
+    """
+    The recipes of an Author or Category: an insertion-ordered set with O(1) add, membership test and
+    removal, which iterates, indexes and compares like the list it replaces. It is also the collection
+    class of the ORM relationships (SQLAlchemy treats it as list-like through append/remove).
+
+    Indexing goes through a parallel list, built by the first index and kept up to date by appends. A
+    removal drops that list and the next index rebuilds it once, so removals stay O(1) and indexing is
+    O(1) between them. Sets that are never indexed (most of them) never hold the list.
+    """
+
+    def __init__(self, recipes: Iterable = ()):
+        self.__recipes = dict.fromkeys(recipes)
+        self.__order = None
+
+    def __repr__(self) -> str:
+        return f"RecipeSet({list(self.__recipes)!r})"
+
+    def __len__(self) -> int:
+        return len(self.__recipes)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.__recipes)
+
+    def __reversed__(self) -> Iterator:
+        return reversed(self.__recipes)
+
+    def __contains__(self, recipe) -> bool:
+        return recipe in self.__recipes
+
+    def __getitem__(self, index):
+        if self.__order is None:
+            self.__order = list(self.__recipes)
+        return self.__order[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RecipeSet):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def count(self, recipe) -> int:
+        return 1 if recipe in self.__recipes else 0
+
+    def add(self, recipe) -> bool:
+        """Add recipe unless it is already present; returns whether it was added"""
+        if recipe in self.__recipes:
+            return False
+        self.append(recipe)
+        return True
+
+    def discard(self, recipe) -> None:
+        if recipe in self.__recipes:
+            self.remove(recipe)
+
+    # List-style methods, which SQLAlchemy wraps to track changes to the relationship
+    def append(self, recipe) -> None:
+        if recipe in self.__recipes:
+            return
+        self.__recipes[recipe] = None
+        if self.__order is not None:
+            self.__order.append(recipe)
+
+    def extend(self, recipes: Iterable) -> None:
+        for recipe in recipes:
+            self.append(recipe)
+
+    def remove(self, recipe) -> None:
+        if recipe not in self.__recipes:
+            raise ValueError("recipe not in RecipeSet")
+        del self.__recipes[recipe]
+        self.__order = None
+
+    def clear(self) -> None:
+        self.__recipes.clear()
+        self.__order = None
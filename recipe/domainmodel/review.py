@@ -1,10 +1,27 @@
+import math
 from datetime import datetime
 
+# Review ratings are counted per whole star in the rating histogram
+RATING_LEVELS = range(1, 6)
+
+
+def rating_level(rating: float) -> int:
+    """
+    The histogram bucket of a review rating, rounding half stars up (2.5 counts as 3); ratings
+    outside 1 to 5 stars are rejected
+    """
+    if not RATING_LEVELS[0] <= rating <= RATING_LEVELS[-1]:
+        raise ValueError(f"Review rating must be between {RATING_LEVELS[0]} and {RATING_LEVELS[-1]}: {rating}")
+    return math.floor(rating + 0.5)
+
+
 class Review:
     def __init__(self, user, recipe, rating, review_text, date=None, review_id: int = None):
         self.__id = review_id  # None for new reviews, will be set by database
         self.__user = user
         self.__recipe = recipe
+        if rating is not None:
+            rating_level(rating)
         self.__rating = rating
         self.__review_text = review_text
         self.__date = date if date else datetime.now()
@@ -54,8 +71,7 @@ class Review:
         return self.__date
 
     def add_rating(self, rating: float):
-        if not (0.0 <= rating <= 5.0):
-            raise ValueError("Rating must be between 0.0 and 5.0 inclusive")
+        rating_level(rating)  # the range Recipe can count
         self.__rating = rating
         return self
 
@@ -0,0 +1,42 @@
+"""
+Serve one memory-repository catalog from several forked worker processes.
+
+With a prefork server (see gunicorn.conf.py) the master calls create_app() and populate() once and
+forks the workers afterwards, so the catalog's pages are shared copy-on-write instead of being
+rebuilt by every worker. A page stays shared only while no process writes to it, and CPython writes
+to an object when a garbage collection visits it. gc.freeze() moves every object allocated so far
+into a permanent generation that collections skip, so the workers' collections leave the catalog
+alone. Reference count changes still write, so pages that requests actually touch are copied.
+"""
+import gc
+
+import recipe.adapters.repository as repo
+
+
+def prepare_for_fork(repository=None) -> int:
+    """
+    Call in the master right before forking: builds the repository's lazily built indexes (so the
+    workers share one copy) and freezes the heap. Returns the number of frozen objects.
+    """
+    repository = repository if repository is not None else repo.repo_instance
+    if hasattr(repository, 'build_search_indexes'):
+        repository.build_search_indexes()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def memory_usage(pid="self") -> dict:
+    """
+    Resident memory of a process in bytes, split into shared and private pages. Linux only: raises
+    FileNotFoundError where /proc/<pid>/smaps_rollup does not exist.
+    """
+    fields = dict()
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            parts = value.split()
+            if len(parts) == 2 and parts[1] == "kB":
+                fields[name] = int(parts[0]) * 1024
+    return dict(rss=fields["Rss"], pss=fields["Pss"],
+                shared=fields["Shared_Clean"] + fields["Shared_Dirty"],
+                private=fields["Private_Clean"] + fields["Private_Dirty"])
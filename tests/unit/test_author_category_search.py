@@ -0,0 +1,56 @@
+import pytest
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+
+def scan(repo, attribute, query):
+    query = query.lower()
+    return [r for r in repo.get_recipes() if query in getattr(r, attribute).name.lower()]
+
+
+@pytest.mark.parametrize("query", ["", "a", "Chef", "john", "zzzz"])
+def test_author_pages_match_scan(in_memory_repo, query):
+    expected = scan(in_memory_repo, "author", query)
+    assert in_memory_repo.count_recipes_by_author_name(query) == len(expected)
+    for page in (1, 2, 5):
+        assert in_memory_repo.get_recipes_by_author_name_paginated(query, page, 12) == \
+            expected[(page - 1) * 12:page * 12]
+
+
+@pytest.mark.parametrize("query", ["", "dessert", "CHICKEN", "bread", "zzzz"])
+def test_category_pages_match_scan(in_memory_repo, query):
+    expected = scan(in_memory_repo, "category", query)
+    assert in_memory_repo.count_recipes_by_category_name(query) == len(expected)
+    for page in (1, 3):
+        assert in_memory_repo.get_recipes_by_category_name_paginated(query, page, 12) == \
+            expected[(page - 1) * 12:page * 12]
+
+
+def test_ingested_categories_hold_each_recipe_once(in_memory_repo):
+    for recipe in in_memory_repo.get_recipes()[:50]:
+        assert recipe.category.recipes.count(recipe) == 1
+        assert recipe.author.recipes.count(recipe) == 1
+
+
+def test_category_add_recipe_ignores_duplicates():
+    category = Category("Dessert")
+    recipe = Recipe(1, "Pie", Author(1, "Chef"), category=category)
+    category.add_recipe(recipe)
+    category.add_recipe(recipe)
+    assert category.recipes == [recipe]
+
+
+def test_matches_across_names_come_back_in_catalog_order():
+    repo = MemoryRepository()
+    anna, hanna = Author(1, "Anna"), Author(2, "Hanna")
+    category = Category("Dessert")
+    for recipe_id, author in ((10, hanna), (11, anna), (12, hanna), (13, anna)):
+        repo.add_recipe(Recipe(recipe_id, f"Recipe {recipe_id}", author, category=category))
+
+    assert [r.id for r in repo.get_recipes_by_author_name_paginated("anna", 1, 10)] == [10, 11, 12, 13]
+    assert [r.id for r in repo.get_recipes_by_author_name_paginated("anna", 2, 3)] == [13]
+    assert [r.id for r in repo.get_recipes_by_author_name_paginated("hanna", 1, 10)] == [10, 12]
+    assert repo.count_recipes_by_category_name("ESS") == 4
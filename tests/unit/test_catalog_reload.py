@@ -0,0 +1,229 @@
+import csv
+import shutil
+from pathlib import Path
+
+import pytest
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository_populate import load_recipes, load_authors, load_categories, reload_recipes
+from recipe.domainmodel.review import Review
+from recipe.domainmodel.user import User
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.fixture
+def data_copy(tmp_path):
+    shutil.copy(DATA_DIR / "recipes.csv", tmp_path / "recipes.csv")
+    return tmp_path
+
+
+def load_repo(data_path, lazy_details=False):
+    repo = MemoryRepository()
+    reader = load_recipes(data_path, repo, lazy_details=lazy_details)
+    load_authors(reader, repo)
+    load_categories(reader, repo)
+    return repo
+
+
+def rewrite_csv(data_path, edit):
+    """Rewrite recipes.csv after edit(rows) mutates the list of DictReader rows in place"""
+    csv_path = data_path / "recipes.csv"
+    with open(csv_path, mode="r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+    edit(rows)
+    with open(csv_path, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def test_reload_of_unchanged_file_changes_nothing(data_copy):
+    repo = load_repo(data_copy)
+    before = list(repo.get_recipes())
+    # Re-quoting the file does not change any row's values
+    rewrite_csv(data_copy, lambda rows: None)
+
+    result = reload_recipes(data_copy, repo)
+
+    assert result == dict(inserted=0, updated=0, deleted=0, unchanged=len(before))
+    assert all(a is b for a, b in zip(repo.get_recipes(), before))
+
+
+def test_reload_applies_inserts_updates_and_deletes(data_copy):
+    repo = load_repo(data_copy)
+    first, second, third = repo.get_recipes()[:3]
+    count = repo.count_recipes()
+
+    def edit(rows):
+        rows[0]["Name"] = "Renamed Recipe"
+        rows[1]["RecipeCategory"] = "Brand New Category"
+        new_row = dict(rows[2], RecipeId="999999", AuthorId="888888", AuthorName="New Author")
+        del rows[2]
+        rows.append(new_row)
+    rewrite_csv(data_copy, edit)
+
+    result = reload_recipes(data_copy, repo)
+
+    assert result == dict(inserted=1, updated=2, deleted=1, unchanged=count - 3)
+    assert repo.count_recipes() == count
+    assert repo.get_recipe_by_id(first.id) is first
+    assert first.name == "Renamed Recipe"
+    assert repo.get_recipes_by_name("renamed rec") == [first]
+    assert repo.get_recipes_by_name("") == sorted(repo.get_recipes(), key=lambda r: r.name.lower())
+
+    new_category = repo.get_category_by_name("Brand New Category")
+    assert second.category is new_category
+    assert new_category.recipes == [second]
+    assert repo.get_recipes_by_category_name_paginated("brand new", 1, 10) == [second]
+
+    assert repo.get_recipe_by_id(third.id) is None
+    assert third not in third.author.recipes
+    assert third not in repo.get_recipes()
+
+    inserted = repo.get_recipe_by_id(999999)
+    assert repo.get_last_recipe() is inserted
+    assert repo.get_author_by_id(888888) is inserted.author
+    assert inserted.author.recipes == [inserted]
+    assert inserted in inserted.category.recipes
+
+
+def test_deletes_leave_iterations_under_way_consistent(data_copy):
+    repo = load_repo(data_copy)
+    view = repo.get_recipes()
+    count = len(view)
+    dropped = view[1]
+    walking = repo.iter_recipes()
+    assert next(walking) is view[0]
+
+    rewrite_csv(data_copy, lambda rows: rows.pop(1))
+    reload_recipes(data_copy, repo)
+
+    # The iterator finishes the catalog it started on; the view follows the new one
+    assert next(walking) is dropped
+    assert len(list(walking)) == count - 2
+    assert len(view) == count - 1 and dropped not in view
+
+
+def test_reload_reuses_nutrition_rows_of_updated_recipes(data_copy):
+    repo = load_repo(data_copy)
+    table = repo.get_nutrition_table()
+    rows = len(table)
+    first, second = repo.get_recipes()[:2]
+    position = first.nutrition.position
+
+    def edit(csv_rows):
+        csv_rows[0]["Calories"] = "123456"
+        del csv_rows[1]
+    rewrite_csv(data_copy, edit)
+    reload_recipes(data_copy, repo)
+
+    assert repo.get_nutrition_table() is table and len(table) == rows
+    assert first.nutrition.table is table and first.nutrition.position == position
+    assert first.nutrition.calories == 123456
+    assert repo.get_recipes_by_nutrient_range("calories", minimum=123456) == [first]
+    assert second not in repo.get_recipes_by_nutrient_range("calories")
+
+
+def test_reload_compacts_nutrition_once_deleted_rows_build_up(data_copy):
+    repo = load_repo(data_copy)
+    kept_ids = [recipe.id for recipe in repo.get_recipes()[::2]]
+    rewrite_csv(data_copy, lambda rows: rows.__setitem__(slice(None), rows[::2]))
+    reload_recipes(data_copy, repo)
+
+    table = repo.get_nutrition_table()
+    assert len(table) == repo.count_recipes() == len(kept_ids)
+    assert list(table.ids) == kept_ids
+    assert all(recipe.nutrition.table is table for recipe in repo.get_recipes())
+    expected = [r for r in repo.get_recipes() if 100 <= r.nutrition.calories <= 200]
+    assert repo.get_recipes_by_nutrient_range("calories", 100, 200) == expected
+
+
+def test_reload_keeps_reviews_and_favourites_of_updated_recipes(data_copy):
+    repo = load_repo(data_copy)
+    user = User("reviewer", "pw")
+    repo.add_user(user)
+    kept, dropped = repo.get_recipes()[:2]
+    repo.add_review(Review(user, kept, 4, "Nice"))
+    repo.add_review(Review(user, dropped, 2, "Meh"))
+    repo.add_favourite(user, kept)
+    repo.add_favourite(user, dropped)
+
+    def edit(rows):
+        rows[0]["Description"] = "Updated description"
+        del rows[1]
+    rewrite_csv(data_copy, edit)
+    reload_recipes(data_copy, repo)
+
+    assert kept.description == "Updated description"
+    assert len(kept.reviews) == 1 and kept.rating == 4
+    assert repo.get_user_favourites("reviewer") == [kept]
+    assert [review.recipe for review in user.reviews] == [kept]
+
+
+def test_lazy_reload_repoints_unchanged_recipes_at_new_file(data_copy):
+    repo = load_repo(data_copy, lazy_details=True)
+    recipes = repo.get_recipes()
+    expected = [list(r.ingredients) for r in recipes[1:4]]
+    loaded_before = recipes[1]
+
+    # Shift every byte offset by changing the first row, then reload the lazily-loaded recipes
+    def edit(rows):
+        rows[0]["Description"] = "A much longer description than before " * 3
+    rewrite_csv(data_copy, edit)
+    reload_recipes(data_copy, repo, lazy_details=True)
+
+    assert loaded_before.details_loaded
+    assert [r.ingredients for r in recipes[1:4]] == expected
+    assert [r.instructions for r in recipes[4:]] == [r.instructions for r in load_repo(data_copy).get_recipes()[4:]]
+
+
+def test_lazy_details_of_a_csv_rewritten_in_place_fail_until_reloaded(data_copy):
+    from recipe.adapters.datareader.records import StaleRecordError
+    repo = load_repo(data_copy, lazy_details=True)
+    recipe = repo.get_recipes()[2]
+    expected = load_repo(data_copy).get_recipes()[2].ingredients
+
+    def edit(rows):
+        rows[0]["Description"] = "Shifts every record after it"
+    rewrite_csv(data_copy, edit)
+    with pytest.raises(StaleRecordError):
+        recipe.ingredients
+    assert not recipe.details_loaded
+
+    reload_recipes(data_copy, repo, lazy_details=True)
+    assert recipe.ingredients == expected
+
+
+def test_lazy_reload_closes_the_replaced_record_store(data_copy, monkeypatch):
+    from recipe.adapters.datareader.records import RecordStore
+    closed = []
+    close = RecordStore.close
+    def tracking_close(store):
+        closed.append(store)
+        close(store)
+    monkeypatch.setattr(RecordStore, "close", tracking_close)
+
+    repo = load_repo(data_copy, lazy_details=True)
+    reload_recipes(data_copy, repo, lazy_details=True)
+    reload_recipes(data_copy, repo, lazy_details=True)
+    assert len(closed) == 2 and closed[0] is not closed[1]
+
+
+def test_reload_updates_a_built_ingredient_index(data_copy):
+    repo = load_repo(data_copy)
+    first = repo.get_recipes()[0]
+    assert repo.count_recipes_by_ingredient_name("unobtainium") == 0
+    assert first in repo.get_recipes_by_ingredient_name("blueberries")
+
+    def edit(rows):
+        rows[0]["RecipeIngredientParts"] = "['Unobtainium', 'granulated sugar']"
+        rows[0]["RecipeIngredientQuantities"] = "['1', '1/4']"
+    rewrite_csv(data_copy, edit)
+    reload_recipes(data_copy, repo)
+
+    assert repo.get_recipes_by_ingredient_name_paginated("unobtainium", 1, 10) == [first]
+    assert first not in repo.get_recipes_by_ingredient_name("blueberries")
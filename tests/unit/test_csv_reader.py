@@ -3,7 +3,9 @@ import pytest
 import csv
 from datetime import datetime
 
-from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.datareader.csvdatareader import (
+    CSVDataReader, parse_date, parse_date_tokens, parse_date_strptime, date_cache_info
+)
 from recipe.domainmodel.author import Author
 from recipe.domainmodel.category import Category
 from recipe.domainmodel.recipe import Recipe
@@ -189,5 +191,57 @@ def test_date_parsed_correctly(tmp_path):
     assert recipe.date == datetime(2009, 8, 9)
 
 
+def test_iter_recipes_streams_same_recipes_as_csv_read(csv_path, read_csv):
+    streaming = CSVDataReader(csv_path)
+    streamed = list(streaming.iter_recipes())
+
+    assert [r.id for r in streamed] == [r.id for r in read_csv.recipes]
+    # Streaming does not retain recipes on the reader itself
+    assert streaming.recipes == []
+    # Authors and categories are still deduplicated while streaming
+    assert len(streaming.authors) == len(read_csv.authors)
+    assert len(streaming.categories) == len(read_csv.categories)
+
+
+def test_iter_batches_respects_batch_size(csv_path, read_csv):
+    batches = list(CSVDataReader(csv_path).iter_batches(1000))
+
+    assert all(len(batch) == 1000 for batch in batches[:-1])
+    assert 0 < len(batches[-1]) <= 1000
+    assert [r.id for batch in batches for r in batch] == [r.id for r in read_csv.recipes]
+
+
+def test_iter_batches_rejects_non_positive_size(csv_path):
+    with pytest.raises(ValueError):
+        list(CSVDataReader(csv_path).iter_batches(0))
+
+
+@pytest.mark.parametrize("date_str", ["1st Jan 2020", "2nd Feb 2012", "3rd Mar 1999", "9th Aug 2009", "31st Dec 2005"])
+def test_date_tokenizer_matches_strptime(date_str):
+    assert parse_date_tokens(date_str) == parse_date_strptime(date_str)
+
+
+@pytest.mark.parametrize("date_str", ["Aug 9 2009", "9th August 2009", "30th Feb 2009", "2009-08-09"])
+def test_date_tokenizer_rejects_other_formats(date_str):
+    assert parse_date_tokens(date_str) is None
+
+
+def test_parse_date_counts_memo_hits_and_misses():
+    parse_date.cache_clear()
+    parse_date("4th Jul 2011")
+    parse_date("4th Jul 2011")
+    parse_date("5th Jul 2011")
+
+    info = date_cache_info()
+    assert info.misses == 2
+    assert info.hits == 1
+    assert parse_date("4th Jul 2011") == datetime(2011, 7, 4)
+
+
+def test_reading_csv_reuses_memoised_dates(read_csv):
+    # The bundled data repeats DatePublished values, so a full read must hit the memo
+    assert date_cache_info().hits > 0
+
+
 # py -m pytest -v tests/unit/test_csv_reader.py
 # Run from project root, to see the specific tests that were run
\ No newline at end of file
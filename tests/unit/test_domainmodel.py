@@ -2,7 +2,7 @@ import pytest
 from datetime import datetime
 
 from recipe.domainmodel.favourite import Favourite
-from recipe.domainmodel.review import Review
+from recipe.domainmodel.review import Review, rating_level
 from recipe.domainmodel.user import User
 from recipe.domainmodel.author import Author
 from recipe.domainmodel.category import Category
@@ -380,3 +380,70 @@ def test_nutrition_set_protein():
     nutrition1.protein = 20.0
     assert nutrition1.protein == 20.0
 
+
+
+def test_recipe_rating_aggregates_follow_reviews(my_recipe, my_user):
+    reviews = [Review(my_user, my_recipe, rating, "text", review_id=i) for i, rating in enumerate([5, 3, 4.0, 2], 1)]
+    for review in reviews:
+        my_recipe.add_review(review)
+
+    assert (my_recipe.rating_sum, my_recipe.rating_count) == (14, 4)
+    assert my_recipe.rating_histogram == {1: 0, 2: 1, 3: 1, 4: 1, 5: 1}
+    assert my_recipe.rating == 3.5
+
+    my_recipe.remove_review(reviews[0])
+    assert my_recipe.rating_histogram[5] == 0
+    assert my_recipe.rating == 3.0
+
+    for review in reviews[1:]:
+        my_recipe.remove_review(review)
+    assert (my_recipe.rating_count, my_recipe.rating) == (0, None)
+
+
+@pytest.mark.parametrize("rating", [0, 0.4, 5.5, -1])
+def test_recipe_rejects_ratings_outside_the_histogram(my_recipe, my_user, rating):
+    with pytest.raises(ValueError):
+        my_recipe.add_review(Review(my_user, my_recipe, rating, "text", review_id=1))
+    assert list(my_recipe.reviews) == []
+    assert (my_recipe.rating_count, my_recipe.rating_histogram[1]) == (0, 0)
+
+
+@pytest.mark.parametrize("rating, level", [(1, 1), (1.4, 1), (1.5, 2), (2.5, 3), (3.5, 4), (4.5, 5), (5, 5)])
+def test_rating_level_rounds_half_stars_up(rating, level):
+    assert rating_level(rating) == level
+
+
+def test_review_accepts_exactly_the_ratings_recipe_counts(my_recipe, my_user):
+    review = Review(my_user, my_recipe, 1, "text", review_id=1)
+    with pytest.raises(ValueError):
+        review.add_rating(0.0)
+    with pytest.raises(ValueError):
+        Review(my_user, my_recipe, 0, "text")
+    review.add_rating(4.5)
+    my_recipe.add_review(review)
+    assert my_recipe.rating_histogram[5] == 1
+
+
+def test_recipe_update_rating_rebuilds_aggregates(my_recipe, my_user):
+    my_recipe.add_review(Review(my_user, my_recipe, 4, "text", review_id=1))
+    my_recipe.reviews.append(Review(my_user, my_recipe, 1, "text", review_id=2))
+
+    my_recipe.update_rating()
+
+    assert my_recipe.rating_histogram == {1: 1, 2: 0, 3: 0, 4: 1, 5: 0}
+    assert my_recipe.rating == 2.5
+
+
+def test_recipe_without_reviews_holds_no_review_state(my_recipe, my_user):
+    assert my_recipe.reviews == ()
+    assert not [key for key in vars(my_recipe) if key.startswith(("_Recipe__reviews", "_Recipe__rating_"))]
+    assert (my_recipe.rating_sum, my_recipe.rating_count) == (0, 0)
+
+    review = Review(my_user, my_recipe, 4, "text", review_id=1)
+    my_recipe.add_review(review)
+    assert my_recipe.reviews == [review]
+    assert my_recipe.rating_histogram[4] == 1
+    my_recipe.remove_review(review)
+    assert my_recipe.reviews == [] and my_recipe.rating_count == 0
+    with pytest.raises(ValueError):
+        my_recipe.remove_review(review)
@@ -0,0 +1,72 @@
+from collections import Counter
+
+import pytest
+
+from recipe.adapters.facet_index import FacetIndex
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.blueprints.browse import services
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+
+def scan_counts(repo, filter_by, query, field):
+    matches = services.search_recipes(filter_by, query, repo)
+    counts = Counter(getattr(r, field).name for r in matches)
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def test_facet_index_counts_drop_zeros_and_order_by_frequency():
+    index = FacetIndex({10: "Dessert", 11: "Dessert", 12: "Dessert", 13: "Bread", 14: "Bread", 15: "Soup", 16: "Drinks"})
+    assert index.counts(range(10, 17)) == {"Dessert": 3, "Bread": 2, "Drinks": 1, "Soup": 1}
+    assert index.counts([12, 14, 15]) == {"Bread": 1, "Dessert": 1, "Soup": 1}
+    assert index.counts([12, 13, 14], limit=1) == {"Bread": 2}
+    # Ids without a value (e.g. a recipe with no category) are not counted
+    assert index.counts([99]) == {} and index.counts([]) == {}
+
+
+@pytest.mark.parametrize("filter_by, query", [
+    ("name", "chicken"), ("name", "ca"), ("ingredient", "garlic"), ("author", "john"), ("category", "dessert"),
+])
+def test_memory_facets_match_counting_the_search_results(in_memory_repo, filter_by, query):
+    facets = in_memory_repo.get_facet_counts(filter_by, query)
+    assert facets["category"] == scan_counts(in_memory_repo, filter_by, query, "category")
+    assert facets["author"] == scan_counts(in_memory_repo, filter_by, query, "author")
+
+
+def test_memory_facets_follow_catalog_writes():
+    repo = MemoryRepository()
+    chef, cook = Author(1, "Chef"), Author(2, "Cook")
+    dessert, bread = Category("Dessert"), Category("Bread")
+    repo.add_recipe(Recipe(1, "Apple pie", chef, category=dessert))
+    assert repo.get_facet_counts("name", "pie") == {"category": {"Dessert": 1}, "author": {"Chef": 1}}
+
+    repo.add_recipe(Recipe(2, "Pie crust loaf", cook, category=bread))
+    repo.add_recipe(Recipe(3, "Cherry pie", cook, category=dessert))
+    assert repo.get_facet_counts("name", "pie") == {
+        "category": {"Dessert": 2, "Bread": 1}, "author": {"Cook": 2, "Chef": 1}}
+    assert repo.get_facet_counts("name", "pie", limit=1) == {"category": {"Dessert": 2}, "author": {"Cook": 2}}
+    assert repo.get_facet_counts("name", "zzzz") == {"category": {}, "author": {}}
+
+
+def test_search_facets_service_uses_the_repository(in_memory_repo):
+    facets = services.get_search_facets("name", "Chicken", in_memory_repo, limit=3)
+    assert facets == in_memory_repo.get_facet_counts("name", "chicken", 3)
+    assert len(facets["category"]) <= 3
+
+
+def test_search_facets_service_only_hides_repository_errors(in_memory_repo, monkeypatch):
+    def missing(*args):
+        raise services.RepositoryException("gone")
+    monkeypatch.setattr(in_memory_repo, "get_facet_counts", missing)
+    assert services.get_search_facets("name", "chicken", in_memory_repo) == {}
+
+    monkeypatch.setattr(in_memory_repo, "get_facet_counts", lambda *args: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        services.get_search_facets("name", "chicken", in_memory_repo)
+
+
+def test_browse_page_shows_facets_for_a_search(client):
+    response = client.get('/browse?filter_by=name&query=chicken')
+    assert b'class="facets"' in response.data
+    assert b'class="facets"' not in client.get('/browse').data
@@ -0,0 +1,86 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from recipe import create_app
+from recipe.adapters.ingest_report import IngestReport
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository_populate import populate
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def test_nested_stages_are_timed_exclusively():
+    report = IngestReport()
+    report.start("outer")
+    time.sleep(0.02)
+    report.start("inner")
+    time.sleep(0.02)
+    report.stop(rows=1)
+    report.stop(rows=1)
+
+    outer, inner = report.stage("outer"), report.stage("inner")
+    assert 0.015 < outer.seconds < 0.035
+    assert 0.015 < inner.seconds < 0.035
+    assert inner.rows == 1 and inner.rows_per_sec > 0
+
+
+def test_phase_records_rows_and_peak_memory():
+    report = IngestReport(trace_memory=True)
+    with report.phase("work") as phase:
+        data = [bytes(1000) for _ in range(1000)]
+        phase["rows"] = len(data)
+    work, = report.phases
+    assert work.name == "work"
+    assert work.rows == 1000
+    assert work.peak_memory >= 1000 * 1000
+
+
+def test_populate_returns_report_with_phases_and_stages():
+    repo = MemoryRepository()
+    report = populate(DATA_DIR, repo, with_report=True)
+
+    phases = {p.name: p for p in report.phases}
+    assert list(phases) == ["recipes", "authors", "categories", "users"]
+    assert phases["recipes"].rows == repo.count_recipes()
+    assert phases["users"].rows == 4
+    assert all(p.peak_memory is None or p.peak_memory > 0 for p in report.phases)
+
+    for name in ("csv_decode", "row_convert", "list_parse", "domain_build", "repository_add", "password_hash"):
+        assert report.stage(name) is not None, name
+    assert report.stage("csv_decode").rows == repo.count_recipes()
+    stage_total = sum(s.seconds for s in report.stages)
+    assert stage_total <= report.total_seconds
+
+    as_dict = json.loads(report.to_json())
+    assert [p["name"] for p in as_dict["phases"]] == list(phases)
+    assert "list_parse" in report.format()
+
+
+def test_populate_times_nothing_without_a_report(monkeypatch):
+    import recipe.adapters.repository_populate as repository_populate
+    import recipe.adapters.datareader.csvdatareader as csvdatareader
+    monkeypatch.setattr(repository_populate, "IngestReport", lambda **kwargs: pytest.fail("report created"))
+    monkeypatch.setattr(csvdatareader.CSVDataReader, "_CSVDataReader__timed_parse_row",
+                        lambda *args, **kwargs: pytest.fail("row timed"))
+
+    repo = MemoryRepository()
+    assert populate(DATA_DIR, repo) is None
+    assert repo.count_recipes() > 0
+
+
+def test_ingest_report_cli_command():
+    app = create_app({
+        'TESTING': True,
+        'TEST_DATA_PATH': DATA_DIR,
+        'REPOSITORY': 'memory',
+        'INGEST_REPORT': True,
+    })
+    assert app.extensions['ingest_report'].phases
+
+    result = app.test_cli_runner().invoke(args=["ingest-report", "--json"])
+    assert result.exit_code == 0, result.output
+    report = json.loads(result.output[result.output.index("{"):])
+    assert [p["name"] for p in report["phases"]] == ["recipes", "authors", "categories", "users"]
@@ -0,0 +1,69 @@
+import pytest
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.name_index import NameIndex
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+
+def scan(repo, query):
+    query = query.lower()
+    return [r for r in repo.get_recipes() if any(query in (ing or "").lower() for ing in r.ingredients)]
+
+
+@pytest.mark.parametrize("query", ["", "a", "sa", "salt", "BUTTER", "chicken breast", "zzzz"])
+def test_ingredient_pages_match_scan(in_memory_repo, query):
+    expected = scan(in_memory_repo, query)
+    assert in_memory_repo.count_recipes_by_ingredient_name(query) == len(expected)
+    for page in (1, 2, 7):
+        assert in_memory_repo.get_recipes_by_ingredient_name_paginated(query, page, 12) == \
+            expected[(page - 1) * 12:page * 12]
+
+
+def make_recipe(recipe_id, ingredients, category=None):
+    return Recipe(recipe_id, f"Recipe {recipe_id}", Author(recipe_id, "Chef"),
+                  category=category or Category("Dessert"), ingredients=ingredients)
+
+
+def test_recipe_matching_several_ingredients_is_listed_once():
+    repo = MemoryRepository()
+    repo.add_recipe(make_recipe(1, ["Sea salt", "salted butter", "Salt"]))
+    repo.add_recipe(make_recipe(2, ["flour"]))
+    repo.add_recipe(make_recipe(3, ["salt"]))
+
+    assert [r.id for r in repo.get_recipes_by_ingredient_name_paginated("salt", 1, 10)] == [1, 3]
+    assert repo.count_recipes_by_ingredient_name("salt") == 2
+    assert repo.count_recipes_by_ingredient_name("sa") == 2
+
+
+def test_index_follows_recipes_added_after_the_first_search():
+    repo = MemoryRepository()
+    repo.add_recipe(make_recipe(1, ["salt"]))
+    assert repo.count_recipes_by_ingredient_name("salt") == 1
+
+    repo.add_recipe(make_recipe(2, ["rock salt"]))
+    assert [r.id for r in repo.get_recipes_by_ingredient_name("salt")] == [1, 2]
+
+
+def test_building_the_index_leaves_lazy_details_deferred():
+    repo = MemoryRepository()
+    recipe = make_recipe(1, [])
+    recipe.defer_details(lambda: (["1"], ["Honey"], ["Stir"]))
+    repo.add_recipe(recipe)
+
+    assert repo.get_recipes_by_ingredient_name_paginated("honey", 1, 10) == [recipe]
+    assert not recipe.details_loaded
+    assert recipe.ingredients == ["Honey"]
+
+
+def test_name_index_term_dictionary_drops_unused_names():
+    positions = {1: 0, 2: 1}
+    index = NameIndex(positions.__getitem__, multi_valued=True, term_index=True)
+    index.add("Brown Sugar", 1)
+    index.add("sugar", 2)
+    assert sorted(index.matching_names("sugar")) == ["brown sugar", "sugar"]
+
+    index.remove("brown sugar", 1)
+    assert index.matching_names("sugar") == ["sugar"]
+    assert list(index.iter_ids("brown")) == []
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.datareader.interning import StringTable, PackedImages, split_image_url
+
+CSV_PATH = str(Path(__file__).resolve().parent.parent / "data" / "recipes.csv")
+
+RECIPE_IMAGE = ("https://img.sndimg.com/food/image/upload/w_555,h_416,c_fit,fl_progressive,q_95/v1/img/recipes/"
+                "38/YUeirxMLQaeE1h3v3qnM_229%20berry%20blue%20frzn%20dess.jpg")
+
+
+@pytest.fixture(scope="module")
+def readers():
+    plain = CSVDataReader(CSV_PATH, intern_strings=False)
+    plain.csv_read()
+    interned = CSVDataReader(CSV_PATH, string_stats=True)
+    interned.csv_read()
+    return plain, interned
+
+
+def test_split_image_url_keeps_cdn_prefix():
+    prefix, suffix = split_image_url(RECIPE_IMAGE)
+    assert prefix.endswith("/v1/img/recipes/")
+    assert suffix.startswith("38/")
+    assert prefix + suffix == RECIPE_IMAGE
+
+
+def test_split_image_url_without_digit_segment_cuts_at_last_slash():
+    assert split_image_url("https://example.com/images/cake.jpg") == ("https://example.com/images/", "cake.jpg")
+
+
+def test_intern_returns_shared_instance():
+    table = StringTable()
+    first = table.intern("".join(["but", "ter"]), "ingredients")
+    second = table.intern("".join(["butt", "er"]), "ingredients")
+    assert first is second
+
+
+def test_pack_images_round_trips():
+    table = StringTable()
+    urls = [RECIPE_IMAGE, RECIPE_IMAGE.replace("38/", "39/"), "https://example.com/a.jpg"]
+    packed = table.pack_images(urls)
+    assert isinstance(packed, PackedImages)
+    assert len(packed) == 3
+    assert list(packed) == urls
+    assert len(table.image_prefixes) == 2
+    assert table.pack_images([]) == []
+
+
+def test_interned_reader_matches_plain_reader(readers):
+    plain, interned = readers
+    for a, b in zip(plain.recipes, interned.recipes):
+        assert a.images == b.images
+        assert isinstance(b.images, list)
+        assert a.ingredients == b.ingredients
+        assert a.ingredient_quantities == b.ingredient_quantities
+
+
+def test_repeated_ingredients_share_one_object(readers):
+    _, interned = readers
+    by_value = {}
+    for recipe in interned.recipes:
+        for ingredient in recipe.ingredients:
+            assert by_value.setdefault(ingredient, ingredient) is ingredient
+
+
+def test_memory_report_shows_savings_per_field(readers):
+    plain, interned = readers
+    report = interned.memory_report()
+    assert set(report) == {"images", "ingredient_quantities", "ingredients"}
+    for row in report.values():
+        assert row["count"] > row["distinct"]
+        assert row["bytes_saved"] == row["bytes_before"] - row["bytes_after"]
+        assert row["bytes_saved"] > 0
+    assert plain.memory_report() == {}
+
+
+def test_string_stats_are_off_by_default():
+    reader = CSVDataReader(CSV_PATH)
+    reader.csv_read()
+    assert not reader.string_table.collects_stats
+    assert reader.memory_report() == {}
+    by_value = {}
+    for recipe in reader.recipes:
+        for ingredient in recipe.ingredients:
+            assert by_value.setdefault(ingredient, ingredient) is ingredient
+
+
+def test_lazy_details_are_interned_on_load():
+    reader = CSVDataReader(CSV_PATH, lazy_details=True, string_stats=True)
+    reader.csv_read()
+    by_value = {}
+    for recipe in reader.recipes:
+        for ingredient in recipe.ingredients:
+            assert by_value.setdefault(ingredient, ingredient) is ingredient
+    assert reader.memory_report()["ingredients"]["distinct"] == len(by_value)
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository_populate import load_recipes
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+CSV_PATH = str(DATA_DIR / "recipes.csv")
+
+
+@pytest.fixture(scope="module")
+def eager_recipes():
+    reader = CSVDataReader(CSV_PATH)
+    reader.csv_read()
+    return reader.recipes
+
+
+def read_lazy(workers=1):
+    reader = CSVDataReader(CSV_PATH, lazy_details=True)
+    reader.csv_read(workers)
+    return reader
+
+
+def test_lazy_recipes_are_not_decoded_until_accessed():
+    reader = read_lazy()
+    assert reader.record_store is not None
+    assert all(not r.details_loaded for r in reader.recipes)
+
+    recipe = reader.recipes[0]
+    assert len(recipe.ingredients) > 0
+    assert recipe.details_loaded
+    assert not reader.recipes[1].details_loaded
+
+
+def test_lazy_details_match_eager_parsing(eager_recipes):
+    lazy_recipes = read_lazy().recipes
+    assert [r.id for r in lazy_recipes] == [r.id for r in eager_recipes]
+    for lazy, eager in zip(lazy_recipes, eager_recipes):
+        assert lazy.ingredient_quantities == eager.ingredient_quantities
+        assert lazy.ingredients == eager.ingredients
+        assert lazy.instructions == eager.instructions
+        assert lazy.name == eager.name
+        assert lazy.images == eager.images
+
+
+def test_parallel_lazy_details_match_eager_parsing(eager_recipes):
+    lazy_recipes = read_lazy(workers=2).recipes
+    assert [r.id for r in lazy_recipes] == [r.id for r in eager_recipes]
+    assert [r.instructions for r in lazy_recipes] == [r.instructions for r in eager_recipes]
+
+
+def test_setting_instructions_on_lazy_recipe_overrides_csv_value():
+    recipe = read_lazy().recipes[0]
+    recipe.instructions = ["Only step"]
+    assert recipe.instructions == ["Only step"]
+    assert len(recipe.ingredients) > 0
+
+
+def test_load_recipes_with_lazy_details_populates_memory_repository(eager_recipes):
+    repo = MemoryRepository()
+    load_recipes(DATA_DIR, repo, lazy_details=True)
+    assert repo.count_recipes() == len(eager_recipes)
+    recipe = repo.get_recipe_by_id(eager_recipes[0].id)
+    assert not recipe.details_loaded
+    assert recipe.ingredients == eager_recipes[0].ingredients
@@ -0,0 +1,37 @@
+import ast
+import pytest
+
+from recipe.adapters.datareader.listparser import parse_string_list, parse_list_literal
+
+
+@pytest.mark.parametrize("text", [
+    "[]",
+    "['NA']",
+    "['1/2', '1 1/2', 'NA']",
+    "['boneless skinless chicken breast halves', 'ham slices']",
+    "['golden raisin', \"confectioners' sugar\", 'cream cheese']",
+    "['Fannie Flagg\\'s novel, \"Fried Green Tomatoes\"']",
+    "['back\\\\slash', 'tab\\there', 'new\\nline']",
+    "['a, b]', 'c']",
+    "  [ 'padded' ,'spacing' ]  ",
+])
+def test_fast_parser_matches_literal_eval(text):
+    assert parse_string_list(text) == ast.literal_eval(text)
+
+
+@pytest.mark.parametrize("text", [
+    "['a' 'b']",
+    "[1, 2]",
+    "[u'a']",
+    "['\\x41']",
+    "['unterminated]",
+    "'not a list'",
+])
+def test_fast_parser_rejects_unsupported_literals(text):
+    with pytest.raises(ValueError):
+        parse_string_list(text)
+
+
+def test_parse_list_literal_falls_back_to_literal_eval():
+    assert parse_list_literal("['\\x41', 'b']") == ['A', 'b']
+    assert parse_list_literal("[1, 2]") == [1, 2]
@@ -277,6 +277,54 @@ def test_review_id_no_collision_after_deletion(in_memory_repo):
     assert "Fifth review" not in review_texts
 
 
+def test_review_id_of_deleted_newest_review_is_not_reused(in_memory_repo):
+    """Deleting the newest review must not hand its id out again (max(ids) + 1 would)"""
+    user = in_memory_repo.get_user('thorke')
+    recipe = in_memory_repo.get_recipe_by_id(38)
+    first, newest = Review(user, recipe, 5, "First"), Review(user, recipe, 4, "Newest")
+    in_memory_repo.add_review(first)
+    in_memory_repo.add_review(newest)
+
+    assert in_memory_repo.delete_review(newest.id, user.username) is True
+    replacement = Review(user, recipe, 3, "Replacement")
+    in_memory_repo.add_review(replacement)
+
+    assert replacement.id == newest.id + 1
+    assert in_memory_repo.get_reviews_by_recipe_id(38) == [first, replacement]
+    assert in_memory_repo.get_reviews_by_username('thorke') == [first, replacement]
+
+
+def test_review_ids_continue_after_explicit_ids(in_memory_repo):
+    user = in_memory_repo.get_user('thorke')
+    recipe = in_memory_repo.get_recipe_by_id(38)
+    in_memory_repo.add_review(Review(user, recipe, 5, "Imported", review_id=41))
+    generated = Review(user, recipe, 4, "New")
+    in_memory_repo.add_review(generated)
+
+    assert generated.id == 42
+    assert in_memory_repo.delete_review(41, 'someone else') is False
+    assert in_memory_repo.get_reviews_by_username('thorke')[0].id == 41
+
+
+def test_get_recipes_returns_a_read_only_view(in_memory_repo):
+    view = in_memory_repo.get_recipes()
+    assert view is not in_memory_repo.get_recipes()
+    assert len(view) == in_memory_repo.count_recipes()
+    assert view[0] is in_memory_repo.get_first_recipe()
+    assert view[-1] is in_memory_repo.get_last_recipe()
+    assert view[:3] == in_memory_repo.get_recipes_paginated(1, 3)
+    assert list(in_memory_repo.iter_recipes()) == list(view)
+    assert not hasattr(view, "append") and not hasattr(view, "__setitem__")
+
+
+def test_get_recipes_view_follows_new_recipes(in_memory_repo, author_alice):
+    view = in_memory_repo.get_recipes()
+    count = len(view)
+    recipe = Recipe(recipe_id=987654, name="Late addition", author=author_alice, category=Category("Late"))
+    in_memory_repo.add_recipe(recipe)
+    assert len(view) == count + 1 and recipe in view
+
+
 # python -m pytest -v tests
 # py -m pytest -v tests/unit/test_memory_repository.py
-# py -m pytest -v tests/unit/test_memory_repository.py::test_review_id_no_collision_after_deletion
\ No newline at end of file
+# py -m pytest -v tests/unit/test_memory_repository.py::test_review_id_no_collision_after_deletion
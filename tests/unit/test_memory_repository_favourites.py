@@ -70,3 +70,47 @@ def test_is_recipe_in_favourites_for_missing_user_returns_false():
     repo = MemoryRepository()
     assert repo.is_recipe_in_favourites('no_user', 12345) is False
 
+
+
+def test_favourite_id_set_tracks_many_favourites():
+    """
+    Given a user with many favourites
+    When one is added twice and another removed
+    Then the user's list holds each recipe once and the id checks follow every change
+    """
+    repo = MemoryRepository()
+    author = Author(author_id=1, name="Chef")
+    category = Category(name="Dessert")
+    user = User(username="fan", password="pw", user_id=1)
+    repo.add_user(user)
+    recipes = [Recipe(recipe_id=i, name=f"Recipe {i}", author=author, category=category) for i in range(1, 501)]
+    for recipe in recipes:
+        repo.add_recipe(recipe)
+        repo.add_favourite(user, recipe)
+
+    repo.add_favourite(user, recipes[0])
+    repo.remove_favourite(user, recipes[250])
+    repo.remove_favourite(user, recipes[250])
+
+    assert len(user.favourite_recipes) == 499
+    assert repo.is_recipe_in_favourites("fan", recipes[0].id) is True
+    assert repo.is_recipe_in_favourites("fan", recipes[250].id) is False
+    assert recipes[250] not in repo.get_user_favourites("fan")
+
+
+def test_add_user_indexes_existing_favourites():
+    """
+    A user registered with favourites already on it is answered from the id set too.
+    """
+    from recipe.domainmodel.favourite import Favourite
+    recipe = Recipe(recipe_id=7, name="Pie", author=Author(author_id=1, name="Chef"), category=Category(name="Dessert"))
+    user = User(username="returning", password="pw", user_id=2)
+    user.add_favourite_recipe(Favourite(user_id="returning", user=user, recipe=recipe))
+
+    repo = MemoryRepository()
+    repo.add_user(user)
+    repo.add_recipe(recipe)
+
+    assert repo.is_recipe_in_favourites("returning", 7) is True
+    repo.remove_favourite(user, recipe)
+    assert user.favourite_recipes == []
@@ -0,0 +1,185 @@
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.rwlock import ReadWriteLock
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.review import Review
+from recipe.domainmodel.user import User
+
+
+@pytest.fixture
+def fast_switching():
+    # Switch threads far more often than the default 5 ms so interleavings actually happen
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(targets, timeout=60):
+    errors = []
+
+    def guarded(target):
+        try:
+            target()
+        except BaseException as e:  # reported below, so a failing thread fails the test
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout)
+        assert not thread.is_alive(), "thread did not finish (deadlock?)"
+    assert errors == []
+
+
+# ---------- ReadWriteLock ----------
+def test_readers_share_and_writer_excludes():
+    lock = ReadWriteLock()
+    all_reading = threading.Barrier(3, timeout=5)  # only passes if three readers hold the lock together
+    writer_done = threading.Event()
+    seen_by_readers = []
+
+    def reader():
+        with lock.read():
+            all_reading.wait()
+            time.sleep(0.05)
+            seen_by_readers.append(writer_done.is_set())
+
+    def writer():
+        with lock.write():
+            writer_done.set()
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    run_threads([writer])
+    for thread in threads:
+        thread.join(5)
+    assert seen_by_readers == [False, False, False]
+
+
+def test_lock_is_reentrant_but_does_not_upgrade():
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.read(), lock.write():
+            pass
+    with lock.read():
+        with lock.read():
+            pass
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    with lock.write():  # every hold above was released
+        pass
+
+
+def test_nested_read_does_not_queue_behind_waiting_writer():
+    lock = ReadWriteLock()
+    first_read = threading.Event()
+    nested_done = threading.Event()
+
+    def reader():
+        with lock.read():
+            first_read.set()
+            time.sleep(0.05)  # let the writer start waiting
+            with lock.read():
+                nested_done.set()
+
+    def writer():
+        first_read.wait()
+        with lock.write():
+            assert nested_done.is_set()
+
+    run_threads([reader, writer], timeout=10)
+
+
+# ---------- MemoryRepository under concurrent use ----------
+def make_repo(recipe_count=40, user_count=6):
+    repo = MemoryRepository()
+    authors = [Author(i, f"Author {i}") for i in range(1, 5)]
+    categories = [Category(name) for name in ("Dessert", "Bread", "Soup")]
+    for author in authors:
+        repo.add_author(author)
+    for category in categories:
+        repo.add_category(category)
+    for i in range(1, recipe_count + 1):
+        repo.add_recipe(Recipe(i, f"Recipe {i}", authors[i % 4], category=categories[i % 3],
+                               ingredients=["salt", f"spice {i % 5}"]))
+    users = [User(f"user{i}", "pw", user_id=i) for i in range(user_count)]
+    for user in users:
+        repo.add_user(user)
+    return repo, users
+
+
+def test_concurrent_reviews_favourites_and_catalog_writes_keep_invariants(fast_switching):
+    repo, users = make_repo()
+    next_recipe_id = iter(range(1000, 2000))
+    id_lock = threading.Lock()
+
+    def reviewer(user):
+        def run():
+            rnd = random.Random(user.username)
+            mine = []
+            for _ in range(150):
+                recipe = repo.get_recipe_by_id(rnd.randint(1, 40))
+                if mine and rnd.random() < 0.4:
+                    assert repo.delete_review(mine.pop(rnd.randrange(len(mine))), user.username)
+                else:
+                    review = Review(user, recipe, rnd.randint(1, 5), "text")
+                    repo.add_review(review)
+                    mine.append(review.id)
+        return run
+
+    def favouriter(user):
+        def run():
+            rnd = random.Random(user.username + "fav")
+            for _ in range(200):
+                recipe = repo.get_recipe_by_id(rnd.randint(1, 40))
+                if repo.is_recipe_in_favourites(user.username, recipe.id):
+                    repo.remove_favourite(user, recipe)
+                else:
+                    repo.add_favourite(user, recipe)
+        return run
+
+    def searcher():
+        for _ in range(150):
+            # A count and the matching list only agree when read under one hold of the lock
+            with repo.lock.read():
+                assert repo.count_recipes_by_ingredient_name("salt") == len(repo.get_recipes_by_ingredient_name("salt"))
+                assert repo.count_recipes_by_name("recipe") == len(repo.get_recipes_by_name("recipe"))
+            repo.get_recipes_by_author_name_paginated("author", 2, 5)
+
+    def catalog_writer():
+        for _ in range(30):
+            with id_lock:
+                recipe_id = next(next_recipe_id)
+            repo.add_recipe(Recipe(recipe_id, f"Recipe {recipe_id}", Author(recipe_id, "Late author"),
+                                   category=Category("Late"), ingredients=["salt"]))
+
+    run_threads([reviewer(u) for u in users[:3]] + [favouriter(u) for u in users[3:]] +
+                [searcher, searcher, catalog_writer])
+
+    # Reviews: unique ids, and the per-recipe, per-user and rating bookkeeping all agree
+    reviews = [review for user in users for review in user.reviews]
+    assert len({review.id for review in reviews}) == len(reviews)
+    for recipe in repo.get_recipes():
+        assert repo.get_reviews_by_recipe_id(recipe.id) == list(recipe.reviews)
+        assert recipe.rating_count == len(recipe.reviews)
+        assert recipe.rating_sum == sum(review.rating for review in recipe.reviews)
+    # Favourites: the id sets match the users' lists, with no duplicates
+    for user in users:
+        ids = [fav.recipe.id for fav in user.favourite_recipes]
+        assert len(ids) == len(set(ids))
+        assert repo.get_favourite_ids(user.username, range(1, 41)) == set(ids)
+    # Catalog: every added recipe made it into the indexes
+    assert repo.count_recipes() == 70
+    assert repo.count_recipes_by_ingredient_name("salt") == 70
+    assert len(repo.get_recipes_by_name("")) == 70
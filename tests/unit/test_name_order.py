@@ -0,0 +1,35 @@
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+
+def scan(repo, query):
+    query = query.strip().lower()
+    return sorted([r for r in repo.get_recipes() if query in r.name.lower()], key=lambda r: r.name.lower())
+
+
+def test_empty_query_returns_maintained_name_order(in_memory_repo):
+    assert in_memory_repo.get_recipes_by_name("") == scan(in_memory_repo, "")
+    assert in_memory_repo.get_recipes_by_name_paginated("", 3, 12) == scan(in_memory_repo, "")[24:36]
+
+
+def test_pages_match_sorted_scan_for_dense_and_sparse_queries(in_memory_repo):
+    # "e" and "a" match most names (dense path), "chicken" a few percent (sparse path)
+    for query in ("e", "an", "a", "chicken", "cake", "zzzz"):
+        expected = scan(in_memory_repo, query)
+        for page in (1, 2, 7):
+            result = in_memory_repo.get_recipes_by_name_paginated(query, page, 10)
+            assert result == expected[(page - 1) * 10:page * 10], (query, page)
+        assert in_memory_repo.count_recipes_by_name(query) == len(expected)
+
+
+def test_added_recipes_are_inserted_in_name_order_with_stable_ties():
+    repo = MemoryRepository()
+    author = Author(1, "Chef")
+    category = Category("Dessert")
+    for recipe_id, name in ((1, "pie"), (2, "Apple Cake"), (3, "Pie"), (4, "banana bread")):
+        repo.add_recipe(Recipe(recipe_id, name, author, category=category))
+
+    assert [r.id for r in repo.get_recipes_by_name("")] == [2, 4, 1, 3]
+    assert [r.id for r in repo.get_recipes_by_name("pie")] == [1, 3]
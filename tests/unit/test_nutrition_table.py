@@ -0,0 +1,79 @@
+import pytest
+
+from recipe.adapters.nutrition_table import NutritionTable, NutritionView
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.nutrition import Nutrition
+from recipe.domainmodel.recipe import Recipe
+from recipe.adapters.memory_repository import MemoryRepository
+
+
+def test_view_reads_and_writes_table_columns():
+    table = NutritionTable()
+    view = table.append(7, calories=250, fat=10.5, sodium=300, protein=12.0)
+
+    assert isinstance(view, Nutrition)
+    assert view.id == 7
+    assert view.calories == 250 and isinstance(view.calories, int)
+    assert view.fat == 10.5
+    assert view.sugar == 0.0
+
+    view.sugar = 4.5
+    assert table.column("sugar")[view.position] == 4.5
+    assert view == Nutrition(nutrition_id=7)
+
+
+def test_view_health_star_rating_matches_nutrition():
+    values = dict(calories=400, saturated_fat=7.0, sugar=20.0, sodium=800, fiber=6.0, protein=15.0)
+    view = NutritionTable().append(1, **values)
+    assert view.health_star_rating() == Nutrition(1, **values).health_star_rating()
+
+
+def test_unknown_nutrient_is_rejected():
+    table = NutritionTable()
+    with pytest.raises(ValueError):
+        table.append(1, vitamins=3)
+    with pytest.raises(ValueError):
+        table.column("vitamins")
+
+
+def test_update_and_copy_rows_keep_raw_column_values():
+    table = NutritionTable()
+    for i in range(1, 4):
+        table.append(i, calories=100.5 * i, fat=i)
+    table.update(1, calories=99.25)
+    assert table.ids[1] == 2 and table.column("fat")[1] == 0.0
+
+    copy = table.copy_rows([2, 1])
+    assert list(copy.ids) == [3, 2]
+    assert list(copy.column("calories")) == [301.5, 99.25]
+    assert len(table) == 3
+
+
+def test_ingest_fills_repository_nutrition_table(in_memory_repo):
+    table = in_memory_repo.get_nutrition_table()
+    recipes = in_memory_repo.get_recipes()
+    assert len(table) == len(recipes)
+
+    recipe = recipes[0]
+    assert isinstance(recipe.nutrition, NutritionView)
+    assert recipe.nutrition.table is table
+    assert table.column("calories")[recipe.nutrition.position] == recipe.nutrition.calories
+
+
+def test_nutrient_range_scan_matches_per_recipe_filter(in_memory_repo):
+    expected = [r for r in in_memory_repo.get_recipes() if 100 <= r.nutrition.calories <= 200]
+    assert in_memory_repo.get_recipes_by_nutrient_range("calories", 100, 200) == expected
+    assert len(in_memory_repo.get_recipes_by_nutrient_range("protein")) == in_memory_repo.count_recipes()
+
+
+def test_add_recipe_moves_plain_nutrition_into_table():
+    repo = MemoryRepository()
+    author = Author(1, "Chef")
+    category = Category("Dessert")
+    recipe = Recipe(5, "Pie", author, category=category, nutrition=Nutrition(5, calories=321, fat=2.5))
+    repo.add_recipe(recipe)
+
+    assert isinstance(recipe.nutrition, NutritionView)
+    assert recipe.nutrition.calories == 321 and recipe.nutrition.fat == 2.5
+    assert repo.get_recipes_by_nutrient_range("calories", 300) == [recipe]
@@ -0,0 +1,94 @@
+from pathlib import Path
+import csv
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.datareader.parallel import split_byte_ranges, align_range, parse_range, read_fieldnames
+from recipe.adapters.datareader.records import iter_records, record_start_at
+
+
+@pytest.fixture
+def csv_path():
+    return Path(__file__).resolve().parent.parent / "data" / "recipes.csv"
+
+
+def recipe_snapshot(recipe):
+    n = recipe.nutrition
+    return (
+        recipe.id, recipe.name, recipe.author.id, recipe.author.name, recipe.category.name,
+        recipe.cook_time, recipe.preparation_time, recipe.date, recipe.description, recipe.images,
+        recipe.ingredient_quantities, recipe.ingredients, recipe.instructions,
+        recipe.servings, recipe.recipe_yield,
+        (n.calories, n.fat, n.saturated_fat, n.cholesterol, n.sodium,
+         n.carbohydrates, n.fiber, n.sugar, n.protein),
+    )
+
+
+def test_parallel_read_matches_serial_read(csv_path):
+    serial = CSVDataReader(csv_path)
+    serial.csv_read()
+    parallel = CSVDataReader(csv_path)
+    parallel.csv_read(workers=2)
+
+    assert [recipe_snapshot(r) for r in parallel.recipes] == [recipe_snapshot(r) for r in serial.recipes]
+
+    # Authors deduplicated by id and categories by name, exactly as the serial reader does
+    assert [(a.id, a.name, len(a.recipes)) for a in parallel.authors] == \
+           [(a.id, a.name, len(a.recipes)) for a in serial.authors]
+    assert [(c.name, len(c.recipes)) for c in parallel.categories] == \
+           [(c.name, len(c.recipes)) for c in serial.categories]
+    assert len({id(r.author) for r in parallel.recipes}) == len(parallel.authors)
+    assert len({id(r.category) for r in parallel.recipes}) == len(parallel.categories)
+
+
+def test_ranges_are_realigned_on_records_with_multiline_fields(tmp_path):
+    csv_file = tmp_path / "multiline.csv"
+    rows = [{"Id": str(i), "Text": f"line one {i}\nline \"two\" {i}\n{i},\"\",{i}"} for i in range(50)]
+    with open(csv_file, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["Id", "Text"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    header_span, ranges = split_byte_ranges(csv_file, 7)
+    fieldnames = read_fieldnames(csv_file, header_span)
+    assert fieldnames == ["Id", "Text"]
+    assert len(ranges) == 7
+
+    # Realigned ranges are contiguous and each one parses into whole records
+    aligned = [align_range(str(csv_file), start, end) for start, end in ranges]
+    assert aligned[0][0] == header_span[1]
+    assert all(a[1] == b[0] for a, b in zip(aligned, aligned[1:]))
+    assert aligned[-1][1] == csv_file.stat().st_size
+
+    ids = []
+    with open(csv_file, mode="rb") as f:
+        for start, end in aligned:
+            f.seek(start)
+            chunk = f.read(end - start).decode("utf-8")
+            parsed = list(csv.DictReader(chunk.splitlines(keepends=True), fieldnames=fieldnames))
+            assert all(row["Text"].startswith("line one") for row in parsed)
+            ids += [row["Id"] for row in parsed]
+    assert ids == [str(i) for i in range(50)]
+
+
+def test_record_start_at_agrees_with_a_serial_scan(tmp_path):
+    csv_file = tmp_path / "multiline.csv"
+    with open(csv_file, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Id", "Text"])
+        for i in range(30):
+            writer.writerow([i, f'say "hi"\n{i},"x"\n' if i % 3 else "plain"])
+    data = csv_file.read_bytes()
+    starts = [start for start, _, _ in iter_records(str(csv_file))] + [len(data)]
+
+    for pos in range(len(data) + 1):
+        assert record_start_at(data, pos) == min(start for start in starts if start >= pos)
+
+
+def test_parse_range_returns_plain_values(csv_path):
+    header_span, ranges = split_byte_ranges(csv_path, 4)
+    parsed = parse_range(str(csv_path), read_fieldnames(csv_path, header_span), *ranges[0])
+
+    assert parsed
+    assert isinstance(parsed[0]["recipe_id"], int)
+    assert isinstance(parsed[0]["ingredients"], list)
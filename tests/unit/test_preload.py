@@ -0,0 +1,77 @@
+import gc
+import os
+import runpy
+from pathlib import Path
+
+import pytest
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+from recipe.preload import prepare_for_fork, memory_usage
+
+
+@pytest.fixture
+def unfreeze():
+    yield
+    gc.unfreeze()
+
+
+def make_repo():
+    repo = MemoryRepository()
+    author = Author(1, "Chef")
+    category = Category("Dessert")
+    repo.add_author(author)
+    repo.add_category(category)
+    for i in range(1, 4):
+        repo.add_recipe(Recipe(i, f"Recipe {i}", author, category=category, ingredients=["salt", f"spice {i}"]))
+    return repo
+
+
+def test_prepare_for_fork_freezes_the_heap(unfreeze):
+    repo = make_repo()
+    frozen = prepare_for_fork(repo)
+    assert frozen == gc.get_freeze_count() > 0
+    assert repo.count_recipes_by_ingredient_name("spice") == 3
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"), reason="needs Linux /proc")
+def test_memory_usage_splits_resident_memory():
+    usage = memory_usage()
+    assert usage["rss"] == usage["shared"] + usage["private"]
+    assert 0 < usage["pss"] <= usage["rss"]
+
+
+def test_worker_boots_without_smaps_rollup():
+    settings = runpy.run_path(str(Path(__file__).resolve().parents[2] / "gunicorn.conf.py"))
+    gc.enable()  # the config disables collection for the master's load
+
+    def missing(pid="self"):
+        raise FileNotFoundError(f"/proc/{pid}/smaps_rollup")
+    settings["post_worker_init"].__globals__["memory_usage"] = missing
+    logged = []
+
+    class Worker:
+        class log:
+            info = staticmethod(lambda *args: logged.append(args))
+
+    settings["post_worker_init"](Worker())
+    assert logged == []
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_worker_reads_the_preloaded_catalog(unfreeze):
+    repo = make_repo()
+    prepare_for_fork(repo)
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        gc.enable()
+        os.write(write_end, str(repo.count_recipes_by_name("recipe")).encode())
+        os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end, "rb") as f:
+        assert f.read() == b"3"
+    assert os.waitpid(pid, 0)[1] == 0
@@ -0,0 +1,68 @@
+import pytest
+
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.recipe_set import RecipeSet
+
+
+@pytest.fixture
+def recipes():
+    author = Author(1, "Chef")
+    return [Recipe(i, f"Recipe {i}", author) for i in range(1, 6)]
+
+
+def test_recipe_set_keeps_insertion_order_without_duplicates(recipes):
+    recipe_set = RecipeSet([recipes[2], recipes[0], recipes[2]])
+    assert recipe_set.add(recipes[4]) is True
+    assert recipe_set.add(recipes[0]) is False
+    recipe_set.append(recipes[4])
+
+    assert list(recipe_set) == [recipes[2], recipes[0], recipes[4]]
+    assert recipe_set == [recipes[2], recipes[0], recipes[4]]
+    assert recipe_set[0] is recipes[2] and recipe_set[-1] is recipes[4]
+    assert recipe_set[1:] == [recipes[0], recipes[4]]
+    assert len(recipe_set) == 3 and recipe_set.count(recipes[2]) == 1
+
+
+def test_recipe_set_membership_and_removal(recipes):
+    recipe_set = RecipeSet(recipes)
+    # Recipes compare by id, as in the list this replaces
+    assert Recipe(3, "Same id", Author(2, "Other")) in recipe_set
+    recipe_set.remove(recipes[2])
+    recipe_set.discard(recipes[2])
+    assert recipes[2] not in recipe_set
+    with pytest.raises(ValueError):
+        recipe_set.remove(recipes[2])
+    assert list(recipe_set) == [recipes[0], recipes[1], recipes[3], recipes[4]]
+
+
+def test_recipe_set_indexes_follow_appends_and_removals(recipes):
+    recipe_set = RecipeSet(recipes[:3])
+    assert recipe_set[2] is recipes[2]
+    recipe_set.append(recipes[3])
+    assert recipe_set[-1] is recipes[3]
+    recipe_set.remove(recipes[0])
+    assert recipe_set[0] is recipes[1] and recipe_set[:] == recipes[1:4]
+    recipe_set.append(recipes[4])
+    recipe_set.append(recipes[1])
+    assert [recipe_set[i] for i in range(len(recipe_set))] == [recipes[1], recipes[2], recipes[3], recipes[4]]
+    recipe_set.clear()
+    recipe_set.append(recipes[0])
+    assert recipe_set[0] is recipes[0] and len(recipe_set) == 1
+    with pytest.raises(IndexError):
+        recipe_set[1]
+
+
+def test_author_and_category_hold_each_recipe_once(recipes):
+    author = Author(7, "Prolific", recipes=recipes[:2])
+    category = Category("Dessert")
+    for recipe in recipes + recipes:
+        author.add_recipe(recipe)
+        category.add_recipe(recipe)
+
+    assert author.recipes == recipes
+    assert category.recipes == recipes
+    category.remove_recipe(recipes[0])
+    category.remove_recipe(recipes[0])
+    assert list(category.recipes) == recipes[1:]
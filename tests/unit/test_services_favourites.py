@@ -83,10 +83,10 @@ def test_toggle_favourite_adds_and_removes_favourite(monkeypatch):
 
 # ----------------------- Tests for annotate_is_favourite -----------------------
 
-def test_annotate_is_favourite_sets_flag_for_authenticated_user(monkeypatch):
+def test_annotate_is_favourite_returns_ids_for_authenticated_user(monkeypatch):
     """
-    Given a logged-in user with one favourite, annotate_is_favourite should mark the matching recipe's
-    `is_favourite` attribute True and others False.
+    Given a logged-in user with one favourite, annotate_is_favourite should return only the matching
+    recipe's id, and leave the shared Recipe objects untouched.
     """
     repo, user, recipe = make_repo_with_recipe(recipe_id=3003, username='anno')
     user.is_authenticated = True
@@ -104,24 +104,22 @@ def test_annotate_is_favourite_sets_flag_for_authenticated_user(monkeypatch):
     monkeypatch.setattr(services, 'current_user', user)
 
     recipes = [recipe, recipe2]
-    services.annotate_is_favourite(recipes, repo)
+    favourite_ids = services.annotate_is_favourite(recipes, repo)
 
-    assert getattr(recipes[0], 'is_favourite', False) is True
-    assert getattr(recipes[1], 'is_favourite', False) is False
+    assert favourite_ids == {recipe.id}
+    assert not hasattr(recipe, 'is_favourite') and not hasattr(recipe2, 'is_favourite')
 
 
-def test_annotate_is_favourite_sets_false_when_not_authenticated(monkeypatch):
+def test_annotate_is_favourite_is_empty_when_not_authenticated(monkeypatch):
     """
-    When no user is logged in, annotate_is_favourite must set is_favourite False on all recipes.
+    When no user is logged in, annotate_is_favourite must return no favourite ids.
     """
     repo, user, recipe = make_repo_with_recipe()
     anon = User(username='anon2', password='x', user_id=55)
     anon.is_authenticated = False
     monkeypatch.setattr(services, 'current_user', anon)
 
-    recipes = [recipe]
-    services.annotate_is_favourite(recipes, repo)
-    assert getattr(recipes[0], 'is_favourite', True) is False
+    assert services.annotate_is_favourite([recipe], repo) == set()
 
 
 # ----------------------- Tests for get_favourites and search_favourites -----------------------
@@ -169,3 +167,23 @@ def test_search_favourites_filters_by_name(monkeypatch):
     with pytest.raises(services.NonExistentRecipeException):
         services.search_favourites('name', 'nonexistent', repo)
 
+
+
+def test_annotate_is_favourite_uses_one_batch_lookup(monkeypatch):
+    """
+    annotate_is_favourite asks the repository once for the whole list, not once per recipe.
+    """
+    repo, user, recipe = make_repo_with_recipe(recipe_id=3005, username='batch')
+    user.is_authenticated = True
+    repo.add_favourite(user, recipe)
+    monkeypatch.setattr(services, 'current_user', user)
+
+    calls = []
+    lookup = repo.get_favourite_ids
+    monkeypatch.setattr(repo, 'get_favourite_ids', lambda *args: calls.append(args) or lookup(*args))
+    monkeypatch.setattr(repo, 'is_recipe_in_favourites', lambda *args: pytest.fail("per-recipe lookup"))
+
+    favourite_ids = services.annotate_is_favourite([recipe, recipe], repo)
+
+    assert len(calls) == 1
+    assert favourite_ids == {recipe.id}
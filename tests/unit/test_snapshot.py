@@ -0,0 +1,117 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import recipe.adapters.datareader.csvdatareader as csvdatareader
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.datareader.snapshot import snapshot_path, iter_snapshot_rows
+
+
+@pytest.fixture
+def csv_copy(tmp_path):
+    source = Path(__file__).resolve().parent.parent / "data" / "recipes.csv"
+    target = tmp_path / "recipes.csv"
+    shutil.copy(source, target)
+    return target
+
+
+def read_with_snapshot(csv_path):
+    reader = CSVDataReader(csv_path, use_snapshot=True)
+    reader.csv_read()
+    return reader
+
+
+def test_first_read_writes_snapshot_next_to_csv(csv_copy):
+    assert not snapshot_path(csv_copy).exists()
+    read_with_snapshot(csv_copy)
+    assert snapshot_path(csv_copy).exists()
+
+
+def test_second_read_loads_snapshot_without_parsing(csv_copy, monkeypatch):
+    first = read_with_snapshot(csv_copy)
+
+    def fail(row):
+        raise AssertionError("CSV rows should not be parsed when the snapshot is valid")
+    monkeypatch.setattr(csvdatareader, "parse_row", fail)
+
+    second = read_with_snapshot(csv_copy)
+    assert [r.id for r in second.recipes] == [r.id for r in first.recipes]
+    assert [r.ingredients for r in second.recipes] == [r.ingredients for r in first.recipes]
+    assert [r.date for r in second.recipes] == [r.date for r in first.recipes]
+    assert len(second.authors) == len(first.authors)
+    assert len(second.categories) == len(first.categories)
+
+
+def test_touched_but_unchanged_csv_keeps_snapshot(csv_copy):
+    read_with_snapshot(csv_copy)
+    stat = os.stat(csv_copy)
+    os.utime(csv_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert iter_snapshot_rows(csv_copy) is not None
+
+
+def test_changed_csv_invalidates_snapshot(csv_copy):
+    first = read_with_snapshot(csv_copy)
+    with open(csv_copy, mode="r", newline="", encoding="utf-8") as f:
+        lines = f.read()
+    # Drop the last recipe row
+    with open(csv_copy, mode="w", newline="", encoding="utf-8") as f:
+        f.write(lines[:lines.rstrip("\n").rfind("\n") + 1])
+
+    assert iter_snapshot_rows(csv_copy) is None
+    second = read_with_snapshot(csv_copy)
+    assert len(second.recipes) == len(first.recipes) - 1
+    # ...and the rewritten snapshot is valid again
+    assert iter_snapshot_rows(csv_copy) is not None
+
+
+def test_snapshot_disabled_by_default(csv_copy):
+    CSVDataReader(csv_copy).csv_read()
+    assert not snapshot_path(csv_copy).exists()
+
+
+def test_touched_but_unchanged_csv_restamps_snapshot(csv_copy, monkeypatch):
+    import recipe.adapters.datareader.snapshot as snapshot
+    read_with_snapshot(csv_copy)
+    stat = os.stat(csv_copy)
+    os.utime(csv_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert iter_snapshot_rows(csv_copy) is not None
+
+    fingerprint = snapshot.csv_fingerprint
+    def no_hashing(csv_path, with_hash=True):
+        assert not with_hash, "the restamped snapshot should not need the content hash"
+        return fingerprint(csv_path, with_hash)
+    monkeypatch.setattr(snapshot, "csv_fingerprint", no_hashing)
+    assert iter_snapshot_rows(csv_copy) is not None
+
+
+@pytest.mark.parametrize("damage", ["truncate", "corrupt"])
+def test_damaged_snapshot_falls_back_to_the_csv(csv_copy, damage):
+    first = read_with_snapshot(csv_copy)
+    path = snapshot_path(csv_copy)
+    data = path.read_bytes()
+    middle = len(data) // 2
+    if damage == "truncate":
+        path.write_bytes(data[:middle])
+    else:
+        path.write_bytes(data[:middle] + b"\xff" * 64 + data[middle + 64:])
+
+    second = read_with_snapshot(csv_copy)
+    assert [r.id for r in second.recipes] == [r.id for r in first.recipes]
+    assert [r.ingredients for r in second.recipes] == [r.ingredients for r in first.recipes]
+    # ...and the snapshot is rewritten whole
+    assert len(list(iter_snapshot_rows(csv_copy))) == len(first.recipes)
+
+
+def test_lazy_details_have_their_own_snapshot(csv_copy, monkeypatch):
+    eager = read_with_snapshot(csv_copy)
+    first = CSVDataReader(csv_copy, use_snapshot=True, lazy_details=True)
+    first.csv_read()
+    assert snapshot_path(csv_copy, lazy_details=True).exists()
+
+    monkeypatch.setattr(csvdatareader, "parse_row", lambda *args, **kwargs: pytest.fail("row parsed"))
+    second = CSVDataReader(csv_copy, use_snapshot=True, lazy_details=True)
+    second.csv_read()
+    assert [r.ingredients for r in second.recipes] == [r.ingredients for r in eager.recipes]
+    assert [r.instructions for r in second.recipes] == [r.instructions for r in eager.recipes]
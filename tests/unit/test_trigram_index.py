@@ -0,0 +1,70 @@
+import pytest
+
+from recipe.adapters.trigram_index import TrigramIndex, trigrams
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+from recipe.adapters.memory_repository import MemoryRepository
+
+
+@pytest.fixture
+def index():
+    index = TrigramIndex()
+    index.add(1, "Chocolate Cake")
+    index.add(2, "Carrot Cake")
+    index.add(3, "Lemon Tart")
+    return index
+
+
+def test_trigrams_of_short_text_is_empty():
+    assert trigrams("ab") == set()
+    assert trigrams("abcd") == {"abc", "bcd"}
+
+
+def test_search_is_case_insensitive_substring(index):
+    assert index.search("CAKE") == {1, 2}
+    assert index.search("late ca") == {1}
+    assert index.search("pie") == set()
+
+
+def test_search_verifies_candidates(index):
+    # "abcxbcd" holds both trigrams of "abcd", but not next to each other
+    index.add(4, "abcxbcd")
+    assert index.search("abcd") == set()
+    assert index.search("cxb") == {4}
+
+
+def test_short_query_is_not_answered(index):
+    assert index.search("ca") is None
+    assert index.search("") is None
+
+
+def test_remove_and_replace(index):
+    index.remove(1)
+    assert index.search("cake") == {2}
+    index.add(2, "Carrot Muffin")
+    assert index.search("cake") == set()
+    assert index.search("muffin") == {2}
+    assert len(index) == 2
+
+
+def test_repository_name_search_matches_scan(in_memory_repo):
+    def scan(query):
+        query = query.strip().lower()
+        return sorted([r for r in in_memory_repo.get_recipes() if query in r.name.lower()],
+                      key=lambda r: r.name.lower())
+
+    for query in ("a", "ch", "chi", "Chicken", " cake ", "salad", "zzzz", "e s", "bread"):
+        result = in_memory_repo.get_recipes_by_name(query)
+        assert [r.id for r in result] == [r.id for r in scan(query)], query
+        assert in_memory_repo.count_recipes_by_name(query) == len(result)
+
+
+def test_index_follows_added_recipes():
+    repo = MemoryRepository()
+    author = Author(1, "Chef")
+    category = Category("Dessert")
+    repo.add_recipe(Recipe(1, "Banana Bread", author, category=category))
+    repo.add_recipe(Recipe(2, "Zucchini Bread", author, category=category))
+    assert [r.id for r in repo.get_recipes_by_name("bread")] == [1, 2]
+    assert [r.id for r in repo.get_recipes_by_name("zucc")] == [2]
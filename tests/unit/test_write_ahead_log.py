@@ -0,0 +1,215 @@
+import threading
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.write_ahead_log import WriteAheadLog, replay
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.review import Review
+from recipe.domainmodel.user import User
+
+
+def make_catalog():
+    # Stands in for populate(): the catalog is rebuilt identically on every boot
+    repo = MemoryRepository()
+    author = Author(1, "Chef")
+    category = Category("Dessert")
+    repo.add_author(author)
+    repo.add_category(category)
+    for i in range(1, 6):
+        repo.add_recipe(Recipe(i, f"Recipe {i}", author, category=category))
+    return repo
+
+
+def boot(path, **kwargs):
+    repo = make_catalog()
+    log = WriteAheadLog(path, sync=False, **kwargs)
+    applied = replay(log, repo)
+    repo.attach_write_ahead_log(log)
+    return repo, log, applied
+
+
+def user_state(repo, username):
+    user = repo.get_user(username)
+    reviews = sorted((r.id, r.recipe.id, r.rating, r.review_text, r.date) for r in repo.get_reviews_by_username(username))
+    favourites = [recipe.id for recipe in repo.get_user_favourites(username)]
+    return user.password, reviews, favourites
+
+
+def test_replay_restores_users_reviews_and_favourites(tmp_path):
+    path = tmp_path / "user_data.log"
+    repo, log, applied = boot(path)
+    assert applied == 0
+
+    alice = User("alice", "hashed-pw")
+    repo.add_user(alice)
+    first = Review(alice, repo.get_recipe_by_id(1), 4, "Nice")
+    second = Review(alice, repo.get_recipe_by_id(2), 2, "Meh")
+    repo.add_review(first)
+    repo.add_review(second)
+    repo.delete_review(first.id, "alice")
+    repo.add_favourite(alice, repo.get_recipe_by_id(3))
+    repo.add_favourite(alice, repo.get_recipe_by_id(4))
+    repo.remove_favourite(alice, repo.get_recipe_by_id(3))
+    expected = user_state(repo, "alice")
+    log.close()
+
+    restored, log, applied = boot(path)
+    assert applied == 7
+    assert user_state(restored, "alice") == expected
+    assert restored.get_recipe_by_id(2).rating_count == 1
+    assert restored.get_recipe_by_id(1).reviews == []
+    # New reviews keep getting fresh ids after a restart
+    third = Review(restored.get_user("alice"), restored.get_recipe_by_id(5), 5, "Great")
+    restored.add_review(third)
+    assert third.id > second.id
+    log.close()
+
+
+def test_unchanged_calls_are_not_logged(tmp_path):
+    repo, log, _ = boot(tmp_path / "user_data.log")
+    bob = User("bob", "pw")
+    repo.add_user(bob)
+    repo.add_favourite(bob, repo.get_recipe_by_id(1))
+    repo.add_favourite(bob, repo.get_recipe_by_id(1))
+    repo.remove_favourite(bob, repo.get_recipe_by_id(2))
+    assert repo.delete_review(99, "bob") is False
+    log.close()
+    assert [record["op"] for record in log.records()] == ["add_user", "add_favourite"]
+
+
+def test_torn_last_record_is_ignored(tmp_path):
+    path = tmp_path / "user_data.log"
+    repo, log, _ = boot(path)
+    repo.add_user(User("carol", "pw"))
+    log.close()
+    with open(path, "ab") as f:
+        f.write(b'{"op":"add_user","username":"da')  # crash in the middle of a write
+
+    restored, log, applied = boot(path)
+    assert applied == 1
+    assert restored.get_user("carol") is not None
+    log.close()
+
+
+def test_concurrent_commits_share_flushes(tmp_path):
+    repo, log, _ = boot(tmp_path / "user_data.log")
+    users = [User(f"user{i}", "pw") for i in range(8)]
+    for user in users:
+        repo.add_user(user)
+    syncs_before = log.sync_count
+    start = threading.Barrier(len(users))
+
+    def favourite_everything(user):
+        start.wait()
+        for recipe_id in range(1, 6):
+            repo.add_favourite(user, repo.get_recipe_by_id(recipe_id))
+
+    threads = [threading.Thread(target=favourite_everything, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    # Every change is on disk, and no change needed more than one flush
+    assert sum(record["op"] == "add_favourite" for record in log.records()) == 40
+    assert log.sync_count - syncs_before <= 40
+    log.close()
+
+
+def test_one_flush_covers_every_buffered_record(tmp_path):
+    log = WriteAheadLog(tmp_path / "user_data.log", sync=False)
+    sequences = [log.append({"op": "add_user", "username": f"user{i}", "password": "pw"}) for i in range(3)]
+    assert list(log.records()) == []  # buffered, not yet written
+
+    log.commit(sequences[-1])
+    log.commit(sequences[0])  # already durable, so no second flush
+    assert log.sync_count == 1
+    assert [record["username"] for record in log.records()] == ["user0", "user1", "user2"]
+    log.close()
+
+
+def test_compaction_shrinks_the_log_and_keeps_state(tmp_path):
+    path = tmp_path / "user_data.log"
+    repo, log, _ = boot(path, compact_after=27)
+    erin = User("erin", "pw")
+    repo.add_user(erin)
+    for _ in range(6):
+        for recipe_id in (1, 2):
+            repo.add_favourite(erin, repo.get_recipe_by_id(recipe_id))
+            repo.remove_favourite(erin, repo.get_recipe_by_id(recipe_id))
+    repo.add_favourite(erin, repo.get_recipe_by_id(5))
+    review = Review(erin, repo.get_recipe_by_id(3), 3, "Fine")
+    repo.add_review(review)
+    expected = user_state(repo, "erin")
+
+    # The 27th record reached compact_after, so the log was rewritten down to the live state
+    assert [record["op"] for record in log.records()] == ["next_review_id", "add_user", "add_review", "add_favourite"]
+    assert not log.needs_compaction
+    log.close()
+
+    restored, log, applied = boot(path)
+    assert applied == 3
+    assert user_state(restored, "erin") == expected
+    log.close()
+
+
+def test_compaction_keeps_ids_of_deleted_reviews_retired(tmp_path):
+    path = tmp_path / "user_data.log"
+    repo, log, _ = boot(path)
+    frank = User("frank", "pw")
+    repo.add_user(frank)
+    kept = Review(frank, repo.get_recipe_by_id(1), 4, "Good")
+    latest = Review(frank, repo.get_recipe_by_id(2), 1, "Bad")
+    repo.add_review(kept)
+    repo.add_review(latest)
+    repo.delete_review(latest.id, "frank")
+    repo.compact_write_ahead_log()
+    log.close()
+
+    restored, log, _ = boot(path)
+    fresh = Review(restored.get_user("frank"), restored.get_recipe_by_id(3), 5, "Great")
+    restored.add_review(fresh)
+    assert fresh.id > latest.id
+    log.close()
+
+
+def test_replay_reports_records_of_missing_recipes(tmp_path, capsys):
+    path = tmp_path / "user_data.log"
+    repo, log, _ = boot(path)
+    gina = User("gina", "pw")
+    repo.add_user(gina)
+    repo.add_favourite(gina, repo.get_recipe_by_id(1))
+    repo.add_review(Review(gina, repo.get_recipe_by_id(1), 3, "Ok"))
+    log.close()
+
+    repo = MemoryRepository()  # a catalog without the recipe
+    log = WriteAheadLog(path, sync=False)
+    assert replay(log, repo) == 1  # only the user
+    assert "skipped 2 records" in capsys.readouterr().out
+    log.close()
+
+
+def test_only_changes_wait_for_the_log(tmp_path, monkeypatch):
+    repo, log, _ = boot(tmp_path / "user_data.log")
+    hana = User("hana", "pw")
+    repo.add_user(hana)
+    repo.add_favourite(hana, repo.get_recipe_by_id(1))
+    repo.set_catalog_digests({recipe_id: "digest" for recipe_id in range(1, 6)})
+    commits = []
+    monkeypatch.setattr(repo, "commit_user_data", lambda: commits.append(True))
+
+    repo.get_user_favourites("hana")
+    repo.is_recipe_in_favourites("hana", 1)
+    repo.get_favourite_ids("hana", [1, 2])
+    repo.get_reviews_by_username("hana")
+    repo.get_reviews_by_recipe_id(1)
+    # Dropping a recipe from the catalog unfavourites it without committing under the catalog lock
+    repo.apply_catalog_delta([], {recipe_id: "digest" for recipe_id in range(2, 6)})
+    assert commits == []
+    assert repo.get_user_favourites("hana") == []
+
+    repo.add_favourite(hana, repo.get_recipe_by_id(2))
+    assert commits == [True]
+    log.close()
+    assert [record["op"] for record in log.records()][-2:] == ["remove_favourite", "add_favourite"]
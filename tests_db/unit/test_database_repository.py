@@ -1,5 +1,6 @@
 import pytest
 from datetime import datetime, timedelta
+from sqlalchemy import text
 
 from recipe.adapters.database_repository import SqlAlchemyRepository
 from recipe.domainmodel.recipe import Recipe
@@ -198,6 +199,16 @@ def test_get_recipes(session_factory):
     assert len(recipes) > 0
 
 
+def test_iter_recipes_streams_every_recipe_populated(session_factory):
+    repo = make_repo(session_factory)
+    expected = sorted(r.id for r in repo.get_recipes())
+
+    streamed = list(repo.iter_recipes(batch_size=3))
+
+    assert sorted(r.id for r in streamed) == expected
+    assert all(r.ingredients for r in streamed)
+
+
 def test_get_recipe_by_id(session_factory):
     """Test getting a recipe by ID"""
     repo = make_repo(session_factory)
@@ -849,4 +860,87 @@ def test_get_featured_recipes(session_factory):
     assert len(featured) > 0
 
 
+def test_get_favourite_ids_returns_favourited_subset(session_factory):
+    """
+    get_favourite_ids answers for a whole page of recipe ids at once.
+    """
+    repo = make_repo(session_factory)
+    user = repo.get_user('thorke')
+    recipes = repo.get_recipes_paginated(1, 4)
+    repo.add_favourite(user, recipes[0])
+    repo.add_favourite(user, recipes[2])
+
+    ids = [r.id for r in recipes]
+    assert repo.get_favourite_ids('thorke', ids) == {recipes[0].id, recipes[2].id}
+    assert repo.get_favourite_ids('thorke', []) == set()
+    assert repo.get_favourite_ids('no_such_user', ids) == set()
+
+
+def test_review_rating_aggregates_are_persisted(session_factory):
+    repo = make_repo(session_factory)
+    recipe = repo.get_recipe_by_id(38)
+    count, histogram = recipe.rating_count, recipe.rating_histogram
+
+    repo.add_review(Review(repo.get_user('william'), recipe, 4, "Good!"))
+    repo.add_review(Review(repo.get_user('fmercury'), recipe, 2, "Meh"))
+
+    reloaded = repo.get_recipe_by_id(38)
+    assert reloaded.rating_count == count + 2
+    assert reloaded.rating_histogram[4] == histogram[4] + 1
+    assert reloaded.rating_histogram[2] == histogram[2] + 1
+    assert reloaded.rating == round(reloaded.rating_sum / reloaded.rating_count, 1)
+
+    # The aggregates are stored on the recipe row itself
+    row = session_factory().execute(
+        text("SELECT rating_count, rating_4_count FROM recipe WHERE id = 38")).one()
+    assert tuple(row) == (count + 2, histogram[4] + 1)
+
+
+def test_facet_counts_group_matches_by_category_and_author(session_factory):
+    repo = make_repo(session_factory)
+
+    for filter_by, query in (("name", "chicken"), ("ingredient", "garlic")):
+        if filter_by == "name":
+            matches = repo.get_recipes_by_name(query)
+        else:
+            matches = repo.get_recipes_by_ingredient_name(query)
+        assert matches
+
+        facets = repo.get_facet_counts(filter_by, query)
+        for field in ("category", "author"):
+            expected = {}
+            for recipe in matches:
+                name = getattr(recipe, field).name
+                expected[name] = expected.get(name, 0) + 1
+            assert facets[field] == dict(sorted(expected.items(), key=lambda item: (-item[1], item[0])))
+
+    limited = repo.get_facet_counts("name", "chicken", limit=2)
+    assert list(limited["category"].items()) == list(repo.get_facet_counts("name", "chicken")["category"].items())[:2]
+
+
+
+def test_reviews_from_separate_sessions_are_all_counted(session_factory):
+    # Each repository has its own session, standing in for two request threads
+    first, second = make_repo(session_factory), make_repo(session_factory)
+    stale = first.get_recipe_by_id(38)
+    count, sum_before = stale.rating_count, stale.rating_sum
+
+    second.add_review(Review(second.get_user('william'), second.get_recipe_by_id(38), 5, "Great"))
+    # first still holds the recipe as it was before that review
+    first.add_review(Review(first.get_user('fmercury'), stale, 3, "Fine"))
+
+    third = make_repo(session_factory)
+    reloaded = third.get_recipe_by_id(38)
+    assert (reloaded.rating_count, reloaded.rating_sum) == (count + 2, sum_before + 8)
+
+
+def test_out_of_range_review_rating_is_rejected(session_factory):
+    repo = make_repo(session_factory)
+    count = repo.get_recipe_by_id(38).rating_count
+    with pytest.raises(ValueError):
+        repo.add_review(Review(repo.get_user('william'), repo.get_recipe_by_id(38), 0, "Zero"))
+    other = make_repo(session_factory)
+    assert other.get_recipe_by_id(38).rating_count == count
+
+
 # py -m pytest -v tests_db/unit/test_database_repository.py
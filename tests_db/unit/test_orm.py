@@ -281,3 +281,63 @@ def test_category_recipes_relationship(empty_session):
     # Verify the recipe is in the category's recipes through the ORM relationship
     assert len(category_from_db.recipes) >= 1
     assert any(r.id == recipe.id for r in category_from_db.recipes)
+
+
+def test_recipes_created_after_clear_mappers_have_rating_aggregates(empty_session):
+    from sqlalchemy.orm import clear_mappers
+    clear_mappers()
+
+    recipe = Recipe(1, "After mapping", Author(1, "Someone"))
+    assert list(recipe.reviews) == []
+    assert (recipe.rating_sum, recipe.rating_count) == (0, 0)
+
+
+def test_author_and_category_recipes_load_as_recipe_sets(empty_session):
+    from recipe.domainmodel.recipe_set import RecipeSet
+    recipe = make_recipe()
+    empty_session.add(recipe)
+    empty_session.commit()
+    empty_session.expunge_all()
+
+    author = empty_session.query(Author).one()
+    category = empty_session.query(Category).one()
+    assert isinstance(author.recipes, RecipeSet) and isinstance(category.recipes, RecipeSet)
+
+    second = Recipe(2, "Second recipe", author, category=category)
+    author.add_recipe(second)
+    author.add_recipe(second)
+    category.add_recipe(second)
+    empty_session.commit()
+    assert [r.id for r in author.recipes] == [1, 2]
+    assert empty_session.execute(text('SELECT COUNT(*) FROM recipe WHERE author_id = 1')).scalar() == 2
+
+    author.remove_recipe(second)
+    empty_session.commit()
+    assert empty_session.execute(text('SELECT author_id FROM recipe WHERE id = 2')).scalar() is None
+
+
+def test_upgrade_fills_rating_aggregates_of_an_older_database():
+    from sqlalchemy import create_engine
+    from recipe.adapters.orm import mapper_registry, upgrade_rating_aggregates
+
+    engine = create_engine("sqlite://")
+    mapper_registry.metadata.create_all(engine)
+    assert not upgrade_rating_aggregates(engine)
+
+    aggregate_columns = ["rating_sum", "rating_count"] + [f"rating_{level}_count" for level in range(1, 6)]
+    with engine.begin() as connection:
+        for column in aggregate_columns:
+            connection.execute(text(f"ALTER TABLE recipe DROP COLUMN {column}"))
+        connection.execute(text("INSERT INTO user (id, username, password) VALUES (1, 'Bob', 'pw')"))
+        connection.execute(text("INSERT INTO recipe (id, name, rating) VALUES (1, 'Reviewed', 9), (2, 'Quiet', NULL)"))
+        # Half stars round up into the histogram, as Recipe counts them
+        for rating in (5, 4, 4, 2.5, 3.5, 4.5):
+            connection.execute(text("INSERT INTO review (user_id, recipe_id, rating, review_text, date) "
+                                    "VALUES (1, 1, :rating, 'ok', '2020-01-01 00:00:00')"), {"rating": rating})
+
+    assert upgrade_rating_aggregates(engine)
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            f"SELECT id, rating, {', '.join(aggregate_columns)} FROM recipe ORDER BY id")).all()
+    assert [tuple(row) for row in rows] == [(1, 3.9, 23.5, 6, 0, 0, 1, 3, 2), (2, None, 0, 0, 0, 0, 0, 0, 0)]
+
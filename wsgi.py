@@ -4,4 +4,4 @@ from recipe import create_app
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(host='localhost', port=5000, threaded=False)
\ No newline at end of file
+    app.run(host='localhost', port=5000, threaded=True)
\ No newline at end of file